@@ -38,6 +38,11 @@ DEFAULT_CONFIG = {
     ################
     "MONGO": "",
     "SENSITIVE_INFO_WARN": True,
+    "DB_CACHE_SIZE": 10000,
+    "DB_CACHE_TTL": 600,
+    "PREFIX_CACHE_SIZE": 20000,
+    "MONGO_WRITE_INTERVAL": 2,
+    "MONGO_WRITE_BATCH_SIZE": 100,
 
     #########################
     ### Sistema de música ###
@@ -62,6 +67,19 @@ DEFAULT_CONFIG = {
     "ENABLE_DISCORD_URLS_PLAYBACK": True,
     "PLAYER_INFO_BACKUP_INTERVAL": 45,
     "PLAYER_SESSIONS_MONGODB": False,
+    "PLAYER_RESUME_CONCURRENCY": 5,
+    "PLAYER_RESUME_CONNECT_INTERVAL_MS": 500,
+    "TRACK_CACHE_SIZE": 1000,
+    "TRACK_CACHE_MAX_MB": 32,
+    "TRACK_CACHE_TTL": 600,
+    "TRACK_CACHE_NEGATIVE_TTL": 30,
+    "TRACK_PREFETCH_COUNT": 3,
+    "TRACK_PREFETCH_CONCURRENCY": 2,
+    "PARTIAL_TRACK_CACHE_SIZE": 20000,
+    "SEARCH_SUGGESTION_CACHE_SIZE": 5000,
+    "SEARCH_SUGGESTION_CACHE_TTL": 600,
+    "SEARCH_SUGGESTION_DEBOUNCE_MS": 300,
+    "SEARCH_SUGGESTION_TIMEOUT_MS": 1500,
 
     ##############################################
     ### Sistema de música - Suporte ao spotify ###
@@ -126,7 +144,10 @@ DEFAULT_CONFIG = {
     ##############
     ### Tests ####
     ##############
-    "USE_YTDL": False
+    "USE_YTDL": False,
+    "YTDL_WORKERS": 2,
+    "YTDL_MAX_JOBS": 4,
+    "YTDL_JOB_TIMEOUT": 60,
 }
 
 
@@ -177,6 +198,27 @@ def load_config():
         "INVITE_PERMISSIONS",
         "PREFIXED_POOL_TIMEOUT",
         "PLAYER_INFO_BACKUP_INTERVAL",
+        "DB_CACHE_SIZE",
+        "DB_CACHE_TTL",
+        "PREFIX_CACHE_SIZE",
+        "MONGO_WRITE_INTERVAL",
+        "MONGO_WRITE_BATCH_SIZE",
+        "TRACK_CACHE_SIZE",
+        "TRACK_CACHE_MAX_MB",
+        "TRACK_CACHE_TTL",
+        "TRACK_CACHE_NEGATIVE_TTL",
+        "TRACK_PREFETCH_COUNT",
+        "TRACK_PREFETCH_CONCURRENCY",
+        "PARTIAL_TRACK_CACHE_SIZE",
+        "SEARCH_SUGGESTION_CACHE_SIZE",
+        "SEARCH_SUGGESTION_CACHE_TTL",
+        "SEARCH_SUGGESTION_DEBOUNCE_MS",
+        "SEARCH_SUGGESTION_TIMEOUT_MS",
+        "YTDL_WORKERS",
+        "YTDL_MAX_JOBS",
+        "YTDL_JOB_TIMEOUT",
+        "PLAYER_RESUME_CONCURRENCY",
+        "PLAYER_RESUME_CONNECT_INTERVAL_MS",
     ]:
         try:
             CONFIG[i] = int(CONFIG[i])
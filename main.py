@@ -3,8 +3,11 @@ import gc
 
 from utils.client import BotPool
 
-gc.collect()
+# os workers do yt-dlp (spawn) importam este arquivo novamente, então a pool só deve iniciar no processo principal
+if __name__ == "__main__":
 
-pool = BotPool()
+    gc.collect()
 
-pool.setup()
+    pool = BotPool()
+
+    pool.setup()
@@ -111,6 +111,7 @@ class ErrorHandler(commands.Cog):
         await send_message(inter, components=components, **kwargs)
 
         if kill_process:
+            await self.bot.pool.close_databases()
             await asyncio.create_subprocess_shell("kill 1")
             return
 
@@ -194,6 +195,7 @@ class ErrorHandler(commands.Cog):
         await func(components=components, delete_after=delete_time, **kwargs)
 
         if kill_process:
+            await self.bot.pool.close_databases()
             await asyncio.create_subprocess_shell("kill 1")
             return
 
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import asyncio
 import datetime
 import json
 import re
@@ -146,14 +145,12 @@ class IntegrationModal(disnake.ui.Modal):
 
                 source = "[SC]:"
 
-            loop = self.bot.loop or asyncio.get_event_loop()
-
             try:
                 await inter.response.defer(ephemeral=True)
             except:
                 pass
 
-            info = await loop.run_in_executor(None, lambda: self.bot.pool.ytdl.extract_info(base_url, download=False))
+            info = await self.bot.pool.ytdl.extract_info(base_url)
 
             if not info:
 
@@ -604,9 +601,9 @@ def setup(bot: BotCore):
 
     if bot.config["USE_YTDL"] and not hasattr(bot.pool, 'ytdl'):
 
-        from yt_dlp import YoutubeDL
+        from utils.music.ytdl_engine import YTDLEngine
 
-        bot.pool.ytdl = YoutubeDL(
+        bot.pool.ytdl = YTDLEngine(
             {
                 'extract_flat': True,
                 'quiet': True,
@@ -618,7 +615,10 @@ def setup(bot: BotCore):
                     r'.*youtube.*',
                     r'.*soundcloud.*',
                 ]
-            }
+            },
+            workers=bot.config["YTDL_WORKERS"],
+            max_jobs=bot.config["YTDL_MAX_JOBS"],
+            timeout=bot.config["YTDL_JOB_TIMEOUT"]
         )
 
     bot.add_cog(IntegrationManager(bot))
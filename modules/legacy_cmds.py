@@ -183,6 +183,7 @@ class Owner(commands.Cog):
 
                         for t in player.queue:
                             t.id = ""
+                            player.queue.mark_changed(t)
 
                         for t in player.played:
                             t.id = ""
@@ -568,6 +569,7 @@ class Owner(commands.Cog):
 
         guild_data["prefix"] = prefix
         await self.bot.update_global_data(ctx.guild.id, guild_data, db_name=DBModel.guilds)
+        self.bot.pool.guild_prefix_cache.pop(ctx.guild.id)
 
         prefix = disnake.utils.escape_markdown(prefix)
 
@@ -598,6 +600,7 @@ class Owner(commands.Cog):
         guild_data["prefix"] = ""
 
         await self.bot.update_global_data(ctx.guild.id, guild_data, db_name=DBModel.guilds)
+        self.bot.pool.guild_prefix_cache.pop(ctx.guild.id)
 
         embed = disnake.Embed(
             description=f"**Tiền tố máy chủ đã được đặt lại thành công.\n"
@@ -687,6 +690,8 @@ class Owner(commands.Cog):
             await self.bot.update_global_data(server_id, guild_data, db_name=DBModel.guilds)
             embed.description = f"**Tiền tố cho máy chủ có ID được thông báo bây giờ là:** {disnake.utils.escape_markdown(prefix)}"
 
+        self.bot.pool.guild_prefix_cache.pop(server_id)
+
         await ctx.send(embed=embed)
 
     @commands.is_owner()
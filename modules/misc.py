@@ -443,6 +443,9 @@ class Misc(commands.Cog):
                              f"> <a:kurukuru_seseren:1118094291957465149> **Mức độ sử dụng Ram** `{ram_usage}`\n" \
                              f"> <:serverrack:1118521207944384592> **Lần khởi động lại cuối cùng:** <t:{int(bot.uptime.timestamp())}:R>\n"
 
+        if await bot.is_owner(inter.author):
+            embed.description += self.owner_stats(bot)
+
         try:
             guild_data = inter.global_guild_data
         except AttributeError:
@@ -482,6 +485,59 @@ class Misc(commands.Cog):
                 await inter.send(embed=embed, ephemeral=True, components=components)
 
 
+    def owner_stats(self, bot: BotCore) -> str:
+
+        cache_txt = "{size}/{max_size} | hits: {hits} | misses: {misses} | {hit_rate}%"
+
+        def track_cache_stats():
+            stats = bot.pool.track_cache.stats()
+            stats["bytes"] = humanize.naturalsize(stats["bytes"])
+            return stats
+
+        def inflight_stats():
+            stats = bot.pool.inflight.stats()
+            stats["total"] = stats["calls"] + stats["coalesced"]
+            return stats
+
+        def timer_stats():
+            stats = bot.scheduler.stats()
+            return {"total": sum(stats.values()), "timers": "".join(f" | {k}: {v}" for k, v in sorted(stats.items()))}
+
+        def render_stats():
+            hits, misses = bot.pool.render_cache_stats["hits"], bot.pool.render_cache_stats["misses"]
+            return {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses) * 100, 1) if hits else 0}
+
+        # (emoji, nome, função que retorna as estatísticas, formato)
+        stats_table = (
+            ("🗃️", "Bộ nhớ đệm database", bot.pool.db_cache.stats, cache_txt),
+            ("🗃️", "Bộ nhớ đệm prefix (người dùng)", bot.pool.user_prefix_cache.stats, cache_txt),
+            ("🗃️", "Bộ nhớ đệm prefix (máy chủ)", bot.pool.guild_prefix_cache.stats, cache_txt),
+            ("🗃️", "Bộ nhớ đệm bài hát đã xử lý", bot.pool.partial_track_cache.stats, cache_txt),
+            ("🗃️", "Bộ nhớ đệm tìm kiếm", track_cache_stats,
+             "{size}/{max_size} | {bytes} | hits: {hits} | misses: {misses} | {hit_rate}%"),
+            ("💡", "Gợi ý tìm kiếm", bot.pool.search_suggestions.stats,
+             "{size}/{max_size} | {hit_rate}% | yêu cầu: {requests} | debounce: {debounced} | đã hủy: {cancelled} | "
+             "fallback: {fallbacks}"),
+            ("🔀", "Tìm kiếm gộp", inflight_stats, "{coalesced}/{total}"),
+            ("⚙️", "yt-dlp workers", lambda: bot.pool.ytdl.stats(),
+             "{workers} | hàng đợi: {queued} | đang chạy: {running} | jobs: {jobs} | timeouts: {timeouts}"),
+            ("⏲️", "Bộ hẹn giờ", timer_stats, "{total}{timers}"),
+            ("🖼️", "Bộ nhớ đệm hiển thị player", render_stats, "hits: {hits} | misses: {misses} | {hit_rate}%"),
+            ("✏️", "Chỉnh sửa tin nhắn player", bot.edit_queue.stats,
+             "đã gửi: {edits} | đã gộp: {coalesced} | đã bỏ: {dropped} | đang chờ: {pending}"),
+        )
+
+        txt = ""
+
+        for emoji, name, get_stats, fmt in stats_table:
+            try:
+                stats = get_stats()
+            except AttributeError:
+                continue
+            txt += f"> {emoji} **{name}:** `{fmt.format(**stats)}`\n"
+
+        return txt
+
     @commands.Cog.listener("on_button_click")
     async def invite_button(self, inter: disnake.MessageInteraction, is_command=False):
 
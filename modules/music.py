@@ -25,8 +25,9 @@ from utils.music.checks import check_voice, has_player, has_source, is_requester
     check_channel_limit, check_stage_topic
 from utils.music.models import LavalinkPlayer, LavalinkTrack, LavalinkPlaylist
 from utils.music.converters import time_format, fix_characters, string_to_seconds, URL_REG, \
-    YOUTUBE_VIDEO_REG, google_search, percentage, music_source_image, perms_translations
+    YOUTUBE_VIDEO_REG, percentage, music_source_image, perms_translations
 from utils.music.interactions import VolumeInteraction, QueueInteraction, SelectInteraction
+from utils.music.queue_filter import QueueFilter
 from utils.others import check_cmd, send_idle_embed, CustomContext, PlayerControls, fav_list, queue_track_index, \
     pool_command, string_to_file, CommandArgparse, music_source_emoji_url
 from user_agent import generate_user_agent
@@ -444,7 +445,7 @@ class Music(commands.Cog):
         except AttributeError:
             return [current[:99]]
 
-        return await google_search(bot, current)
+        return await bot.pool.search_suggestions.get(bot, inter.author.id, current)
 
     @is_dj()
     @has_player()
@@ -962,14 +963,12 @@ class Music(commands.Cog):
 
                 else:
 
-                    loop = self.bot.loop or asyncio.get_event_loop()
-
                     try:
                         await inter.response.defer(ephemeral=True)
                     except:
                         pass
 
-                    info = await loop.run_in_executor(None, lambda: self.bot.pool.ytdl.extract_info(query, download=False))
+                    info = await self.bot.pool.inflight.run(("ytdl", query), self.bot.pool.ytdl.extract_info, query)
 
                     try:
                         if not info["entries"]:
@@ -1345,14 +1344,13 @@ class Music(commands.Cog):
 
                 tracks = tracks[0]
 
-                if tracks.info.get("sourceName") == "http":
+                if tracks.source_name == "http":
 
                     if tracks.title == "Unknown title":
                         if attachment:
-                            tracks.info["title"] = attachment.filename
+                            tracks.title = attachment.filename
                         else:
-                            tracks.info["title"] = tracks.uri.split("/")[-1]
-                        tracks.title = tracks.info["title"]
+                            tracks.title = tracks.uri.split("/")[-1]
 
                     tracks.uri = ""
 
@@ -1373,7 +1371,7 @@ class Music(commands.Cog):
                 embed.set_author(
                     name=fix_characters(tracks.title, 35),
                     url=tracks.uri or tracks.search_uri,
-                    icon_url=music_source_image(tracks.info['sourceName'])
+                    icon_url=music_source_image(tracks.source_name)
                 )
                 embed.set_thumbnail(url=tracks.thumb)
                 embed.description = f"`{fix_characters(tracks.author, 15)}`**┃**`{time_format(tracks.duration) if not tracks.is_stream else '🔴 Livestream'}`**┃**{inter.author.mention}"
@@ -1408,7 +1406,7 @@ class Music(commands.Cog):
                     if not t.is_stream:
                         total_duration += t.duration
 
-                embed.set_author(name=f"Tìm kiếm: {query}", icon_url=music_source_image(tracks[0].info['sourceName']))
+                embed.set_author(name=f"Tìm kiếm: {query}", icon_url=music_source_image(tracks[0].source_name))
                 embed.set_thumbnail(url=tracks[0].thumb)
                 embed.description = f"`{len(tracks)} (Các) bài hát`**┃**`{time_format(total_duration)}`**┃**{inter.author.mention}"
                 emoji = "🎶"
@@ -1444,12 +1442,12 @@ class Music(commands.Cog):
                 embed.set_author(
                     name="⠂" + fix_characters(tracks.name, 35),
                     url=tracks.url,
-                    icon_url=music_source_image(tracks.tracks[0].info['sourceName'])
+                    icon_url=music_source_image(tracks.tracks[0].source_name)
                 )
             except KeyError:
                 embed.set_author(
                     name="⠂ Spotify Playlist",
-                    icon_url=music_source_image(tracks.tracks[0].info['sourceName'])
+                    icon_url=music_source_image(tracks.tracks[0].source_name)
                 )
             embed.set_thumbnail(url=tracks.tracks[0].thumb)
             embed.description = f"`{len(tracks.tracks)} Các bài hát`**┃**`{time_format(total_duration)}`**┃**{inter.author.mention}"
@@ -1554,7 +1552,9 @@ class Music(commands.Cog):
         if not vc or not query or (favs_size := len(favs)) >= 20:
             return favs[:20]
 
-        return await google_search(self.bot, query, max_entries=20 - favs_size) + favs
+        suggestions = await self.bot.pool.search_suggestions.get(self.bot, inter.author.id, query)
+
+        return suggestions[:20 - favs_size] + favs
 
     skip_back_cd = commands.CooldownMapping.from_cooldown(2, 13, commands.BucketType.member)
     skip_back_mc = commands.MaxConcurrency(1, per=commands.BucketType.member, wait=False)
@@ -1666,8 +1666,7 @@ class Music(commands.Cog):
                 player.loop = False
 
             if play_only == "yes":
-                del player.queue[index]
-                player.queue.appendleft(track)
+                player.queue.move(index, 0)
 
             elif index > 0:
                 player.queue.rotate(0 - index)
@@ -1719,7 +1718,7 @@ class Music(commands.Cog):
             if player.loop == "current":
                 player.loop = False
 
-        player.current.info["extra"]["track_loops"] = 0
+        player.current.track_loops = 0
 
         await player.track_end()
         player.ignore_np_once = True
@@ -2199,12 +2198,12 @@ class Music(commands.Cog):
 
         if mode == 'off':
             mode = False
-            player.current.info["extra"]["track_loops"] = 0
+            player.current.track_loops = 0
             emoji = "<:AyakaCozy_mella:1135418504590393415>"
             txt = ['Vô hiệu hóa lặp lại.', f"{emoji} **⠂{inter.author.mention}Vô hiệu hóa lặp lại.**"]
 
         elif mode == "current":
-            player.current.info["extra"]["track_loops"] = 0
+            player.current.track_loops = 0
             emoji = "<:Play_With_Me:1128555926417330207>"
             txt = ["Đã kích hoạt lặp lại của bài hát hiện tại.",
                    f"{emoji} **⠂{inter.author.mention} Đã kích hoạt lặp lại của bài hát hiện tại.**"]
@@ -2239,7 +2238,7 @@ class Music(commands.Cog):
 
         player: LavalinkPlayer = bot.music.players[inter.guild_id]
 
-        player.current.info["extra"]["track_loops"] = value
+        player.current.track_loops = value
 
         txt = [
             f"xác định số lượng lặp lại của bài hát "
@@ -2636,18 +2635,19 @@ class Music(commands.Cog):
 
         count = 0
 
-        for track in player.queue:
+        query_words = query.lower().split()
+
+        # player.queue.search retorna apenas as músicas que contém as palavras da busca (índice de termos da fila)
+        for n, track in player.queue.search(query):
 
             if count == 20:
                 break
 
             title = track.title.lower().split()
 
-            query_words = query.lower().split()
-
             word_count = 0
 
-            for query_word in query.lower().split():
+            for query_word in query_words:
                 for title_word in title:
                     if query_word in title_word:
                         title.remove(title_word)
@@ -2658,8 +2658,8 @@ class Music(commands.Cog):
                 results.append(f"{track.title[:81]} || ID > {track.unique_id}")
                 count += 1
 
-        return results or [f"{track.title[:81]} || ID > {track.unique_id}" for n, track in enumerate(player.queue)
-                if query.lower() in track.title.lower()][:20]
+        return results or [f"{track.title[:81]} || ID > {track.unique_id}" for n, track in player.queue.search(query)
+                if query.lower() in f"{track.title} {track.author}".lower()][:20]
 
     nightcore_cd = commands.CooldownMapping.from_cooldown(1, 7, commands.BucketType.guild)
     nightcore_mc = commands.MaxConcurrency(1, per=commands.BucketType.guild, wait=False)
@@ -2979,7 +2979,7 @@ class Music(commands.Cog):
         if len(player.queue) < 3:
             raise GenericError("**Dòng phải có ít nhất 3 bài hát để được trộn lẫn.**")
 
-        shuffle(player.queue)
+        player.queue.shuffle()
 
         await self.interaction_message(
             inter,
@@ -3174,32 +3174,17 @@ class Music(commands.Cog):
         if not player.queue:
             raise GenericError("**Không có bài hát trong hàng.**")
 
-        filters = []
-        final_filters = set()
-
         txt = []
-        playlist_hyperlink = set()
-
-        if song_name:
-            filters.append('song_name')
-        if song_author:
-            filters.append('song_author')
-        if user:
-            filters.append('user')
-        if playlist:
-            filters.append('playlist')
+
+        has_filters = any((song_name, song_author, user, playlist, min_duration, max_duration, absent_members,
+                           duplicates))
+
         if min_duration:
-            filters.append('time_below')
             min_duration = string_to_seconds(min_duration) * 1000
         if max_duration:
-            filters.append('time_above')
             max_duration = string_to_seconds(max_duration) * 1000
-        if absent_members:
-            filters.append('absent_members')
-        if duplicates:
-            filters.append('duplicates')
 
-        if not filters and not range_start and not range_end:
+        if not has_filters and not range_start and not range_end:
             player.queue.clear()
             txt = ['xóa dòng nhạc.', f'♻️ **⠂{inter.author.mention} Làm sạch dòng nhạc.**']
 
@@ -3210,126 +3195,60 @@ class Music(commands.Cog):
                 if range_start >= range_end:
                     raise GenericError("**Vị trí cuối cùng phải lớn hơn vị trí bắt đầu!**")
 
-                song_list = list(player.queue)[range_start - 1: range_end - 1]
+                song_list = player.queue[range_start - 1: range_end - 1]
                 txt.append(f"**Vị trí hàng đợi ban đầu:** `{range_start}`\n"
                            f"**Vị trí dòng cuối cùng:** `{range_end}`")
 
             elif range_start:
-                song_list = list(player.queue)[range_start - 1:]
+                song_list = player.queue[range_start - 1:]
                 txt.append(f"**Vị trí hàng đợi ban đầu:** `{range_start}`")
             elif range_end:
-                song_list = list(player.queue)[:range_end - 1]
+                song_list = player.queue[:range_end - 1]
                 txt.append(f"**Vị trí dòng cuối cùng:** `{range_end}`")
             else:
                 song_list = list(player.queue)
 
-            deleted_tracks = 0
-
-            duplicated_titles = set()
-
-            for t in song_list:
-
-                temp_filter = list(filters)
-
-                if 'duplicates' in temp_filter:
-                    if (title:=f"{t.author} - {t.title}".lower()) in duplicated_titles:
-                        temp_filter.remove('duplicates')
-                        final_filters.add('duplicates')
-                    else:
-                        duplicated_titles.add(title)
-
-                if 'time_below' in temp_filter and t.duration >= min_duration:
-                    temp_filter.remove('time_below')
-                    final_filters.add('time_below')
-
-                elif 'time_above' in temp_filter and t.duration <= max_duration:
-                    temp_filter.remove('time_above')
-                    final_filters.add('time_above')
-
-                if 'song_name' in temp_filter and song_name.lower() in t.title.lower():
-                    temp_filter.remove('song_name')
-                    final_filters.add('song_name')
-
-                if 'song_author' in temp_filter and song_author.lower() in t.author.lower():
-                    temp_filter.remove('song_author')
-                    final_filters.add('song_author')
-
-                if 'user' in temp_filter and user.id == t.requester:
-                    temp_filter.remove('user')
-                    final_filters.add('user')
-
-                elif 'absent_members' in temp_filter and t.requester not in player.guild.me.voice.channel.voice_states:
-                    temp_filter.remove('absent_members')
-                    final_filters.add('absent_members')
-
-                if 'playlist' in temp_filter:
-                    if playlist == t.playlist_name:
-                        playlist_hyperlink.add(f"[`{fix_characters(t.playlist_name)}`]({t.playlist_urrl})")
-                        temp_filter.remove('playlist')
-                        final_filters.add('playlist')
-                    elif isinstance(inter, CustomContext) and playlist.lower() in t.playlist_name.lower():
-                        playlist = t.playlist_name
-                        playlist_hyperlink.add(f"[`{fix_characters(t.playlist_name)}`]({t.playlist_urrl})")
-                        temp_filter.remove('playlist')
-                        final_filters.add('playlist')
-
-                if not temp_filter:
-                    player.queue.remove(t)
-                    deleted_tracks += 1
-
-            duplicated_titles.clear()
-
-            if not deleted_tracks:
+            queue_filter = QueueFilter(song_list)
+
+            if song_name:
+                queue_filter.song_name(song_name)
+            if song_author:
+                queue_filter.song_author(song_author)
+            if user:
+                queue_filter.user(user.id)
+            if playlist:
+                playlist = queue_filter.playlist(playlist, partial=isinstance(inter, CustomContext))
+            if min_duration:
+                queue_filter.min_duration(min_duration)
+            if max_duration:
+                queue_filter.max_duration(max_duration)
+            if absent_members:
+                queue_filter.absent_members(player.guild.me.voice.channel.voice_states)
+            if duplicates:
+                queue_filter.duplicates()
+
+            _, removed, counts = queue_filter.apply()
+
+            if not removed:
                 await inter.send("Không tìm thấy bài hát!", ephemeral=True)
                 return
 
-            try:
-                final_filters.remove("song_name")
-                txt.append(f"**Bao gồm tên:** `{fix_characters(song_name)}`")
-            except:
-                pass
-
-            try:
-                final_filters.remove("song_author")
-                txt.append(f"**Bao gồm tên trong trình tải lên/nghệ sĩ:** `{fix_characters(song_author)}`")
-            except:
-                pass
-
-            try:
-                final_filters.remove("user")
-                txt.append(f"**pedidoPelCácThànhViên:** {user.mention}")
-            except:
-                pass
-
-            try:
-                final_filters.remove("playlist")
-                txt.append(f"**Playlist:** `{fix_characters(playlist)}`")
-            except:
-                pass
-
-            try:
-                final_filters.remove("time_below")
-                txt.append(f"**Với thời lượng ban đầu/bằng nhau:** `{time_format(min_duration)}`")
-            except:
-                pass
-
-            try:
-                final_filters.remove("time_above")
-                txt.append(f"**Với thời lượng tối đa:** `{time_format(max_duration)}`")
-            except:
-                pass
-
-            try:
-                final_filters.remove("duplicates")
-                txt.append(f"**Bài hát trùng lặp**")
-            except:
-                pass
+            deleted_tracks = player.queue.remove_many(removed)
+
+            filter_txt = {
+                "song_name": lambda: f"**Bao gồm tên:** `{fix_characters(song_name)}`",
+                "song_author": lambda: f"**Bao gồm tên trong trình tải lên/nghệ sĩ:** `{fix_characters(song_author)}`",
+                "user": lambda: f"**pedidoPelCácThànhViên:** {user.mention}",
+                "playlist": lambda: f"**Playlist:** `{fix_characters(playlist)}`",
+                "time_below": lambda: f"**Với thời lượng ban đầu/bằng nhau:** `{time_format(min_duration)}`",
+                "time_above": lambda: f"**Với thời lượng tối đa:** `{time_format(max_duration)}`",
+                "duplicates": lambda: f"**Bài hát trùng lặp**",
+                "absent_members": lambda: "`Các bài hát được yêu cầu bởi các thành viên rời khỏi kênh.`",
+            }
 
-            try:
-                final_filters.remove("absent_members")
-                txt.append("`Các bài hát được yêu cầu bởi các thành viên rời khỏi kênh.`")
-            except:
-                pass
+            for name, func in filter_txt.items():
+                if count := counts.get(name):
+                    txt.append(f"{func()} (`{count} bài hát khớp`)")
 
             txt = [f"LOẠI BỎ {deleted_tracks} các bài hát thông qua clear.",
                    f"♻️ **⠂{inter.author.mention} LOẠI BỎ {deleted_tracks} Các bài hát từ dòng sử dụng các bài hát sau "
@@ -4469,7 +4388,7 @@ class Music(commands.Cog):
                                     f"🎼 **⠂ Các bài hát:** `[{len(tracks.tracks)}]`"
                 embed.set_thumbnail(url=tracks.tracks[0].thumb)
                 embed.set_author(name="⠂" + fix_characters(tracks.tracks[0].playlist_name, 35), url=message.content,
-                                 icon_url=music_source_image(tracks.tracks[0].info["sourceName"]))
+                                 icon_url=music_source_image(tracks.tracks[0].source_name))
                 if response:
                     await response.edit(content=None, embed=embed, view=None)
                 else:
@@ -4489,14 +4408,13 @@ class Music(commands.Cog):
         else:
             track = tracks[0]
 
-            if track.info.get("sourceName") == "http":
+            if track.source_name == "http":
 
                 if track.title == "Unknown title":
                     if attachment:
-                        track.info["title"] = attachment.filename
+                        track.title = attachment.filename
                     else:
-                        track.info["title"] = track.uri.split("/")[-1]
-                    track.title = track.info["title"]
+                        track.title = track.uri.split("/")[-1]
 
                 track.uri = ""
 
@@ -4507,7 +4425,7 @@ class Music(commands.Cog):
                                     f"✋ **⠂ Được yêu cầu bởi:** {message.author.mention}\n" \
                                     f"⌛ **⠂ Thời lượng** `{time_format(track.duration) if not track.is_stream else '🔴 Livestream'}` "
                 embed.set_thumbnail(url=track.thumb)
-                embed.set_author(name=fix_characters(track.title, 35), url=track.uri or track.search_uri, icon_url=music_source_image(track.info["sourceName"]))
+                embed.set_author(name=fix_characters(track.title, 35), url=track.uri or track.search_uri, icon_url=music_source_image(track.source_name))
                 if response:
                     await response.edit("<:verify:1134033164151566460> **Thêm bài hát thành công**", content=None, embed=embed, view=None)
                 else:
@@ -5088,14 +5006,10 @@ class Music(commands.Cog):
                 if node.search:
                     node_search = node
                 else:
-                    try:
-                        node_search = \
-                            sorted(
-                                [n for n in self.bot.music.nodes.values() if
-                                 n.search and n.available and n.is_available and not n.restarting],
-                                key=lambda n: len(n.players))[0]
-                    except IndexError:
-                        node_search = node
+                    node_search = self.bot.music.node_selector.select(
+                        (n for n in self.bot.music.nodes.values() if
+                         n.search and n.available and n.is_available and not n.restarting), search=True
+                    ) or node
 
                 try:
                     tracks = await node_search.get_tracks(
@@ -5126,7 +5040,7 @@ class Music(commands.Cog):
             raise GenericError("Không có kết quả cho tìm kiếm của bạn.")
 
         if isinstance(tracks, list):
-            tracks[0].info["extra"]["track_loops"] = track_loops
+            tracks[0].track_loops = track_loops
 
         else:
 
@@ -5213,7 +5127,7 @@ class Music(commands.Cog):
         except:
             check = None
 
-        player.members_timeout_task = self.bot.loop.create_task(player.members_timeout(check=check))
+        player.schedule_members_timeout(check)
 
         # rich presence stuff
 
@@ -5298,23 +5212,23 @@ class Music(commands.Cog):
         if not bot:
             bot = self.bot
 
-        try:
-            return sorted(
-                [n for n in bot.music.nodes.values() if n.stats and n.is_available and n.available and not n.restarting],
-                key=lambda n: n.stats.players
-            )[0]
+        node = bot.music.node_selector.select(
+            n for n in bot.music.nodes.values() if n.stats and n.is_available and n.available and not n.restarting
+        )
 
-        except IndexError:
-            try:
-                node = bot.music.nodes['LOCAL']
-            except KeyError:
-                pass
-            else:
-                if not node._websocket.is_connected:
-                    await node.connect(bot)
-                return node
+        if node:
+            return node
+
+        try:
+            node = bot.music.nodes['LOCAL']
+        except KeyError:
+            pass
+        else:
+            if not node._websocket.is_connected:
+                await node.connect(bot)
+            return node
 
-            raise GenericError("**Không có máy chủ âm nhạc có sẵn.**")
+        raise GenericError("**Không có máy chủ âm nhạc có sẵn.**")
 
     async def error_report_loop(self):
 
@@ -2,12 +2,10 @@
 
 # nota: este sistema é totalmente experimental.
 import asyncio
-import json
-import os
+import time
 import traceback
-from typing import Union
+from typing import Dict, Union
 
-import aiosqlite
 import disnake
 from disnake.ext import commands
 
@@ -17,10 +15,24 @@ from utils.music.checks import can_connect, can_send_message
 from utils.music.models import LavalinkPlayer, LavalinkTrack, PartialTrack, PartialPlaylist, LavalinkPlaylist
 
 
+class QueueJournal:
+
+    # estado da fila salva de um player: permite salvar apenas as alterações (journal) ao invés da fila inteira
+    def __init__(self):
+        self.size = 0
+        self.snapshot_size = 0
+
+
 class PlayerSession(commands.Cog):
 
+    # tamanho mínimo do journal (em bytes) para compactar a fila salva num novo snapshot
+    journal_min_compact_size = 65536
+
     def __init__(self, bot: BotCore):
         self.bot = bot
+        self.journals: Dict[int, QueueJournal] = {}
+        self.voice_connect_locks: Dict[int, asyncio.Lock] = {}
+        self.voice_connect_last: Dict[int, float] = {}
 
         if not hasattr(bot, "player_resumed"):
             bot.player_resumed = False
@@ -48,42 +60,21 @@ class PlayerSession(commands.Cog):
 
         await self.save_info(payload.player)
 
-    async def queue_updater_task(self, player: LavalinkPlayer):
-
-        while True:
-            await asyncio.sleep(self.bot.config["PLAYER_INFO_BACKUP_INTERVAL"])
-            await self.save_info(player)
-
     async def save_info(self, player: LavalinkPlayer):
 
         if not player.guild.me.voice:
             return
 
-        tracks = []
         played = []
         autoqueue = []
 
-        if player.current:
-            player.current.info["id"] = player.current.id
-            if player.current.playlist_name:
-                player.current.info["playlist"] = {"name": player.current.playlist_name, "url": player.current.playlist_url}
-            tracks.append(player.current.info)
-
-        for t in player.queue:
-            t.info["id"] = t.id
-            if t.playlist:
-                t.info["playlist"] = {"name": t.playlist_name, "url": t.playlist_url}
-            tracks.append(t.info)
-
         for t in player.played:
-            t.info["id"] = t.id
-            if t.playlist:
-                t.info["playlist"] = {"name": t.playlist_name, "url": t.playlist_url}
-            played.append(t.info)
+            played.append(self.track_info(t))
 
         for t in player.queue_autoplay:
-            t.info["id"] = t.id
-            autoqueue.append(t.info)
+            info = t.info
+            info["id"] = t.id
+            autoqueue.append(info)
 
         if player.skin.startswith("> custom_skin: "):
 
@@ -133,7 +124,6 @@ class PlayerSession(commands.Cog):
             "restrict_mode": player.restrict_mode,
             "mini_queue_enabled": player.mini_queue_enabled,
             "listen_along_invite": player.listen_along_invite,
-            "tracks": tracks,
             "played": played,
             "queue_autoplay": autoqueue
         }
@@ -143,6 +133,64 @@ class PlayerSession(commands.Cog):
         except:
             traceback.print_exc()
 
+    def track_info(self, track: Union[LavalinkTrack, PartialTrack]) -> dict:
+        info = track.info
+        info["id"] = track.id
+        if track.playlist:
+            info["playlist"] = {"name": track.playlist_name, "url": track.playlist_url}
+        return info
+
+    def journal_records(self, records: list) -> list:
+
+        # converte as alterações registradas pela fila (com as músicas) para o formato salvo (unique_ids), salvando
+        # apenas as informações das músicas adicionadas/alteradas.
+        converted = []
+
+        for r in records:
+
+            if r[0] in ("append", "insert", "tracks"):
+                tracks = r[-1]
+                converted.append(["tracks", {t.unique_id: self.track_info(t) for t in tracks}])
+                if r[0] != "tracks":
+                    converted.append(r[:-1] + [[t.unique_id for t in tracks]])
+
+            else:
+                converted.append(r)
+
+        return converted
+
+    def save_queue(self, player: LavalinkPlayer):
+
+        guild_id = player.guild.id
+        sessions = self.bot.pool.player_sessions
+        records = player.queue.journal
+
+        try:
+            journal = self.journals[guild_id]
+        except KeyError:
+            journal = None
+
+        # a fila só é salva novamente por completo no primeiro save do player, quando a fila foi limpa/embaralhada,
+        # quando o journal da fila foi descartado ou quando as alterações salvas ficarem maiores que o snapshot.
+        if journal is not None and records is not None and not (records and records[0][0] == "clear"):
+
+            if not records:
+                return
+
+            player.queue.journal = []
+
+            journal.size += sessions.append(self.bot.user.id, guild_id, self.journal_records(records))
+
+            if journal.size <= max(journal.snapshot_size, self.journal_min_compact_size):
+                return
+
+        player.queue.journal = []
+        journal = QueueJournal()
+        journal.snapshot_size = sessions.save_tracks(
+            self.bot.user.id, guild_id, [[t.unique_id, self.track_info(t)] for t in player.queue]
+        )
+        self.journals[guild_id] = journal
+
     def process_track_cls(self, data: list, playlists: dict = None):
 
         if not playlists:
@@ -194,9 +242,16 @@ class PlayerSession(commands.Cog):
                         playlists[playlist["url"]] = playlist_cls
                         playlist = playlist_cls
 
+                try:
+                    # completa apenas as informações ausentes a partir do próprio id da track (sem requisição ao
+                    # lavalink). Os campos salvos não são sobrescritos (ex: título de anexos e uri com &list=/?in=).
+                    for k, v in wavelink.decode_track(info["id"]).items():
+                        info.setdefault(k, v)
+                except wavelink.BuildTrackError:
+                    pass
+
                 t = LavalinkTrack(id_=info["id"], info=info, playlist=playlist)
 
-            del t.info["id"]
             tracks.append(t)
 
         return tracks, playlists
@@ -220,263 +275,292 @@ class PlayerSession(commands.Cog):
         hints = self.bot.config["EXTRA_HINTS"].split("||")
 
         try:
-
             data_list = await self.get_player_sessions()
+        except Exception:
+            print(f"{self.bot.user} - Thất bại trong việc tiếp tục phát nhạc: \n{traceback.format_exc()}")
+            self.bot.player_resumed = True
+            return
 
-            for data in data_list:
+        # servidores com membros ouvindo no canal de voz são retomados primeiro
+        data_list.sort(key=lambda d: -self.listeners_count(d))
 
-                guild = self.bot.get_guild(int(data["_id"]))
+        semaphore = asyncio.Semaphore(max(self.bot.config["PLAYER_RESUME_CONCURRENCY"], 1))
+        start_time = time.perf_counter()
+        total = len(data_list)
+        resumed = 0
 
-                if not guild:
-                    print(f"{self.bot.user} - Người chơi bị bỏ qua: {data['_id']} | Máy chủ không tồn tại...")
-                    await self.delete_data(guild.id)
-                    continue
+        async def resume(data: dict):
 
-                voice_channel = self.bot.get_channel(int(data["voice_channel"]))
+            nonlocal resumed
 
-                message = None
+            async with semaphore:
 
-                if not voice_channel:
-                    print(f"{self.bot.user} - Người chơi bị bỏ qua: {guild.name} [{guild.id}]\nKênh thoại không tồn tại...")
-                    await self.delete_data(guild.id)
-                    continue
+                player_start = time.perf_counter()
 
                 try:
-                    can_connect(voice_channel, guild=guild, bot=self.bot)
-                except Exception as e:
-                    print(f"{self.bot.user} - Người chơi bị bỏ qua: {guild.name} [{guild.id}]\n{repr(e)}")
-                    await self.delete_data(guild.id)
-                    continue
+                    if not await self.resume_player(data, node, hints):
+                        return
+                except Exception:
+                    print(f"{self.bot.user} - Thất bại trong việc tiếp tục phát nhạc: {data['_id']}\n{traceback.format_exc()}")
+                    return
 
-                try:
-                    text_channel = self.bot.get_channel(int(data["text_channel"])) or \
-                               await self.bot.fetch_channel(int(data["text_channel"]))
-                except disnake.NotFound:
-                    text_channel = None
+                resumed += 1
 
-                if not text_channel:
+                print(f"{self.bot.user} - Người chơi đã tiếp tục [{resumed}/{total}]: {data['_id']} "
+                      f"({time.perf_counter() - player_start:.2f}s | total: {time.perf_counter() - start_time:.2f}s)")
 
-                    message = False
+        await asyncio.gather(*(resume(d) for d in data_list))
 
-                    if data["text_channel"] != str(voice_channel.id) and data['static']:
-                        data['static'] = False
+        if total:
+            print(f"{self.bot.user} - Đã tiếp tục người chơi: {resumed}/{total} trong {time.perf_counter() - start_time:.2f}s")
 
-                    text_channel = voice_channel
+        self.bot.player_resumed = True
 
-                try:
-                    can_send_message(text_channel, self.bot.user)
-                except Exception:
-                    print(f"{self.bot.user} - Người chơi bị bỏ qua (thiếu sự cho phép) [Kênh: {text_channel.name} | ID: {text_channel.id}] - [ {guild.name} - {guild.id} ]")
-                    await self.delete_data(guild.id)
-                    continue
+    def listeners_count(self, data: dict) -> int:
+        try:
+            return len([m for m in self.bot.get_channel(int(data["voice_channel"])).members if not m.bot])
+        except Exception:
+            return 0
 
-                try:
-                    creator = int(data["player_creator"])
-                except:
-                    creator = None
+    async def voice_connect_slot(self, guild: disnake.Guild):
 
-                message_without_thread = None
+        # limita a frequência de conexões de voz por shard (updates de voz também contam no rate limit do gateway)
+        lock = self.voice_connect_locks.setdefault(guild.shard_id, asyncio.Lock())
 
-                if message is None:
+        async with lock:
 
-                    try:
-                        message = await text_channel.fetch_message(int(data["message"]))
-                    except:
-                        if not text_channel.permissions_for(guild.me).read_message_history:
-                            print(f"{self.bot.user} - Không thể có được tin nhắn và không được phép "
-                                  f"Đọc lịch sử lịch sử.Bộ điều khiển người chơi sẽ được đặt lại.\n"
-                                  f"Máy chủ: {guild} [{guild.id}]\n"
-                                  f"kênh: {text_channel.name} [{text_channel.id}]")
-                        else:
-                            try:
-                                async for msg in text_channel.history(limit=100):
+            delay = self.voice_connect_last.get(guild.shard_id, 0) - time.monotonic() + \
+                    self.bot.config["PLAYER_RESUME_CONNECT_INTERVAL_MS"] / 1000
 
-                                    if not message:
-                                        continue
+            if delay > 0:
+                await asyncio.sleep(delay)
 
-                                    if message.author.id != self.bot.user.id:
-                                        continue
+            self.voice_connect_last[guild.shard_id] = time.monotonic()
 
-                                    if msg.reference:
-                                        continue
+    async def wait_voice_connection(self, guild: disnake.Guild, timeout: float = 30):
 
-                                    if msg.thread:
-                                        message = msg
-                                        break
+        if guild.me.voice:
+            return
 
-                                    if message_without_thread:
-                                        continue
+        try:
+            await self.bot.wait_for(
+                "voice_state_update",
+                check=lambda m, b, a: m.id == self.bot.user.id and m.guild.id == guild.id and a.channel,
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            print(f"{self.bot.user} - Hết thời gian chờ kết nối kênh thoại: {guild.name} [{guild.id}]")
 
-                                    message_without_thread = msg
+    async def resume_player(self, data: dict, node: wavelink.Node, hints: list) -> bool:
 
-                            except Exception as e:
-                                print(f"{self.bot.user} - Không nhận được tin nhắn: {repr(e)}\n"
-                                      f"channel_id: {text_channel.id} | message_id {data['message']}")
+        guild = self.bot.get_guild(int(data["_id"]))
 
-                try:
-                    player: LavalinkPlayer = self.bot.music.get_player(
-                        node_id=node.identifier,
-                        guild_id=guild.id,
-                        cls=LavalinkPlayer,
-                        guild=guild,
-                        channel=text_channel,
-                        message=message or message_without_thread,
-                        skin=data["skin"],
-                        skin_static=data["skin_static"],
-                        player_creator=creator,
-                        keep_connected=data["keep_connected"],
-                        autoplay=data.get("autoplay", False),
-                        static=data['static'],
-                        custom_skin_data=data.get("custom_skin_data", {}),
-                        custom_skin_static_data=data.get("custom_skin_static_data", {}),
-                        extra_hints=hints,
-                        uptime=data.get("uptime"),
-                        stage_title_template=data.get("stage_title_template"),
-                        restrict_mode=data["restrict_mode"],
-                        volume=int(data["volume"])
-                    )
-                except Exception:
-                    print(f"{self.bot.user} - Falha ao criar player: {guild.name} [{guild.id}]\n{traceback.format_exc()}")
-                    await self.delete_data(guild.id)
-                    continue
+        if not guild:
+            print(f"{self.bot.user} - Người chơi bị bỏ qua: {data['_id']} | Máy chủ không tồn tại...")
+            await self.delete_data(data["_id"])
+            return False
 
-                try:
-                    player.mini_queue_enabled = data["mini_queue_enabled"]
-                except:
-                    pass
+        voice_channel = self.bot.get_channel(int(data["voice_channel"]))
 
-                player.listen_along_invite = data.pop("listen_along_invite", "")
+        message = None
 
-                player.dj = set(data["dj"])
-                player.loop = data["loop"]
+        if not voice_channel:
+            print(f"{self.bot.user} - Người chơi bị bỏ qua: {guild.name} [{guild.id}]\nKênh thoại không tồn tại...")
+            await self.delete_data(guild.id)
+            return False
 
-                try:
-                    player.stage_title_event = data["stage_title_event"]
-                except:
-                    pass
+        try:
+            can_connect(voice_channel, guild=guild, bot=self.bot)
+        except Exception as e:
+            print(f"{self.bot.user} - Người chơi bị bỏ qua: {guild.name} [{guild.id}]\n{repr(e)}")
+            await self.delete_data(guild.id)
+            return False
 
-                player.nightcore = data.get("nightcore")
+        try:
+            text_channel = self.bot.get_channel(int(data["text_channel"])) or \
+                       await self.bot.fetch_channel(int(data["text_channel"]))
+        except disnake.NotFound:
+            text_channel = None
 
-                if player.nightcore:
-                    await player.set_timescale(pitch=1.2, speed=1.1)
+        if not text_channel:
 
-                tracks, playlists = self.process_track_cls(data["tracks"])
+            message = False
 
-                player.queue.extend(tracks)
+            if data["text_channel"] != str(voice_channel.id) and data['static']:
+                data['static'] = False
 
-                played_tracks, playlists = self.process_track_cls(data["played"], playlists)
+            text_channel = voice_channel
 
-                player.played.extend(played_tracks)
+        try:
+            can_send_message(text_channel, self.bot.user)
+        except Exception:
+            print(f"{self.bot.user} - Người chơi bị bỏ qua (thiếu sự cho phép) [Kênh: {text_channel.name} | ID: {text_channel.id}] - [ {guild.name} - {guild.id} ]")
+            await self.delete_data(guild.id)
+            return False
 
-                queue_autoplay_tracks, playlists = self.process_track_cls(data.get("queue_autoplay", []))
+        try:
+            creator = int(data["player_creator"])
+        except:
+            creator = None
 
-                player.queue_autoplay.extend(queue_autoplay_tracks)
+        message_without_thread = None
 
-                playlists.clear()
-                tracks.clear()
-                played_tracks.clear()
-                queue_autoplay_tracks.clear()
+        if message is None:
 
-                await player.connect(voice_channel.id)
+            try:
+                message = await text_channel.fetch_message(int(data["message"]))
+            except:
+                if not text_channel.permissions_for(guild.me).read_message_history:
+                    print(f"{self.bot.user} - Không thể có được tin nhắn và không được phép "
+                          f"Đọc lịch sử lịch sử.Bộ điều khiển người chơi sẽ được đặt lại.\n"
+                          f"Máy chủ: {guild} [{guild.id}]\n"
+                          f"kênh: {text_channel.name} [{text_channel.id}]")
+                else:
+                    try:
+                        async for msg in text_channel.history(limit=100):
 
-                while not guild.me.voice:
-                    await asyncio.sleep(1)
+                            if msg.author.id != self.bot.user.id:
+                                continue
 
-                if isinstance(voice_channel, disnake.StageChannel) and \
-                        voice_channel.permissions_for(guild.me).mute_members:
+                            if msg.reference:
+                                continue
 
-                    await asyncio.sleep(3)
+                            if msg.thread:
+                                message = msg
+                                break
 
-                    await guild.me.edit(suppress=False)
+                            if message_without_thread:
+                                continue
 
-                player.set_command_log(
-                    text="Trình phát đã được khôi phục thành công!",
-                    emoji="🔰"
-                )
+                            message_without_thread = msg
 
-                try:
-                    check = any(m for m in player.guild.me.voice.channel.members if not m.bot)
-                except:
-                    check = None
+                    except Exception as e:
+                        print(f"{self.bot.user} - Không nhận được tin nhắn: {repr(e)}\n"
+                              f"channel_id: {text_channel.id} | message_id {data['message']}")
 
-                if data.get("paused") and check:
+        try:
+            player: LavalinkPlayer = self.bot.music.get_player(
+                node_id=node.identifier,
+                guild_id=guild.id,
+                cls=LavalinkPlayer,
+                guild=guild,
+                channel=text_channel,
+                message=message or message_without_thread,
+                skin=data["skin"],
+                skin_static=data["skin_static"],
+                player_creator=creator,
+                keep_connected=data["keep_connected"],
+                autoplay=data.get("autoplay", False),
+                static=data['static'],
+                custom_skin_data=data.get("custom_skin_data", {}),
+                custom_skin_static_data=data.get("custom_skin_static_data", {}),
+                extra_hints=hints,
+                uptime=data.get("uptime"),
+                stage_title_template=data.get("stage_title_template"),
+                restrict_mode=data["restrict_mode"],
+                volume=int(data["volume"])
+            )
+        except Exception:
+            print(f"{self.bot.user} - Falha ao criar player: {guild.name} [{guild.id}]\n{traceback.format_exc()}")
+            await self.delete_data(guild.id)
+            return False
 
-                    try:
-                        track = player.queue.popleft()
-                    except:
-                        track = None
+        try:
+            player.mini_queue_enabled = data["mini_queue_enabled"]
+        except:
+            pass
 
-                    if track:
-                        player.current = track
-                        await player.play(track, start=int(data["position"]))
-                        player.last_track = track
-                        await player.set_pause(True)
-                        await player.invoke_np(rpc_update=True)
+        player.listen_along_invite = data.pop("listen_along_invite", "")
 
-                    else:
-                        await player.process_next()
+        player.dj = set(data["dj"])
+        player.loop = data["loop"]
 
-                else:
-                    await player.process_next(start_position=int(float(data["position"])))
+        try:
+            player.stage_title_event = data["stage_title_event"]
+        except:
+            pass
 
-                try:
-                    player.members_timeout_task.cancel()
-                except:
-                    pass
+        player.nightcore = data.get("nightcore")
 
-                if not check:
-                    await player.members_timeout(check=check, force=True)
-                else:
-                    player.members_timeout_task = self.bot.loop.create_task(player.members_timeout(check=check))
+        if player.nightcore:
+            await player.set_timescale(pitch=1.2, speed=1.1)
 
-                print(f"{self.bot.user} - Người chơi đã tiếp tục: {guild.name} [{guild.id}]")
+        tracks, playlists = self.process_track_cls(data["tracks"])
 
-        except Exception:
-            print(f"{self.bot.user} - Thất bại trong việc tiếp tục phát nhạc: \n{traceback.format_exc()}")
+        player.queue.extend(tracks)
 
-        self.bot.player_resumed = True
+        played_tracks, playlists = self.process_track_cls(data["played"], playlists)
 
-    async def get_player_sessions(self):
+        player.played.extend(played_tracks)
 
-        if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
-            return await self.bot.pool.mongo_database.query_data(db_name=str(self.bot.user.id), collection="player_sessions")
+        queue_autoplay_tracks, playlists = self.process_track_cls(data.get("queue_autoplay", []))
 
-        try:
-            files = os.listdir(f"./local_database/player_sessions/{self.bot.user.id}")
-        except FileNotFoundError:
-            return []
+        player.queue_autoplay.extend(queue_autoplay_tracks)
 
-        guild_data = []
+        playlists.clear()
+        tracks.clear()
+        played_tracks.clear()
+        queue_autoplay_tracks.clear()
 
-        for file in files:
+        await self.voice_connect_slot(guild)
 
-            guild_id = file[:-3]
+        await player.connect(voice_channel.id)
 
-            conn = await aiosqlite.connect(f'./local_database/player_sessions/{self.bot.user.id}/{guild_id}.db')
-            c = await conn.cursor()
+        await self.wait_voice_connection(guild)
 
-            await c.execute('SELECT json_data FROM dados')
-            data = await c.fetchone()
+        if isinstance(voice_channel, disnake.StageChannel) and \
+                voice_channel.permissions_for(guild.me).mute_members:
 
-            await conn.close()
+            await guild.me.edit(suppress=False)
 
-            if data:
-                guild_data.append(json.loads(data[0]))
+        player.set_command_log(
+            text="Trình phát đã được khôi phục thành công!",
+            emoji="🔰"
+        )
 
-        return guild_data
+        try:
+            check = any(m for m in player.guild.me.voice.channel.members if not m.bot)
+        except:
+            check = None
 
-    async def check_session(self, player: LavalinkPlayer):
+        if data.get("paused") and check:
 
-        try:
-            player.conn_cursor
-        except AttributeError:
             try:
-                conn = await aiosqlite.connect(f'./local_database/player_sessions/{self.bot.user.id}/{player.guild.id}.db')
-            except aiosqlite.OperationalError:
-                os.makedirs(f"./local_database/player_sessions/{self.bot.user.id}/")
-                conn = await aiosqlite.connect(f'./local_database/player_sessions/{self.bot.user.id}/{player.guild.id}.db')
-            player.conn = conn
-            player.conn_cursor = await conn.cursor()
+                track = player.queue.popleft()
+            except:
+                track = None
+
+            if track:
+                player.current = track
+                await player.play(track, start=int(data["position"]))
+                player.last_track = track
+                await player.set_pause(True)
+                await player.invoke_np(rpc_update=True)
+
+            else:
+                await player.process_next()
+
+        else:
+            await player.process_next(start_position=int(float(data["position"])))
+
+        try:
+            player.members_timeout_task.cancel()
+        except:
+            pass
+
+        if not check:
+            await player.members_timeout(check=check, force=True)
+        else:
+            player.schedule_members_timeout(check)
+
+        return True
+
+    async def get_player_sessions(self):
+
+        if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
+            return await self.bot.pool.mongo_database.query_data(db_name=str(self.bot.user.id), collection="player_sessions")
+
+        return await self.bot.pool.player_sessions.get_sessions(self.bot.user.id)
 
     async def save_session(self, player: LavalinkPlayer, data: dict):
 
@@ -492,6 +576,9 @@ class PlayerSession(commands.Cog):
         
 
         if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
+            tracks = [player.current] if player.current else []
+            tracks.extend(player.queue)
+            data["tracks"] = [self.track_info(t) for t in tracks]
             await self.bot.pool.mongo_database.update_data(
                 id_=str(player.guild.id),
                 data=data,
@@ -500,60 +587,24 @@ class PlayerSession(commands.Cog):
             )
             return
 
-        await self.check_session(player)
-
-        json_str = json.dumps(data)
-
-        try:
-            await player.conn_cursor.execute('UPDATE dados SET json_data = ? WHERE id = ?', (json_str, 1))
-        except:
-            try:
-                await player.conn_cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS dados (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        json_data TEXT
-                    )
-                ''')
-            except (ValueError, AttributeError):
-                try:
-                    player.conn.close()
-                except:
-                    pass
-                player.conn_cursor = None
-                await self.save_session(player, data)
-                return
-
-            await player.conn_cursor.execute('INSERT INTO dados (json_data) VALUES (?)', (json_str,))
-
-        await player.conn.commit()
+        data["current"] = self.track_info(player.current) if player.current else None
+        self.bot.pool.player_sessions.save(self.bot.user.id, player.guild.id, data)
+        self.save_queue(player)
 
     async def delete_data(self, player: Union[LavalinkPlayer, int]):
 
         if not isinstance(player, LavalinkPlayer):
-
             guild_id = int(player)
-
-            try:
-                player = self.bot.music[guild_id]
-            except KeyError:
-                player = None
-
         else:
             guild_id = player.guild.id
 
+        self.journals.pop(guild_id, None)
+
         if self.bot.config["PLAYER_SESSIONS_MONGODB"] and self.bot.config["MONGO"]:
             await self.bot.pool.mongo_database.delete_data(id_=str(guild_id), db_name=str(self.bot.user.id), collection="player_sessions")
             return
 
-        try:
-            await player.conn.close()
-        except:
-            pass
-
-        try:
-            os.remove(f'./local_database/player_sessions/{self.bot.user.id}/{guild_id}.db')
-        except FileNotFoundError:
-            return
+        self.bot.pool.player_sessions.delete(self.bot.user.id, guild_id)
 
     def cog_unload(self):
         try:
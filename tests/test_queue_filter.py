@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from utils.music.queue_filter import QueueFilter
+
+
+class FakeTrack:
+
+    def __init__(self, title: str, author: str, duration: int, requester: int = 0, playlist_name: str = ""):
+        self.title = title
+        self.author = author
+        self.duration = duration
+        self.requester = requester
+        self.playlist_name = playlist_name
+
+
+def test_counts_are_per_filter():
+
+    tracks = [
+        FakeTrack("Song A", "Artist", 60000),
+        FakeTrack("Song B", "Artist", 300000),
+        FakeTrack("Song C", "Artist", 400000),
+        FakeTrack("Other", "Someone", 500000),
+    ]
+
+    queue_filter = QueueFilter(tracks)
+    queue_filter.song_author("artist")
+    queue_filter.min_duration(200000)
+
+    kept, removed, counts = queue_filter.apply()
+
+    assert counts == {"song_author": 3, "time_below": 3}
+    assert removed == tracks[1:3]
+    assert kept == [tracks[0], tracks[3]]
+
+
+def test_counts_differ_between_filters():
+
+    tracks = [FakeTrack(f"Song {n}", "Artist", 1000 * n, requester=n % 2) for n in range(10)]
+
+    queue_filter = QueueFilter(tracks)
+    queue_filter.user(1)
+    queue_filter.max_duration(3000)
+
+    kept, removed, counts = queue_filter.apply()
+
+    assert counts == {"user": 5, "time_above": 4}
+    assert removed == [tracks[1], tracks[3]]
+    assert len(kept) == 8
@@ -6,6 +6,7 @@ import datetime
 import json
 import logging
 import os
+import signal
 import subprocess
 import traceback
 from configparser import ConfigParser
@@ -20,7 +21,8 @@ from asyncspotify import Client as SpotifyClient
 from disnake.ext import commands
 
 from config_loader import load_config
-from utils.db import MongoDatabase, LocalDatabase, get_prefix, DBModel, global_db_models
+from utils.db import MongoDatabase, LocalDatabase, get_prefix, DBModel, global_db_models, DocumentCache, LRUCache, \
+    PlayerSessionDatabase
 from utils.music.checks import check_pool_bots
 from utils.music.errors import GenericError
 from utils.music.local_lavalink import run_lavalink
@@ -28,6 +30,10 @@ from utils.music.models import music_mode, LavalinkPlayer
 from utils.music.spotify import spotify_client
 from utils.others import CustomContext, token_regex
 from utils.owner_panel import PanelView
+from utils.scheduler import Scheduler
+from utils.music.edit_queue import MessageEditQueue
+from utils.music.suggestions import SearchSuggestions
+from wavelink import SingleFlight, TrackCache
 from web_app import WSClient, start
 
 
@@ -38,9 +44,17 @@ class BotPool:
 
     def __init__(self):
         self.playlist_cache = {}
-        self.user_prefix_cache = {}
+        self.user_prefix_cache = LRUCache()
+        self.guild_prefix_cache = LRUCache()
+        self.partial_track_cache = LRUCache()
         self.mongo_database: Optional[MongoDatabase] = None
         self.local_database: Optional[LocalDatabase] = None
+        self.player_sessions: Optional[PlayerSessionDatabase] = None
+        self.db_cache: Optional[DocumentCache] = None
+        self.track_cache: Optional[TrackCache] = None
+        self.search_suggestions: Optional[SearchSuggestions] = None
+        self.inflight = SingleFlight()
+        self.render_cache_stats = {"hits": 0, "misses": 0}
         self.ws_client: Optional[WSClient] = None
         self.spotify: Optional[SpotifyClient] = None
         self.lavalink_instance: Optional[subprocess.Popen] = None
@@ -110,6 +124,8 @@ class BotPool:
 
                 await asyncio.sleep(5)
 
+                await self.close_databases()
+
                 await asyncio.create_subprocess_shell("kill 1")
 
                 return
@@ -152,6 +168,27 @@ class BotPool:
             [asyncio.create_task(self.start_bot(bot)) for bot in bots]
         )
 
+    async def close_databases(self):
+
+        for database in (self.mongo_database, self.local_database, self.player_sessions):
+
+            if not database:
+                continue
+
+            try:
+                await database.close()
+            except Exception:
+                traceback.print_exc()
+
+    def handle_sigterm(self, loop: asyncio.AbstractEventLoop):
+
+        async def shutdown():
+            await self.close_databases()
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        loop.remove_signal_handler(signal.SIGTERM)
+        loop.create_task(shutdown())
+
     def load_playlist_cache(self):
 
         try:
@@ -239,12 +276,36 @@ class BotPool:
         mongo_key = self.config.get("MONGO")
 
         if mongo_key:
-            self.mongo_database = MongoDatabase(mongo_key)
+            self.mongo_database = MongoDatabase(
+                mongo_key,
+                write_interval=self.config["MONGO_WRITE_INTERVAL"],
+                write_batch_size=self.config["MONGO_WRITE_BATCH_SIZE"]
+            )
         else:
             print(f"Mã thông báo/liên kết của MongoDB chưa được cấu hình ... \ trong dữ liệu từ cơ sở dữ liệu sẽ được lưu cục bộ "
                   f"trong tệp: local_database\n{'-' * 30}")
 
         self.local_database = LocalDatabase()
+        self.player_sessions = PlayerSessionDatabase()
+
+        self.db_cache = DocumentCache(max_size=self.config["DB_CACHE_SIZE"], ttl=self.config["DB_CACHE_TTL"])
+        self.user_prefix_cache.max_size = self.config["PREFIX_CACHE_SIZE"]
+        self.guild_prefix_cache.max_size = self.config["PREFIX_CACHE_SIZE"]
+        self.partial_track_cache.max_size = self.config["PARTIAL_TRACK_CACHE_SIZE"]
+
+        self.track_cache = TrackCache(
+            max_size=self.config["TRACK_CACHE_SIZE"],
+            max_bytes=self.config["TRACK_CACHE_MAX_MB"] * 1024 * 1024,
+            ttl=self.config["TRACK_CACHE_TTL"],
+            negative_ttl=self.config["TRACK_CACHE_NEGATIVE_TTL"]
+        )
+
+        self.search_suggestions = SearchSuggestions(
+            max_size=self.config["SEARCH_SUGGESTION_CACHE_SIZE"],
+            ttl=self.config["SEARCH_SUGGESTION_CACHE_TTL"],
+            debounce=self.config["SEARCH_SUGGESTION_DEBOUNCE_MS"] / 1000,
+            timeout=self.config["SEARCH_SUGGESTION_TIMEOUT_MS"] / 1000
+        )
 
         try:
             self.commit = check_output(['git', 'rev-parse', 'HEAD']).decode('ascii').strip()
@@ -506,6 +567,11 @@ class BotPool:
 
         self.database.start_task(loop)
 
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self.handle_sigterm, loop)
+        except NotImplementedError:
+            pass
+
         if self.config["RUN_RPC_SERVER"]:
 
             if not message:
@@ -519,6 +585,7 @@ class BotPool:
             try:
                 start(self, message=message)
             except KeyboardInterrupt:
+                loop.run_until_complete(self.close_databases())
                 return
 
         elif message:
@@ -533,6 +600,7 @@ class BotPool:
                     self.run_bots(self.bots)
                 )
             except KeyboardInterrupt:
+                loop.run_until_complete(self.close_databases())
                 return
 
 
@@ -561,6 +629,8 @@ class BotCore(commands.Bot):
         self.env_owner_ids = set()
         self.dm_cooldown = commands.CooldownMapping.from_cooldown(rate=2, per=30, type=commands.BucketType.member)
         self.number = kwargs.pop("number", 0)
+        self.scheduler = Scheduler()
+        self.edit_queue = MessageEditQueue(self)
         super().__init__(*args, **kwargs)
         self.music = music_mode(self)
         self.interaction_id: Optional[int] = None
@@ -606,20 +676,40 @@ class BotCore(commands.Bot):
             self.default_static_skin = "default"
 
     async def get_data(self, id_: int, *, db_name: Union[DBModel.guilds, DBModel.users]):
-        return await self.pool.database.get_data(
-            id_=id_, db_name=db_name, collection=str(self.user.id)
-        )
+
+        collection = str(self.user.id)
+
+        data = self.pool.db_cache.get(collection, db_name, id_)
+
+        if data is None:
+            data = await self.pool.database.get_data(
+                id_=id_, db_name=db_name, collection=collection
+            )
+            self.pool.db_cache.set(collection, db_name, id_, data, overwrite=False)
+
+        return data
 
     async def update_data(self, id_, data: dict, *, db_name: Union[DBModel.guilds, DBModel.users]):
-        return await self.pool.database.update_data(
-            id_=id_, data=data, db_name=db_name, collection=str(self.user.id)
+
+        collection = str(self.user.id)
+
+        result = await self.pool.database.update_data(
+            id_=id_, data=data, db_name=db_name, collection=collection
         )
 
+        self.pool.db_cache.update(collection, db_name, id_, data)
+
+        return result
+
     async def get_global_data(self, id_: int, *, db_name: Union[DBModel.guilds, DBModel.users]):
 
-        data = await self.pool.database.get_data(
-            id_=id_, db_name=db_name, collection="global", default_model=global_db_models
-        )
+        data = self.pool.db_cache.get("global", db_name, id_)
+
+        if data is None:
+            data = await self.pool.database.get_data(
+                id_=id_, db_name=db_name, collection="global", default_model=global_db_models
+            )
+            self.pool.db_cache.set("global", db_name, id_, data, overwrite=False)
 
         if db_name == DBModel.users:
             try:
@@ -637,10 +727,14 @@ class BotCore(commands.Bot):
             except KeyError:
                 pass
 
-        return await self.pool.database.update_data(
+        result = await self.pool.database.update_data(
             id_=id_, data=data, db_name=db_name, collection="global", default_model=global_db_models
         )
 
+        self.pool.db_cache.update("global", db_name, id_, data)
+
+        return result
+
     def check_skin(self, skin: str):
 
         if skin is None:
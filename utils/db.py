@@ -1,18 +1,25 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import asyncio
 import collections.abc
 import json
 import os
 import shutil
+import sqlite3
+import time
 import traceback
+from collections import OrderedDict
+from copy import deepcopy
 from datetime import datetime
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 from urllib.parse import urlparse, parse_qs, urlunparse, urlencode
 
+import aiosqlite
 import disnake
 from disnake.ext import commands
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
 from tinydb_serialization import Serializer, SerializationMiddleware
 from tinymongo import TinyMongoClient
 from tinymongo.serializers import DateTimeSerializer
@@ -92,11 +99,144 @@ async def get_prefix(bot: BotCore, message: disnake.Message):
     if not message.guild:
         return commands.when_mentioned_or(bot.default_prefix)
 
-    data = await bot.get_global_data(message.guild.id, db_name=DBModel.guilds)
+    try:
+        guild_prefix = bot.pool.guild_prefix_cache[message.guild.id]
+    except KeyError:
+        data = await bot.get_global_data(message.guild.id, db_name=DBModel.guilds)
+        guild_prefix = data.get("prefix") or ""
+        bot.pool.guild_prefix_cache[message.guild.id] = guild_prefix
+
+    return guild_prefix or bot.config.get("DEFAULT_PREFIX") or "!!"
+
+
+class LRUCache:
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def pop(self, key, default=None):
+        return self._data.pop(key, default)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total * 100, 2) if total else 0,
+        }
+
+
+class DocumentCache:
+
+    def __init__(self, max_size: int = 10000, ttl: int = 600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, collection: str, db_name: str, id_) -> Optional[dict]:
+
+        key = (collection, db_name, str(id_))
+
+        try:
+            expires, data = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return
 
-    prefix = data.get("prefix") or bot.config.get("DEFAULT_PREFIX") or "!!"
+        if expires < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return
 
-    return prefix
+        self._data.move_to_end(key)
+        self.hits += 1
+        return deepcopy(data)
+
+    def set(self, collection: str, db_name: str, id_, data: dict, *, overwrite: bool = True):
+
+        key = (collection, db_name, str(id_))
+
+        if not overwrite and key in self._data:
+            return
+
+        self._data[key] = (time.monotonic() + self.ttl, deepcopy(data))
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def update(self, collection: str, db_name: str, id_, data: dict):
+
+        key = (collection, db_name, str(id_))
+
+        try:
+            expires, cached_data = self._data[key]
+        except KeyError:
+            return
+
+        cached_data.update(deepcopy(data))
+        self._data[key] = (time.monotonic() + self.ttl, cached_data)
+        self._data.move_to_end(key)
+
+    def delete(self, collection: str, db_name: str, id_):
+        self._data.pop((collection, db_name, str(id_)), None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total * 100, 2) if total else 0,
+        }
 
 
 class BaseDB:
@@ -109,6 +249,9 @@ class BaseDB:
     def start_task(self, loop):
         pass
 
+    async def close(self):
+        pass
+
 
 
 class DatetimeSerializer(Serializer):
@@ -135,13 +278,123 @@ class CustomTinyMongoClient(TinyMongoClient):
 
 class LocalDatabase(BaseDB):
 
-    def __init__(self):
+    def __init__(self, path: str = "./local_database"):
         super().__init__()
 
-        if not os.path.isdir("./local_database"):
-            os.makedirs("./local_database")
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        self.path = path
+        self.db_file = f"{path}/local_database.db"
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    def start_task(self, loop):
+        loop.create_task(self.connect())
+
+    async def connect(self) -> aiosqlite.Connection:
+
+        if self._conn:
+            return self._conn
+
+        async with self._connect_lock:
 
-        self._connect = CustomTinyMongoClient('./local_database')
+            if self._conn:
+                return self._conn
+
+            conn = await aiosqlite.connect(self.db_file)
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "collection TEXT NOT NULL, "
+                "db_name TEXT NOT NULL, "
+                "id TEXT NOT NULL, "
+                "data TEXT NOT NULL, "
+                "PRIMARY KEY (collection, db_name, id))"
+            )
+            await conn.commit()
+
+            await self.migrate_tinymongo(conn)
+
+            self._conn = conn
+
+        return self._conn
+
+    def _read_tinymongo_files(self) -> list:
+
+        files = [f for f in os.listdir(self.path) if f.endswith(".json")]
+
+        if not files:
+            return []
+
+        client = CustomTinyMongoClient(self.path)
+
+        documents = []
+
+        for f in files:
+
+            collection = f[:-5]
+
+            try:
+                db = client[collection]
+                for db_name in db.tinydb.tables():
+                    if db_name == "_default":
+                        continue
+                    for data in db[db_name].find():
+                        data = dict(data)
+                        id_ = str(data.get("_id"))
+                        data["_id"] = id_
+                        documents.append((collection, db_name, id_, json.dumps(data, default=_json_default)))
+                db.tinydb.close()
+            except Exception:
+                print(f"Không thể chuyển đổi tệp cơ sở dữ liệu cục bộ: {f}\n{traceback.format_exc()}")
+                continue
+
+        return documents
+
+    async def migrate_tinymongo(self, conn: aiosqlite.Connection):
+
+        loop = asyncio.get_running_loop()
+
+        documents = await loop.run_in_executor(None, self._read_tinymongo_files)
+
+        if not documents:
+            return
+
+        await conn.executemany(
+            "INSERT OR IGNORE INTO documents (collection, db_name, id, data) VALUES (?, ?, ?, ?)", documents
+        )
+        await conn.commit()
+
+        backup_dir = f"{self.path}/tinymongo_backup"
+
+        if not os.path.isdir(backup_dir):
+            os.makedirs(backup_dir)
+
+        for f in {f"{d[0]}.json" for d in documents}:
+            try:
+                shutil.move(f"{self.path}/{f}", f"{backup_dir}/{f}")
+            except:
+                traceback.print_exc()
+
+        print(f"Đã chuyển cơ sở dữ liệu cục bộ (TinyMongo) sang sqlite: {len(documents)} tài liệu\n{'-' * 30}")
+
+    async def _find_one(self, id_: str, *, db_name: str, collection: str) -> Optional[dict]:
+
+        conn = await self.connect()
+
+        async with conn.execute(
+                "SELECT data FROM documents WHERE collection = ? AND db_name = ? AND id = ?",
+                (collection, db_name, id_)
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        if not row:
+            return
+
+        return json.loads(row[0], object_hook=_json_object_hook)
 
     async def get_data(self, id_: int, *, db_name: Union[DBModel.guilds, DBModel.users],
                        collection: str, default_model: dict = None):
@@ -151,12 +404,12 @@ class LocalDatabase(BaseDB):
 
         id_ = str(id_)
 
-        data = self._connect[collection][db_name].find_one({"_id": id_})
+        data = await self._find_one(id_, db_name=db_name, collection=collection)
 
         if not data:
             data = dict(default_model[db_name])
             data["_id"] = str(id_)
-            self._connect[collection][db_name].insert_one(data)
+            await self.update_data(id_, data, db_name=db_name, collection=collection)
 
         elif data["ver"] < default_model[db_name]["ver"]:
             data = update_values(dict(default_model[db_name]), data)
@@ -171,24 +424,75 @@ class LocalDatabase(BaseDB):
 
         id_ = str(id_)
 
-        if not self._connect[collection][db_name].update_one({'_id': id_}, {'$set': data}).raw_result:
-            data["_id"] = id_
-            self._connect[collection][db_name].insert_one(data)
+        conn = await self.connect()
+
+        async with self._write_lock:
+
+            current_data = await self._find_one(id_, db_name=db_name, collection=collection)
+
+            if current_data:
+                current_data.update(data)
+            else:
+                data["_id"] = id_
+                current_data = data
+
+            await conn.execute(
+                "INSERT OR REPLACE INTO documents (collection, db_name, id, data) VALUES (?, ?, ?, ?)",
+                (collection, db_name, id_, json.dumps(current_data, default=_json_default))
+            )
+            await conn.commit()
 
         return data
 
     async def query_data(self, db_name: str, collection: str, filter: dict = None, limit=500) -> list:
-        return self._connect[collection][db_name].find(filter or {})
+
+        conn = await self.connect()
+
+        async with conn.execute(
+                "SELECT data FROM documents WHERE collection = ? AND db_name = ?", (collection, db_name)
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        data_list = [json.loads(r[0], object_hook=_json_object_hook) for r in rows]
+
+        if filter:
+            data_list = [d for d in data_list if all(d.get(k) == v for k, v in filter.items())]
+
+        return data_list
+
+    async def close(self):
+
+        if not self._conn:
+            return
+
+        await self._conn.close()
+        self._conn = None
 
     async def delete_data(self, id_, db_name: str, collection: str):
-        return self._connect[collection][db_name].delete_one({'_id': str(id_)})
+
+        conn = await self.connect()
+
+        async with self._write_lock:
+            await conn.execute(
+                "DELETE FROM documents WHERE collection = ? AND db_name = ? AND id = ?",
+                (collection, db_name, str(id_))
+            )
+            await conn.commit()
 
 
 class MongoDatabase(BaseDB):
 
-    def __init__(self, token: str):
+    def __init__(self, token: str, write_interval: float = 0, write_batch_size: int = 100):
         super().__init__()
 
+        self.write_interval = write_interval
+        self.write_batch_size = write_batch_size
+        self._pending_writes: dict = {}
+        self._flushing_writes: dict = {}
+        self._pending_count = 0
+        self._flush_lock = asyncio.Lock()
+        self._write_task: Optional[asyncio.Task] = None
+
         fix_ssl = os.environ.get("MONGO_SSL_FIX") or os.environ.get("REPL_SLUG")
 
         if fix_ssl:
@@ -206,6 +510,59 @@ class MongoDatabase(BaseDB):
 
         self._connect = AsyncIOMotorClient(token.strip("<>"), connectTimeoutMS=30000)
 
+    def start_task(self, loop):
+        if self.write_interval > 0:
+            self._write_task = loop.create_task(self.write_loop())
+
+    async def write_loop(self):
+
+        while True:
+            await asyncio.sleep(self.write_interval)
+            try:
+                await self.flush()
+            except Exception:
+                traceback.print_exc()
+
+    async def flush(self):
+
+        async with self._flush_lock:
+
+            if not self._pending_writes:
+                return
+
+            pending_writes = self._pending_writes
+            self._flushing_writes = pending_writes
+            self._pending_writes = {}
+            self._pending_count = 0
+
+            for (collection, db_name), documents in pending_writes.items():
+
+                requests = [UpdateOne({'_id': id_}, {'$set': data}, upsert=True) for id_, data in documents.items()]
+
+                try:
+                    await self._connect[collection][db_name].bulk_write(requests, ordered=False)
+                except Exception:
+                    traceback.print_exc()
+                    # devolver as alterações que falharam para a fila (mantendo as mais recentes por cima).
+                    failed = self._pending_writes.setdefault((collection, db_name), {})
+                    for id_, data in documents.items():
+                        if id_ not in failed:
+                            self._pending_count += 1
+                        failed[id_] = dict(data, **failed.get(id_, {}))
+
+            self._flushing_writes = {}
+
+    async def close(self):
+
+        try:
+            self._write_task.cancel()
+        except AttributeError:
+            pass
+
+        self._write_task = None
+
+        await self.flush()
+
     async def push_data(self, data, *, db_name: Union[DBModel.guilds, DBModel.users], collection: str):
         await self._connect[collection][db_name].insert_one(data)
 
@@ -251,6 +608,19 @@ class MongoDatabase(BaseDB):
 
         data = await self._connect[collection][db_name].find_one({"_id": id_})
 
+        for pending_writes in (self._flushing_writes, self._pending_writes):
+
+            try:
+                pending_data = pending_writes[(collection, db_name)][id_]
+            except KeyError:
+                continue
+
+            if not data:
+                data = dict(default_model[db_name])
+                data["_id"] = id_
+
+            data.update(deepcopy(pending_data))
+
         if not data:
             return dict(default_model[db_name])
 
@@ -265,13 +635,376 @@ class MongoDatabase(BaseDB):
     async def update_data(self, id_, data: dict, *, db_name: Union[DBModel.guilds, DBModel.users, str],
                           collection: str, default_model: dict = None):
 
-        return await self._connect[collection][db_name].update_one({'_id': str(id_)}, {'$set': data}, upsert=True)
+        if not self._write_task:
+            return await self._connect[collection][db_name].update_one({'_id': str(id_)}, {'$set': data}, upsert=True)
+
+        documents = self._pending_writes.setdefault((collection, db_name), {})
+
+        try:
+            documents[str(id_)].update(deepcopy(data))
+        except KeyError:
+            documents[str(id_)] = deepcopy(data)
+            self._pending_count += 1
+
+        if self._pending_count >= self.write_batch_size:
+            await self.flush()
+
+        return data
 
     async def query_data(self, db_name: str, collection: str, filter: dict = None, limit=100) -> list:
+        await self.flush()
         return [d async for d in self._connect[collection][db_name].find(filter or {})]
 
     async def delete_data(self, id_, db_name: str, collection: str):
-        return await self._connect[collection][db_name].delete_one({'_id': str(id_)})
+
+        async with self._flush_lock:
+
+            try:
+                del self._pending_writes[(collection, db_name)][str(id_)]
+                self._pending_count -= 1
+            except KeyError:
+                pass
+
+            return await self._connect[collection][db_name].delete_one({'_id': str(id_)})
+
+
+def replay_queue_journal(order: list, tracks: dict, records: list):
+
+    for r in records:
+
+        op = r[0]
+
+        if op == "tracks":
+            tracks.update(r[1])
+        elif op == "popleft":
+            del order[:r[1]]
+        elif op == "append":
+            order.extend(r[1])
+        elif op == "insert":
+            order[r[1]:r[1]] = r[2]
+        elif op == "remove":
+            del order[r[1]:r[1] + r[2]]
+        elif op == "move":
+            order.insert(r[2], order.pop(r[1]))
+        elif op == "clear":
+            order.clear()
+        elif op == "rotate":
+            order[:] = order[-r[1]:] + order[:-r[1]]
+        elif op == "reverse":
+            order.reverse()
+
+    return order
+
+
+class PlayerSessionDatabase:
+
+    def __init__(self, path: str = "./local_database", commit_interval: float = 1):
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        self.path = path
+        self.db_file = f"{path}/player_sessions.db"
+        self.commit_interval = commit_interval
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._pending_saves = {}
+        self._pending_snapshots = {}
+        self._pending_records = {}
+        self._pending_deletes = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._seq = 0
+
+    async def connect(self) -> aiosqlite.Connection:
+
+        if self._conn:
+            return self._conn
+
+        async with self._connect_lock:
+
+            if self._conn:
+                return self._conn
+
+            conn = await aiosqlite.connect(self.db_file)
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "bot_id TEXT NOT NULL, "
+                "guild_id TEXT NOT NULL, "
+                "data TEXT NOT NULL, "
+                "tracks TEXT, "
+                "updated_at REAL NOT NULL, "
+                "PRIMARY KEY (bot_id, guild_id)) WITHOUT ROWID"
+            )
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_journal ("
+                "bot_id TEXT NOT NULL, "
+                "guild_id TEXT NOT NULL, "
+                "seq INTEGER NOT NULL, "
+                "records TEXT NOT NULL, "
+                "PRIMARY KEY (bot_id, guild_id, seq)) WITHOUT ROWID"
+            )
+
+            async with conn.execute("PRAGMA table_info(sessions)") as cursor:
+                if "tracks" not in [r[1] for r in await cursor.fetchall()]:
+                    await conn.execute("ALTER TABLE sessions ADD COLUMN tracks TEXT")
+
+            async with conn.execute("SELECT MAX(seq) FROM session_journal") as cursor:
+                self._seq = (await cursor.fetchone())[0] or 0
+
+            await conn.commit()
+
+            self._conn = conn
+
+        return self._conn
+
+    def _read_legacy_sessions(self, bot_id: str) -> list:
+
+        # sessões salvas no formato antigo (um arquivo sqlite por servidor)
+        legacy_dir = f"{self.path}/player_sessions/{bot_id}"
+
+        try:
+            files = [f for f in os.listdir(legacy_dir) if f.endswith(".db")]
+        except FileNotFoundError:
+            return []
+
+        sessions = []
+
+        for f in files:
+
+            try:
+                conn = sqlite3.connect(f"{legacy_dir}/{f}")
+                try:
+                    row = conn.execute("SELECT json_data FROM dados").fetchone()
+                finally:
+                    conn.close()
+            except sqlite3.Error:
+                print(f"Không thể chuyển đổi phiên người chơi: {legacy_dir}/{f}\n{traceback.format_exc()}")
+                continue
+
+            if row:
+                sessions.append((bot_id, f[:-3], row[0], time.time()))
+
+            os.remove(f"{legacy_dir}/{f}")
+
+        try:
+            os.rmdir(legacy_dir)
+        except OSError:
+            pass
+
+        return sessions
+
+    async def migrate_legacy_sessions(self, bot_id: str):
+
+        loop = asyncio.get_running_loop()
+
+        sessions = await loop.run_in_executor(None, self._read_legacy_sessions, bot_id)
+
+        if not sessions:
+            return
+
+        conn = await self.connect()
+
+        async with self._flush_lock:
+            await conn.executemany(
+                "INSERT OR IGNORE INTO sessions (bot_id, guild_id, data, updated_at) VALUES (?, ?, ?, ?)", sessions
+            )
+            await conn.commit()
+
+        print(f"Đã chuyển các phiên người chơi sang {self.db_file}: {len(sessions)}\n{'-' * 30}")
+
+    async def get_sessions(self, bot_id) -> list:
+
+        bot_id = str(bot_id)
+
+        await self.migrate_legacy_sessions(bot_id)
+        await self.flush()
+
+        conn = await self.connect()
+
+        async with conn.execute("SELECT guild_id, data, tracks FROM sessions WHERE bot_id = ?", (bot_id,)) as cursor:
+            rows = await cursor.fetchall()
+
+        async with conn.execute(
+                "SELECT guild_id, records FROM session_journal WHERE bot_id = ? ORDER BY guild_id, seq", (bot_id,)
+        ) as cursor:
+            journal_rows = await cursor.fetchall()
+
+        journal = {}
+
+        for guild_id, records in journal_rows:
+            journal.setdefault(guild_id, []).extend(json.loads(records))
+
+        sessions = []
+
+        for guild_id, data, tracks in rows:
+
+            data = json.loads(data, object_hook=_json_object_hook)
+
+            if tracks is not None:
+                snapshot = json.loads(tracks)
+                track_infos = dict(snapshot)
+                order = replay_queue_journal([uid for uid, info in snapshot], track_infos, journal.get(guild_id, []))
+                data["tracks"] = [track_infos[uid] for uid in order]
+
+            # a música atual é salva junto com os dados do player (a fila salva contém apenas as próximas músicas)
+            if "current" in data:
+                current = data.pop("current")
+                data["tracks"] = ([current] if current else []) + data.get("tracks", [])
+
+            sessions.append(data)
+
+        return sessions
+
+    def save(self, bot_id, guild_id, data: dict):
+        key = (str(bot_id), str(guild_id))
+        self._pending_deletes.discard(key)
+        self._pending_saves[key] = json.dumps(data, default=_json_default)
+        self.schedule_flush()
+
+    def save_tracks(self, bot_id, guild_id, tracks: list) -> int:
+        # snapshot completo da fila (compactação do journal): os registros anteriores são descartados
+        key = (str(bot_id), str(guild_id))
+        self._pending_deletes.discard(key)
+        self._pending_records.pop(key, None)
+        self._pending_snapshots[key] = json.dumps(tracks, default=_json_default)
+        self.schedule_flush()
+        return len(self._pending_snapshots[key])
+
+    def append(self, bot_id, guild_id, records: list) -> int:
+        key = (str(bot_id), str(guild_id))
+        records = json.dumps(records, default=_json_default)
+        self._pending_records.setdefault(key, []).append(records)
+        self.schedule_flush()
+        return len(records)
+
+    def delete(self, bot_id, guild_id):
+        key = (str(bot_id), str(guild_id))
+        self._pending_saves.pop(key, None)
+        self._pending_snapshots.pop(key, None)
+        self._pending_records.pop(key, None)
+        self._pending_deletes.add(key)
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        if not self._flush_task or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.commit_interval)
+        try:
+            await self.flush()
+        except Exception:
+            traceback.print_exc()
+
+    async def flush(self):
+
+        if not self._pending_saves and not self._pending_snapshots and not self._pending_records \
+                and not self._pending_deletes:
+            return
+
+        conn = await self.connect()
+
+        async with self._flush_lock:
+
+            saves, self._pending_saves = self._pending_saves, {}
+            snapshots, self._pending_snapshots = self._pending_snapshots, {}
+            records, self._pending_records = self._pending_records, {}
+            deletes, self._pending_deletes = self._pending_deletes, set()
+
+            now = time.time()
+
+            journal = []
+
+            for (b, g), r in records.items():
+                for data in r:
+                    self._seq += 1
+                    journal.append((b, g, self._seq, data))
+
+            try:
+                if deletes:
+                    await conn.executemany("DELETE FROM sessions WHERE bot_id = ? AND guild_id = ?", list(deletes))
+                    await conn.executemany(
+                        "DELETE FROM session_journal WHERE bot_id = ? AND guild_id = ?", list(deletes)
+                    )
+                if saves:
+                    await conn.executemany(
+                        "INSERT INTO sessions (bot_id, guild_id, data, updated_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT (bot_id, guild_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                        [(b, g, d, now) for (b, g), d in saves.items()]
+                    )
+                if snapshots:
+                    await conn.executemany(
+                        "INSERT INTO sessions (bot_id, guild_id, data, tracks, updated_at) VALUES (?, ?, '{}', ?, ?) "
+                        "ON CONFLICT (bot_id, guild_id) DO UPDATE SET tracks = excluded.tracks, updated_at = excluded.updated_at",
+                        [(b, g, t, now) for (b, g), t in snapshots.items()]
+                    )
+                    await conn.executemany(
+                        "DELETE FROM session_journal WHERE bot_id = ? AND guild_id = ?", list(snapshots)
+                    )
+                if journal:
+                    await conn.executemany(
+                        "INSERT INTO session_journal (bot_id, guild_id, seq, records) VALUES (?, ?, ?, ?)", journal
+                    )
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                self._requeue(saves, snapshots, records, deletes)
+                raise
+
+    def _requeue(self, saves: dict, snapshots: dict, records: dict, deletes: set):
+
+        # devolve para a fila o que não foi salvo (sem sobrescrever alterações mais recentes)
+        for k in deletes:
+            if k not in self._pending_saves and k not in self._pending_snapshots and k not in self._pending_records:
+                self._pending_deletes.add(k)
+
+        for k, d in saves.items():
+            if k not in self._pending_deletes:
+                self._pending_saves.setdefault(k, d)
+
+        for k in set(snapshots) | set(records):
+
+            if k in self._pending_deletes or k in self._pending_snapshots:
+                continue
+
+            if k in snapshots:
+                self._pending_snapshots[k] = snapshots[k]
+
+            self._pending_records[k] = records.get(k, []) + self._pending_records.get(k, [])
+
+    async def close(self):
+
+        try:
+            self._flush_task.cancel()
+        except AttributeError:
+            pass
+
+        await self.flush()
+
+        if not self._conn:
+            return
+
+        await self._conn.close()
+        self._conn = None
+
+
+def _json_default(obj):
+    # datetimes são salvos com uma tag para serem convertidos de volta em _json_object_hook
+    if isinstance(obj, datetime):
+        return {"$date": obj.isoformat()}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_object_hook(obj: dict):
+    if len(obj) == 1 and "$date" in obj:
+        try:
+            return datetime.fromisoformat(obj["$date"])
+        except (TypeError, ValueError):
+            pass
+    return obj
 
 
 def update_values(d, u):
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import time
+import traceback
+from collections import deque
+from typing import Dict, Optional, TYPE_CHECKING
+
+import disnake
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
+
+# prioridades (menor valor = maior prioridade)
+EDIT_INTERACTION = 0  # resposta de interação (botões/comandos do player)
+EDIT_UPDATE = 1  # mudança de estado do player (nova música, pause, fila etc)
+EDIT_REFRESH = 2  # atualização periódica (barra de progresso das skins com auto_update)
+
+
+class PendingEdit:
+
+    __slots__ = ('message', 'kwargs', 'priority', 'future', 'created_at')
+
+    def __init__(self, message: disnake.Message, kwargs: dict, priority: int):
+        self.message = message
+        self.kwargs = kwargs
+        self.priority = priority
+        self.future: asyncio.Future = asyncio.get_event_loop().create_future()
+        self.created_at = time.monotonic()
+
+
+class ChannelEditQueue:
+
+    __slots__ = ('channel_id', 'pending', 'sent', 'task')
+
+    def __init__(self, channel_id: int):
+        self.channel_id = channel_id
+        self.pending: Dict[int, PendingEdit] = {}
+        self.sent = deque()
+        self.task: Optional[asyncio.Task] = None
+
+
+class MessageEditQueue:
+
+    # Fila de edições por canal: várias atualizações do mesmo message enquanto ele aguarda na fila são agrupadas
+    # (apenas o estado mais recente é enviado), as edições são espaçadas de acordo com o limite de edições por canal
+    # e com o bucket de ratelimit do disnake, e as atualizações periódicas são descartadas quando não há folga no
+    # ratelimit (deixando espaço para respostas de interações).
+    def __init__(self, bot: BotCore, rate: int = 5, per: float = 5.0, reserve: int = 2):
+        self.bot = bot
+        self.rate = max(rate, 1)
+        self.per = per
+        self.reserve = min(max(reserve, 0), self.rate - 1)
+        self.channels: Dict[int, ChannelEditQueue] = {}
+        self.edits = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def edit(self, message: disnake.Message, *, priority: int = EDIT_UPDATE, **kwargs) -> asyncio.Future:
+
+        try:
+            queue = self.channels[message.channel.id]
+        except KeyError:
+            queue = self.channels[message.channel.id] = ChannelEditQueue(message.channel.id)
+
+        try:
+            pending = queue.pending[message.id]
+        except KeyError:
+            pending = queue.pending[message.id] = PendingEdit(message, kwargs, priority)
+        else:
+            # edição ainda não enviada: substitui pelo estado mais recente e mantém a maior prioridade
+            pending.message = message
+            pending.kwargs = kwargs
+            pending.priority = min(pending.priority, priority)
+            self.coalesced += 1
+
+        if not queue.task:
+            queue.task = self.bot.loop.create_task(self._worker(queue))
+
+        return pending.future
+
+    def discard(self, message: disnake.Message):
+
+        try:
+            pending = self.channels[message.channel.id].pending.pop(message.id)
+        except (KeyError, AttributeError):
+            return
+
+        if not pending.future.done():
+            pending.future.set_result(False)
+
+    def bucket_locked(self, message: disnake.Message) -> bool:
+        # o disnake mantém o lock do bucket travado até o reset quando o X-RateLimit-Remaining chega em 0
+        route = disnake.http.Route('PATCH', '/channels/{channel_id}/messages/{message_id}',
+                                   channel_id=message.channel.id, message_id=message.id)
+        try:
+            return self.bot.http._locks[route.bucket].locked()
+        except (KeyError, AttributeError):
+            return False
+
+    def headroom(self, queue: ChannelEditQueue) -> int:
+
+        now = time.monotonic()
+
+        while queue.sent and now - queue.sent[0] >= self.per:
+            queue.sent.popleft()
+
+        return self.rate - len(queue.sent)
+
+    async def _worker(self, queue: ChannelEditQueue):
+
+        try:
+
+            while queue.pending:
+
+                pending = min(queue.pending.values(), key=lambda p: (p.priority, p.created_at))
+
+                headroom = self.headroom(queue)
+
+                if pending.priority == EDIT_REFRESH and (headroom <= self.reserve or self.bucket_locked(pending.message)):
+                    # sem folga no ratelimit: a próxima atualização periódica já vai enviar um estado mais recente
+                    del queue.pending[pending.message.id]
+                    self.dropped += 1
+                    pending.future.set_result(False)
+                    continue
+
+                if headroom < 1:
+                    await asyncio.sleep(queue.sent[0] + self.per - time.monotonic())
+                    continue
+
+                del queue.pending[pending.message.id]
+
+                queue.sent.append(time.monotonic())
+                self.edits += 1
+
+                try:
+                    await pending.message.edit(**pending.kwargs)
+                except Exception as e:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                else:
+                    if not pending.future.done():
+                        pending.future.set_result(True)
+
+        except Exception:
+            traceback.print_exc()
+
+        finally:
+            queue.task = None
+            self._cleanup(queue)
+
+    def _cleanup(self, queue: ChannelEditQueue):
+
+        if queue.pending or queue.task or self.channels.get(queue.channel_id) is not queue:
+            return
+
+        # mantém o histórico de edições do canal até a janela do ratelimit expirar
+        if self.headroom(queue) < self.rate:
+            self.bot.loop.call_later(self.per, self._cleanup, queue)
+        else:
+            del self.channels[queue.channel_id]
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self.channels),
+            "pending": sum(len(q.pending) for q in self.channels.values()),
+            "edits": self.edits,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
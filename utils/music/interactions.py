@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from collections import OrderedDict
 from typing import List, Union, Optional
 
 import disnake
@@ -40,58 +41,74 @@ class VolumeInteraction(disnake.ui.View):
 
 class QueueInteraction(disnake.ui.View):
 
+    page_size = 12
+    page_cache_size = 5
+
     def __init__(self, player, user: disnake.Member, timeout=60):
 
         self.player = player
         self.bot = player.bot
         self.user = user
-        self.pages = []
-        self.select_pages = []
         self.current = 0
-        self.max_page = len(self.pages) - 1
+        self.max_page = 0
+        # páginas renderizadas sob demanda (apenas a página exibida), invalidadas quando a fila é alterada
+        self.page_cache = OrderedDict()
+        self.cache_version = None
         self.message: Optional[disnake.Message] = None
         super().__init__(timeout=timeout)
         self.embed = disnake.Embed(color=self.bot.get_color(user.guild.me))
         self.update_pages()
         self.update_embed()
 
-    def update_pages(self):
-
-        counter = 1
+    def render_page(self, page: int):
 
-        self.pages = list(disnake.utils.as_chunks(self.player.queue, max_size=12))
-        self.select_pages.clear()
+        if self.cache_version != self.player.queue.version:
+            self.page_cache.clear()
+            self.cache_version = self.player.queue.version
 
-        self.clear_items()
+        try:
+            self.page_cache.move_to_end(page)
+            return self.page_cache[page]
+        except KeyError:
+            pass
 
-        for n, page in enumerate(self.pages):
+        txt = "\n"
+        opts = []
 
-            txt = "\n"
-            opts = []
+        start = page * self.page_size
 
-            for t in page:
+        for counter, t in enumerate(self.player.queue[start:start + self.page_size], start=start + 1):
 
-                duration = time_format(t.duration) if not t.is_stream else '🔴 Livestream'
+            duration = time_format(t.duration) if not t.is_stream else '🔴 Livestream'
 
-                txt += f"`┌ {counter})` [`{fix_characters(t.title, limit=50)}`]({t.uri})\n" \
-                       f"`└ ⏲️ {duration}`" + (f" - `Lặp lại: {t.track_loops}`" if t.track_loops else  "") + \
-                       f" **|** `✋` <@{t.requester}>\n"
+            txt += f"`┌ {counter})` [`{fix_characters(t.title, limit=50)}`]({t.uri})\n" \
+                   f"`└ ⏲️ {duration}`" + (f" - `Lặp lại: {t.track_loops}`" if t.track_loops else  "") + \
+                   f" **|** `✋` <@{t.requester}>\n"
 
-                opts.append(
-                    disnake.SelectOption(
-                        label=f"{counter}. {t.author}"[:25], description=f"[{duration}] | {t.title}"[:50],
-                        value=f"queue_select_{t.unique_id}",
-                    )
+            opts.append(
+                disnake.SelectOption(
+                    label=f"{counter}. {t.author}"[:25], description=f"[{duration}] | {t.title}"[:50],
+                    value=f"queue_select_{t.unique_id}",
                 )
+            )
+
+        self.page_cache[page] = (txt, opts)
+
+        if len(self.page_cache) > self.page_cache_size:
+            self.page_cache.popitem(last=False)
+
+        return txt, opts
+
+    def update_pages(self):
 
-                counter += 1
+        self.current = 0
+        self.page_cache.clear()
 
-            self.pages[n] = txt
-            self.select_pages.append(opts)
+        self.clear_items()
 
         track_select = disnake.ui.Select(
             placeholder="Phát một bài hát cụ thể trên trang:",
-            options=self.select_pages[self.current],
+            options=self.render_page(self.current)[1],
             custom_id="queue_track_selection",
             max_values=1
         )
@@ -124,8 +141,7 @@ class QueueInteraction(disnake.ui.View):
         update_q.callback = self.update_q
         self.add_item(update_q)
 
-        self.current = 0
-        self.max_page = len(self.pages) - 1
+        self.max_page = max(len(self.player.queue) - 1, 0) // self.page_size
 
     async def on_timeout(self) -> None:
 
@@ -142,24 +158,25 @@ class QueueInteraction(disnake.ui.View):
 
 
     def update_embed(self):
+
+        # a fila pode ter sido alterada desde a última página exibida
+        self.max_page = max(len(self.player.queue) - 1, 0) // self.page_size
+        self.current = min(self.current, self.max_page)
+
+        txt, opts = self.render_page(self.current)
+
         self.embed.title = f"**Bài hát Fila [{self.current+1} / {self.max_page+1}]**"
-        self.embed.description = self.pages[self.current]
-        self.children[2].options = self.select_pages[self.current]
+        self.embed.description = txt
 
-        for n, c in enumerate(self.children):
+        for c in self.children:
             if isinstance(c, disnake.ui.StringSelect):
-                self.children[n].options = self.select_pages[self.current]
+                c.options = opts
 
     async def track_select_callback(self, interaction: disnake.MessageInteraction):
 
         track_id = interaction.values[0][13:]
 
-        track = None
-
-        for t in  self.player.queue:
-            if t.unique_id == track_id:
-                track = t
-                break
+        track = self.player.queue.get(track_id)
 
         if not track:
             await interaction.send(f"Âm nhạc như id \"{track_id}\" Không tìm thấy trong dòng người chơi...", ephemeral=True)
@@ -215,8 +232,6 @@ class QueueInteraction(disnake.ui.View):
 
     async def update_q(self, interaction: disnake.MessageInteraction):
 
-        self.current = 0
-        self.max_page = len(self.pages) - 1
         self.update_pages()
         self.update_embed()
         await interaction.response.edit_message(embed=self.embed, view=self)
@@ -2,19 +2,25 @@
 from __future__ import annotations
 import datetime
 import random
-import uuid
-from itertools import cycle
+import re
+from functools import lru_cache
+from itertools import cycle, islice
+from sys import intern
 from urllib.parse import quote
+from weakref import WeakValueDictionary
 
 import disnake
 import asyncio
 import wavelink
 from urllib import parse
 from utils.music.converters import fix_characters, time_format, get_button_style
-from utils.music.skin_utils import skin_converter
+from utils.music.skin_utils import SkinTemplate
 from utils.music.filters import AudioFilter
 from utils.db import DBModel
 from utils.others import send_idle_embed, PlayerControls
+from utils.scheduler import Timer
+from utils.music.edit_queue import EDIT_INTERACTION, EDIT_UPDATE, EDIT_REFRESH
+from utils.music.track_queue import TrackQueue
 import traceback
 from collections import deque
 from typing import Optional, Union, TYPE_CHECKING, List
@@ -24,6 +30,15 @@ if TYPE_CHECKING:
 
 exclude_tags = ["remix", "edit", "extend"]
 
+youtube_id_regex = re.compile(r"^[a-zA-Z0-9_-]{11}$")
+
+
+def partial_track_key(track: PartialTrack) -> tuple:
+    try:
+        return "search_uri", track.extra["search_uri"]
+    except (TypeError, KeyError):
+        return track.single_title.lower(), track.authors_string.lower(), int(track.duration // 1000)
+
 
 class PartialPlaylist:
 
@@ -42,115 +57,171 @@ class PartialPlaylist:
             return
 
 
+class TrackAlbum:
+
+    __slots__ = ('name', 'url', '__weakref__')
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+
+
+# álbuns compartilhados entre as músicas (ex: todas as músicas de um álbum do spotify usam a mesma instância)
+shared_albums: WeakValueDictionary = WeakValueDictionary()
+
+
+def get_album(name: str, url: str) -> TrackAlbum:
+    try:
+        return shared_albums[(name, url)]
+    except KeyError:
+        album = shared_albums[(name, url)] = TrackAlbum(name, url)
+        return album
+
+
+@lru_cache(maxsize=1000)
+def youtube_list_id(playlist_url: str) -> str:
+    try:
+        return parse.parse_qs(parse.urlparse(playlist_url).query)['list'][0]
+    except KeyError:
+        return ""
+
+
+PARTIAL_TRACK_INFO_KEYS = {"title", "author", "uri", "length", "isStream", "isSeekable", "sourceName", "extra", "id",
+                           "playlist"}
+
+
+def new_track_id() -> str:
+    return '%010x' % random.getrandbits(40)
+
+
 class PartialTrack:
 
-    __slots__ = ('id', 'thumb', 'source_name', 'info', 'playlist', 'unique_id', 'ytid')
+    __slots__ = ('id', 'ytid', 'unique_id', 'single_title', 'author', 'uri', 'duration', 'is_stream', 'source_name',
+                 'thumb', 'requester', 'track_loops', 'autoplay', '_authors', 'authors_md', 'album', 'playlist', 'extra')
 
     def __init__(self, *, uri: str = "", title: str = "", author="", thumb: str = "", duration: int = 0,
                  requester: int = 0, track_loops: int = 0, source_name: str = "", autoplay: bool = False,
                  info: dict = None, playlist: PartialPlaylist = None):
 
-        self.info = info or {
-            "author": fix_characters(author)[:97],
-            "title": title[:97],
-            "uri": uri,
-            "length": duration,
-            "isStream": False,
-            "isSeekable": True,
-            "sourceName": source_name,
-            "extra": {
-                "requester": requester,
-                "track_loops": track_loops,
-                "thumb": thumb,
-                "autoplay": autoplay
-            }
-        }
-
         self.id = ""
         self.ytid = ""
-        self.unique_id = str(uuid.uuid4().hex)[:10]
-        self.thumb = self.info["extra"]["thumb"]
+        self.unique_id = new_track_id()
         self.playlist: Optional[PartialPlaylist] = playlist
+        self._authors: Optional[List[str]] = None
+        self.authors_md: str = ""
+        self.album: Optional[TrackAlbum] = None
+        # campos adicionais pouco usados (ex: search_uri de links do yt-dlp)
+        self.extra: Optional[dict] = None
+
+        if not info:
+            self.single_title = title[:97]
+            self.author = intern(fix_characters(author)[:97])
+            self.uri = uri
+            self.duration = duration
+            self.is_stream = False
+            self.source_name = intern(source_name)
+            self.thumb = thumb
+            self.requester = requester
+            self.track_loops = track_loops
+            self.autoplay = autoplay
+            return
 
-    def __repr__(self):
-        return f"{self.info['sourceName']} - {self.duration} - {self.authors_string} - {self.title}"
+        extra = dict(info.get("extra") or {})
 
-    @property
-    def uri(self) -> str:
-        return self.info["uri"]
+        self.single_title = info["title"]
+        self.author = intern(info["author"])
+        self.uri = info["uri"]
+        self.duration = info["length"]
+        self.is_stream = info.get("isStream", False)
+        self.source_name = intern(info["sourceName"])
+        self.thumb = extra.pop("thumb", "")
+        self.requester = extra.pop("requester", 0)
+        self.track_loops = extra.pop("track_loops", 0)
+        self.autoplay = extra.pop("autoplay", False)
+        if "authors" in extra:
+            self._authors = [intern(a) for a in extra.pop("authors")]
+        self.authors_md = extra.pop("authors_md", "")
 
-    @property
-    def search_uri(self):
-        return f"https://www.youtube.com/results?search_query={quote(self.title)}"
+        if album := extra.pop("album", None):
+            self.album = get_album(album["name"], album["url"])
 
-    @property
-    def title(self) -> str:
-        return f"{self.author} - {self.single_title}"
+        extra.update((k, v) for k, v in info.items() if k not in PARTIAL_TRACK_INFO_KEYS)
 
-    @property
-    def single_title(self) -> str:
-        return self.info["title"]
+        if extra:
+            self.extra = extra
 
-    @property
-    def author(self) -> str:
-        return self.info["author"]
+    def __repr__(self):
+        return f"{self.source_name} - {self.duration} - {self.authors_string} - {self.title}"
 
     @property
-    def authors_string(self) -> str:
-        try:
-            return ", ".join(self.info["extra"]["authors"])
-        except KeyError:
-            return self.author
+    def info(self) -> dict:
+        # o dict de info só é montado ao serializar a música (ex: salvar a sessão do player)
+        extra = {
+            "requester": self.requester,
+            "track_loops": self.track_loops,
+            "thumb": self.thumb,
+            "autoplay": self.autoplay
+        }
 
-    @property
-    def authors_md(self) -> str:
-        try:
-            return self.info["extra"]["authors_md"]
-        except KeyError:
-            return ""
+        if self._authors is not None:
+            extra["authors"] = list(self._authors)
 
-    @property
-    def authors(self) -> List[str]:
-        try:
-            return self.info["extra"]["authors"]
-        except KeyError:
-            return [self.author]
+        if self.authors_md:
+            extra["authors_md"] = self.authors_md
 
-    @property
-    def requester(self) -> int:
-        return self.info["extra"]["requester"]
+        if self.album:
+            extra["album"] = {"name": self.album.name, "url": self.album.url}
+
+        info = {
+            "author": self.author,
+            "title": self.single_title,
+            "uri": self.uri,
+            "length": self.duration,
+            "isStream": self.is_stream,
+            "isSeekable": not self.is_stream,
+            "sourceName": self.source_name,
+            "extra": extra
+        }
+
+        if self.extra:
+            info.update(self.extra)
+
+        return info
 
     @property
-    def autoplay(self) -> bool:
-        try:
-            return self.info["extra"]["autoplay"]
-        except KeyError:
-            return False
+    def search_uri(self):
+        return f"https://www.youtube.com/results?search_query={quote(self.title)}"
 
     @property
-    def track_loops(self) -> int:
-        return self.info["extra"]["track_loops"]
+    def title(self) -> str:
+        return f"{self.author} - {self.single_title}"
 
     @property
-    def is_stream(self) -> bool:
-        return self.info["isStream"]
+    def authors(self) -> List[str]:
+        if self._authors is None:
+            return [self.author]
+        return self._authors
+
+    @authors.setter
+    def authors(self, authors: List[str]):
+        self._authors = [intern(a) for a in authors]
 
     @property
-    def duration(self) -> int:
-        return self.info["length"]
+    def authors_string(self) -> str:
+        return ", ".join(self.authors)
 
     @property
     def album_name(self) -> str:
         try:
-            return self.info["extra"]["album"]["name"]
-        except KeyError:
+            return self.album.name
+        except AttributeError:
             return ""
 
     @property
     def album_url(self) -> str:
         try:
-            return self.info["extra"]["album"]["url"]
-        except KeyError:
+            return self.album.url
+        except AttributeError:
             return ""
 
     @property
@@ -173,15 +244,16 @@ class LavalinkPlaylist:
     __slots__ = ('data', 'url', 'tracks')
 
     def __init__(self, data: dict, **kwargs):
-        self.data = data
         self.url = kwargs.pop("url")
         try:
-            if self.data['tracks'][0]['info'].get("sourceName") == "youtube":
-                self.url = f"https://www.youtube.com/playlist?list={parse.parse_qs(parse.urlparse(self.url).query)['list'][0]}"
+            if data['tracks'][0]['info'].get("sourceName") == "youtube":
+                self.url = f"https://www.youtube.com/playlist?list={youtube_list_id(self.url)}"
         except IndexError:
             pass
         self.tracks = [LavalinkTrack(
             id_=track['track'], info=track['info'], playlist=self, **kwargs) for track in data['tracks']]
+        # os dados brutos das músicas não são mantidos (as músicas já foram criadas acima)
+        self.data = {k: v for k, v in data.items() if k != "tracks"}
 
     @property
     def name(self):
@@ -190,63 +262,126 @@ class LavalinkPlaylist:
 
 class LavalinkTrack(wavelink.Track):
 
-    __slots__ = ('extra', 'playlist', 'unique_id')
+    __slots__ = ('source_name', 'requester', 'track_loops', 'autoplay', 'playlist', 'unique_id')
+
+    # os slots info/uri/thumb de wavelink.Track são substituídos por properties nesta classe: o espaço deles é
+    # reaproveitado para os dados que essas properties usam (evitando slots duplicados sem uso).
+    extra = wavelink.Track.info
+    _uri = wavelink.Track.uri
+    _thumb = wavelink.Track.thumb
+
+    def __init__(self, id_: str, info: dict, query: str = None, *args, **kwargs):
+
+        self.id = id_
+        self.query = query
+        self.title = fix_characters(info.get('title', '')[:97])
+        self.identifier = info.get('identifier', '')
+        self.ytid = self.identifier if youtube_id_regex.match(self.identifier) else None
+        self.length = info.get('length')
+        self.duration = self.length
+        self.author = intern(info.get('author', '')[:97])
+        self.is_stream = info.get('isStream')
+        self.dead = False
+        self.unique_id = new_track_id()
+        self.source_name = intern(info.get('sourceName') or 'LavalinkTrack')
+        self.playlist: Optional[LavalinkPlaylist] = kwargs.pop("playlist", None)
+
+        # campos adicionais pouco usados (ex: related do autoplay)
+        self.extra: Optional[dict] = None
+
+        if (extra := info.get("extra")) is None:
+            self.track_loops = kwargs.pop('track_loops', 0)
+            self.requester = kwargs.pop('requester', '')
+            self.autoplay = kwargs.pop("autoplay", '')
+        else:
+            extra = dict(extra)
+            self.track_loops = extra.pop('track_loops', 0)
+            self.requester = extra.pop('requester', '')
+            self.autoplay = extra.pop("autoplay", '')
+            extra.pop("thumb", None)
+            extra.pop("playlist", None)
+            if extra:
+                self.extra = extra
+
+        uri = info.get('uri') or ""
+        self._uri = None
+        self._thumb = ""
+
+        if self.source_name == "youtube":
+            if "list=" not in uri and (list_id := youtube_list_id(self.playlist_url)):
+                uri = f"{uri}&list={list_id}"
+            # a url padrão do youtube é gerada a partir do identifier (evitando guardar uma string por música)
+            if uri != self.uri:
+                self._uri = uri
+
+        elif self.source_name == "soundcloud":
+
+            self._thumb = (info.get("artworkUrl", "") or "").replace('large.jpg', 't500x500.jpg')
+
+            if "?in=" not in uri:
+                try:
+                    uri = f"{uri}?in=" + self.playlist_url.split("soundcloud.com/")[1]
+                except:
+                    pass
 
-    def __init__(self, *args, **kwargs):
-        try:
-            args[1]['title'] = fix_characters(args[1]['title'])[:97]
-        except IndexError:
-            pass
-        super().__init__(*args, **kwargs)
-        self.title = fix_characters(self.title)
-        self.info["title"] = self.title
-        self.unique_id = str(uuid.uuid4().hex)[:10]
+            self._uri = uri
 
-        try:
-            self.info['sourceName']
-        except:
-            self.info['sourceName'] = 'LavalinkTrack'
+        else:
+            self._thumb = info.get("artworkUrl", "") or ""
+            self._uri = uri
 
-        try:
-            self.info["extra"]
-        except KeyError:
-            self.info["extra"] = {
-                "track_loops": kwargs.pop('track_loops', 0),
-                "requester": kwargs.pop('requester', ''),
-                "autoplay": kwargs.pop("autoplay", '')
-            }
+    def __repr__(self):
+        return f"{self.source_name} - {self.duration if not self.is_stream else 'stream'} - {self.authors_string} - {self.title}"
 
-        self.playlist: Optional[LavalinkPlaylist] = kwargs.pop(
-            "playlist", None)
+    @property
+    def uri(self) -> str:
 
-        if self.info["sourceName"] == "youtube":
-            self.info["extra"]["thumb"] = f"https://img.youtube.com/vi/{self.ytid}/mqdefault.jpg"
-            if "list=" not in self.uri:
-                try:
-                    self.uri = f"{self.uri}&list={parse.parse_qs(parse.urlparse(self.playlist_url).query)['list'][0]}"
-                    self.info["uri"] = self.uri
-                except KeyError:
-                    pass
+        if self._uri is not None:
+            return self._uri
 
-        elif self.info["sourceName"] == "soundcloud":
+        uri = f"https://www.youtube.com/watch?v={self.identifier}"
 
-            self.info["extra"]["thumb"] = self.info.get(
-                "artworkUrl", "").replace('large.jpg', 't500x500.jpg')
+        if list_id := youtube_list_id(self.playlist_url):
+            uri += f"&list={list_id}"
 
-            if "?in=" not in self.uri:
-                try:
-                    self.uri = f"{self.uri}?in=" + self.playlist_url.split("soundcloud.com/")[1]
-                    self.info["uri"] = self.uri
-                except:
-                    pass
+        return uri
 
-        else:
-            self.info["extra"]["thumb"] = self.info.get("artworkUrl", "")
+    @uri.setter
+    def uri(self, uri: str):
+        self._uri = uri
 
-        self.thumb = self.info["extra"]["thumb"] or ""
+    @property
+    def thumb(self) -> str:
+        if self.source_name == "youtube":
+            return f"https://img.youtube.com/vi/{self.ytid}/mqdefault.jpg"
+        return self._thumb
 
-    def __repr__(self):
-        return f"{self.info['sourceName']} - {self.duration if not self.is_stream else 'stream'} - {self.authors_string} - {self.title}"
+    @property
+    def info(self) -> dict:
+        # o dict de info só é montado ao serializar a música (ex: salvar a sessão do player ou cache de playlist)
+        info = {
+            "identifier": self.identifier,
+            "isSeekable": not self.is_stream,
+            "author": self.author,
+            "length": self.length,
+            "isStream": self.is_stream,
+            "position": 0,
+            "title": self.title,
+            "uri": self.uri,
+            "sourceName": self.source_name,
+            "extra": {
+                "track_loops": self.track_loops,
+                "requester": self.requester,
+                "autoplay": self.autoplay,
+                "thumb": self.thumb,
+                **(self.extra or {})
+            }
+        }
+
+        if self._thumb:
+            info["artworkUrl"] = self._thumb
+
+        return info
 
     @property
     def single_title(self) -> str:
@@ -267,32 +402,17 @@ class LavalinkTrack(wavelink.Track):
     @property
     def album_name(self) -> str:
         try:
-            return self.info["extra"]["album"]["name"]
-        except KeyError:
+            return self.extra["album"]["name"]
+        except (TypeError, KeyError):
             return ""
 
     @property
     def album_url(self) -> str:
         try:
-            return self.info["extra"]["album"]["url"]
-        except KeyError:
+            return self.extra["album"]["url"]
+        except (TypeError, KeyError):
             return ""
 
-    @property
-    def requester(self) -> int:
-        return self.info["extra"]["requester"]
-
-    @property
-    def autoplay(self) -> bool:
-        try:
-            return self.info["extra"]["autoplay"]
-        except KeyError:
-            return False
-
-    @property
-    def track_loops(self) -> int:
-        return self.info["extra"]["track_loops"]
-
     @property
     def playlist_name(self) -> str:
         try:
@@ -324,7 +444,8 @@ class LavalinkPlayer(wavelink.Player):
         self.skin_static: str = kwargs.pop("skin_static", None) or self.bot.default_static_skin
         self.custom_skin_data = kwargs.pop("custom_skin_data", {})
         self.custom_skin_static_data = kwargs.pop("custom_skin_static_data", {})
-        self.queue: deque = deque()
+        self.skin_templates = {}
+        self.queue: TrackQueue = TrackQueue()
         self.played: deque = deque(maxlen=20)
         self.queue_autoplay: deque = deque(maxlen=30)
         self.failed_tracks: deque = deque(maxlen=30)
@@ -339,8 +460,10 @@ class LavalinkPlayer(wavelink.Player):
         self.dj: set = set()
         self.player_creator: Optional[int] = kwargs.pop('player_creator', None)
         self.filters: dict = {}
-        self.idle_task: Optional[asyncio.Task] = None
-        self.members_timeout_task: Optional[asyncio.Task] = None
+        self.idle_task: Optional[Timer] = None
+        self.members_timeout_task: Optional[Timer] = None
+        self.queue_updater_task: Optional[Timer] = None
+        self.prefetch_task: Optional[asyncio.Task] = None
         self.idle_timeout = self.bot.config["IDLE_TIMEOUT"]
         self.idle_endtime: Optional[datetime.datetime] = None
         self.hint_rate = self.bot.config["HINT_RATE"]
@@ -356,7 +479,7 @@ class LavalinkPlayer(wavelink.Player):
         self.last_stage_title = ""
         self.auto_update: int = 0
         self.listen_along_invite = kwargs.pop("listen_along_invite", "")
-        self.message_updater_task: Optional[asyncio.Task] = None
+        self.message_updater_task: Optional[Timer] = None
         # limitar apenas para dj's e staff's
         self.restrict_mode = kwargs.pop('restrict_mode', False)
         self.ignore_np_once = False  # não invocar player controller em determinadas situações
@@ -407,6 +530,7 @@ class LavalinkPlayer(wavelink.Player):
         self.hints: cycle = []
         self.current_hint: str = ""
         self.last_data: dict = {}
+        self.last_render_key: Optional[tuple] = None
         self.setup_features()
         self.setup_hints()
 
@@ -515,21 +639,36 @@ class LavalinkPlayer(wavelink.Player):
         random.shuffle(hints)
         self.hints = cycle(hints)
 
-    async def members_timeout(self, check: bool, force: bool = False):
+    def schedule_members_timeout(self, check: bool):
 
-        if self.auto_pause and self.paused:
-            if self.current:
-                try:
-                    await self.resolve_track(self.current)
-                    self.paused = False
-                    await self.play(self.current, start=self.position)
-                except Exception:
-                    traceback.print_exc()
-            self.auto_pause = False
-            update_log = True
+        if not check and self.auto_pause and self.paused:
+            # a retomada da pausa automática é feita imediatamente, apenas o timeout aguarda o idle_timeout
+            self.bot.loop.create_task(self.resume_auto_pause())
 
-        else:
-            update_log = False
+        self.members_timeout_task = self.bot.scheduler.schedule(
+            "members_timeout", self.guild.id, 0 if check else self.idle_timeout, self.members_timeout, check=check,
+            force=True
+        )
+
+    async def resume_auto_pause(self) -> bool:
+
+        if not self.auto_pause or not self.paused:
+            return False
+
+        if self.current:
+            try:
+                await self.resolve_track(self.current)
+                self.paused = False
+                await self.play(self.current, start=self.position)
+            except Exception:
+                traceback.print_exc()
+
+        self.auto_pause = False
+        return True
+
+    async def members_timeout(self, check: bool, force: bool = False):
+
+        update_log = await self.resume_auto_pause()
 
         if check:
 
@@ -687,7 +826,7 @@ class LavalinkPlayer(wavelink.Player):
                     continue
 
                 lavalink_track = LavalinkTrack(id_=t.id, info=t.info, autoplay=True, requester=self.bot.user.id)
-                lavalink_track.info["extra"]["related"] = info
+                lavalink_track.extra = {"related": info}
                 tracks_final.append(lavalink_track)
 
             tracks.clear()
@@ -735,7 +874,7 @@ class LavalinkPlayer(wavelink.Player):
                     await self.stop()
                     self.idle_endtime = disnake.utils.utcnow() + datetime.timedelta(seconds=self.idle_timeout)
                     self.last_track = None
-                    self.idle_task = self.bot.loop.create_task(self.idling_mode())
+                    self.idle_task = self.bot.scheduler.schedule("idle", self.guild.id, 0, self.idling_mode)
                     return
 
             except Exception as e:
@@ -840,6 +979,8 @@ class LavalinkPlayer(wavelink.Player):
 
         await self.play(track, start=start_position if not track.is_stream else 0)
 
+        self.schedule_prefetch()
+
     async def process_idle_message(self):
 
         if not self.static and not self.controller_mode:
@@ -943,7 +1084,7 @@ class LavalinkPlayer(wavelink.Player):
 
         try:
             if self.has_thread or self.static or self.text_channel.last_message_id == self.message.id:
-                await self.message.edit(**kwargs)
+                await self.bot.edit_queue.edit(self.message, **kwargs)
                 send_message = False
             else:
                 send_message = True
@@ -968,7 +1109,9 @@ class LavalinkPlayer(wavelink.Player):
         except:
             pass
 
-        await asyncio.sleep(self.idle_timeout)
+        self.idle_task.reschedule(self.idle_timeout, self.idle_timeout_expired)
+
+    async def idle_timeout_expired(self):
 
         msg = "💤 **⠂Người chơi đã bị tắt bởi không hoạt động...**"
 
@@ -1019,7 +1162,7 @@ class LavalinkPlayer(wavelink.Player):
                 .replace("{track.title}", self.current.single_title)\
                 .replace("{track.author}", self.current.authors_string)\
                 .replace("{track.duration}", time_format(self.current.duration) if not self.current.is_stream else "Livestream")\
-                .replace("{track.source}", self.current.info.get("sourceName", "desconhecido"))\
+                .replace("{track.source}", self.current.source_name or "desconhecido")\
                 .replace("{track.playlist}", self.current.playlist_name or "Sem playlist")\
                 .replace("{requester.name}", requester_name) \
                 .replace("{requester.tag}", requester_tag) \
@@ -1039,14 +1182,46 @@ class LavalinkPlayer(wavelink.Player):
         await func(topic=msg)
         self.last_stage_title = msg
 
+    def render_key(self) -> Optional[tuple]:
+
+        if self.temp_embed:
+            return
+
+        if self.paused or self.current.is_stream:
+            position = None
+        else:
+            position = (
+                # muda ao usar seek (o horário em que a música "iniciou" deixa de ser o mesmo). É calculado com base na
+                # última atualização de estado do lavalink (e não no horário atual) para não variar entre renderizações.
+                round(((self.last_update or 0) - (self.last_position or 0)) / 1000),
+                # atualização periódica das skins com barra de progresso
+                int(self.position // (self.auto_update * 1000)) if self.auto_update else 0,
+            )
+
+        return (
+            self.skin_static if self.static else self.skin, self.static, self.controller_mode, self.has_thread,
+            self.message.id if self.message else None, self.current.unique_id, self.current.track_loops,
+            self.paused, position, self.loop, self.volume, self.nightcore, self.autoplay, self.restrict_mode,
+            self.keep_connected, self.mini_queue_enabled, self.queue.version, self.command_log, self.command_log_emoji,
+            self.current_hint, self.node.identifier, self.ping,
+        )
+
+    def render_custom_skin(self, skin: str, data: str) -> dict:
+
+        # a skin é compilada apenas uma vez (e novamente caso seja editada via setskin)
+        template = self.skin_templates.get(skin)
+
+        if not template or template.source != data:
+            template = self.skin_templates[skin] = SkinTemplate(data)
+
+        return template.render_player(self)
+
     def start_message_updater_task(self):
-        try:
-            self.message_updater_task.cancel()
-        except AttributeError:
-            pass
-        self.message_updater_task = self.bot.loop.create_task(self.message_updater())
+        self.message_updater_task = self.bot.scheduler.schedule(
+            "message_updater", self.guild.id, self.auto_update or 0, self.message_updater
+        )
 
-    async def invoke_np(self, force=False, interaction=None, rpc_update=False):
+    async def invoke_np(self, force=False, interaction=None, rpc_update=False, refresh=False):
 
         if not self.current or self.updating:
 
@@ -1061,22 +1236,39 @@ class LavalinkPlayer(wavelink.Player):
         if rpc_update:
             await self.process_rpc()
 
+        render_key = self.render_key()
+
+        if render_key is not None and render_key == self.last_render_key and self.last_data is not None:
+            # nada visível mudou desde a última renderização: não é necessário renderizar/comparar a skin novamente.
+            self.bot.pool.render_cache_stats["hits"] += 1
+
+            try:
+                if not interaction.response.is_done():
+                    await interaction.response.defer()
+            except:
+                pass
+            return
+
+        self.bot.pool.render_cache_stats["misses"] += 1
+
         try:
             if self.static:
                 if self.skin_static.startswith("> custom_skin: "):
-                    data = skin_converter(self.custom_skin_static_data[self.skin_static[15:]], player=self)
+                    data = self.render_custom_skin(self.skin_static, self.custom_skin_static_data[self.skin_static[15:]])
                 else:
                     data = self.bot.player_static_skins[self.skin_static].load(self)
 
             else:
                 if self.skin.startswith("> custom_skin: "):
-                    data = skin_converter(self.custom_skin_data[self.skin[15:]], player=self)
+                    data = self.render_custom_skin(self.skin, self.custom_skin_data[self.skin[15:]])
                 else:
                     data = self.bot.player_skins[self.skin].load(self)
         except OverflowError:
             await self.process_next()
             return
 
+        self.last_render_key = render_key
+
         if data == self.last_data:
 
             try:
@@ -1202,7 +1394,8 @@ class LavalinkPlayer(wavelink.Player):
 
             try:
                 if interaction.response.is_done():
-                    await interaction.message.edit(allowed_mentions=self.allowed_mentions, **self.last_data)
+                    await self.bot.edit_queue.edit(interaction.message, priority=EDIT_INTERACTION,
+                                                   allowed_mentions=self.allowed_mentions, **self.last_data)
                 else:
                     await interaction.response.edit_message(allowed_mentions=self.allowed_mentions, **self.last_data)
                 self.updating = False
@@ -1217,7 +1410,13 @@ class LavalinkPlayer(wavelink.Player):
                     try:
 
                         try:
-                            await self.message.edit(allowed_mentions=self.allowed_mentions, **self.last_data)
+                            edit = self.bot.edit_queue.edit(self.message, priority=EDIT_REFRESH if refresh else EDIT_UPDATE,
+                                                            allowed_mentions=self.allowed_mentions, **self.last_data)
+                            # a edição fica na fila do canal: novas atualizações enquanto ela aguarda são agrupadas.
+                            self.updating = False
+                            if not await edit:
+                                # atualização descartada (sem folga no ratelimit)
+                                self.last_data = None
                         except:
                             if not self.bot.get_channel(self.text_channel.id):
                                 # canal não existe mais no servidor...
@@ -1260,6 +1459,9 @@ class LavalinkPlayer(wavelink.Player):
         except:
             pass
 
+        if self.message:
+            self.bot.edit_queue.discard(self.message)
+
         if not self.static and self.guild.me:
             try:
                 await self.message.delete()
@@ -1277,34 +1479,34 @@ class LavalinkPlayer(wavelink.Player):
 
     async def message_updater(self):
 
-        while True:
-
-            if not self.controller_mode:
-                pass
+        # executado pelo scheduler do bot: cada execução reagenda a próxima.
+        if not self.controller_mode:
+            delay = 10
 
-            elif self.auto_update:
+        elif self.auto_update:
 
-                await asyncio.sleep(self.auto_update)
+            try:
+                await self.invoke_np(refresh=True)
+            except:
+                traceback.print_exc()
 
-                try:
-                    await self.invoke_np()
-                except:
-                    traceback.print_exc()
+            delay = self.auto_update
 
-                continue
+        elif self.update:
 
-            elif self.update:
+            try:
+                await self.invoke_np()
+            except:
+                traceback.print_exc()
 
-                try:
-                    await self.invoke_np()
-                except:
-                    traceback.print_exc()
+            self.update = False
 
-                self.update = False
+            delay = 15
 
-                await asyncio.sleep(5)
+        else:
+            delay = 10
 
-            await asyncio.sleep(10)
+        self.message_updater_task.reschedule(delay)
 
     async def update_message(self, interaction: disnake.Interaction = None, force=False, rpc_update=False):
 
@@ -1346,6 +1548,11 @@ class LavalinkPlayer(wavelink.Player):
         except:
             pass
 
+        try:
+            self.prefetch_task.cancel()
+        except:
+            pass
+
         if self.guild.me:
 
             if self.static:
@@ -1359,7 +1566,8 @@ class LavalinkPlayer(wavelink.Player):
                 if self.has_thread:
 
                     try:
-                        await self.message.edit(
+                        await self.bot.edit_queue.edit(
+                            self.message,
                             embed=disnake.Embed(
                                 description=self.command_log,
                                 color=self.bot.get_color(self.guild.me)
@@ -1396,60 +1604,120 @@ class LavalinkPlayer(wavelink.Player):
         except:
             pass
 
-    async def resolve_track(self, track: PartialTrack):
+    def search_nodes(self) -> List[wavelink.Node]:
+
+        nodes = [n for n in self.bot.music.nodes.values() if n.search and n.available and n.is_available and not n.restarting]
+
+        if not nodes:
+            return [self.node]
+
+        nodes.sort(key=lambda n: self.bot.music.node_selector.score(n, search=True))
+        return nodes
+
+    async def resolve_track(self, track: PartialTrack, node: wavelink.Node = None):
 
         if track.id:
             return
 
+        key = partial_track_key(track)
+
+        try:
+            track.id, track.duration = self.bot.pool.partial_track_cache[key]
+        except KeyError:
+            pass
+        else:
+            self.queue.mark_changed(track)
+            return
+
         try:
+            result = await self.bot.pool.inflight.run(
+                ("resolve",) + key, self._search_partial_track, track, node or self.search_nodes()[0]
+            )
+        except Exception:
+            traceback.print_exc()
+            return
 
-            try:
-                to_search = track.info["search_uri"]
-                check_duration = False
-            except KeyError:
-                to_search = f"{self.bot.config['SEARCH_PROVIDER']}:{track.single_title.replace(' - ', ' ')} - {track.authors_string}"
-                check_duration = True
+        if not result:
+            return
 
+        self.bot.pool.partial_track_cache[key] = result
+        track.id, track.duration = result
+        self.queue.mark_changed(track)
+
+    async def _search_partial_track(self, track: PartialTrack, node: wavelink.Node):
+
+        try:
+            to_search = track.extra["search_uri"]
+            check_duration = False
+        except (TypeError, KeyError):
+            to_search = f"{self.bot.config['SEARCH_PROVIDER']}:{track.single_title.replace(' - ', ' ')} - {track.authors_string}"
+            check_duration = True
+
+        try:
+            tracks = (await node.get_tracks(to_search))
+        except wavelink.TrackNotFound:
+            tracks = None
+
+        if not tracks and self.bot.config['SEARCH_PROVIDER'] not in ("ytsearch", "ytmsearch", "scsearch"):
             try:
-                tracks = (await self.node.get_tracks(to_search))
+                tracks = await node.get_tracks(f"ytsearch:{track.single_title.replace(' - ', ' ')} - {track.authors_string}")
             except wavelink.TrackNotFound:
                 tracks = None
 
-            if not tracks and self.bot.config['SEARCH_PROVIDER'] not in ("ytsearch", "ytmsearch", "scsearch"):
-                tracks = await self.node.get_tracks(f"ytsearch:{track.single_title.replace(' - ', ' ')} - {track.authors_string}")
+        try:
+            tracks = tracks.tracks
+        except AttributeError:
+            pass
 
-            try:
-                tracks = tracks.tracks
-            except AttributeError:
-                pass
+        if not tracks:
+            return
 
-            selected_track = None
+        selected_track = None
 
-            for t in tracks:
+        for t in tracks:
 
-                if t.is_stream:
-                    continue
+            if t.is_stream:
+                continue
 
-                if any((i in t.title.lower() and i not in track.title.lower()) for i in exclude_tags):
-                    continue
+            if any((i in t.title.lower() and i not in track.title.lower()) for i in exclude_tags):
+                continue
 
-                if check_duration and ((t.duration - 10000) < track.duration < (t.duration + 10000)):
-                    selected_track = t
-                    break
+            if check_duration and ((t.duration - 10000) < track.duration < (t.duration + 10000)):
+                selected_track = t
+                break
 
-            if not selected_track:
-                selected_track = tracks[0]
+        if not selected_track:
+            selected_track = tracks[0]
 
-            track.id = selected_track.id
-            track.info["length"] = selected_track.duration
+        return selected_track.id, selected_track.duration
 
-        except IndexError:
+    def schedule_prefetch(self):
+
+        if not self.bot.config["TRACK_PREFETCH_COUNT"]:
             return
-        except Exception:
-            traceback.print_exc()
+
+        if self.prefetch_task and not self.prefetch_task.done():
+            return
+
+        self.prefetch_task = self.bot.loop.create_task(self.prefetch_tracks())
+
+    async def prefetch_tracks(self):
+
+        # resolve antecipadamente as próximas músicas do spotify da fila distribuindo as buscas entre os servidores
+        tracks = [t for t in islice(self.queue, self.bot.config["TRACK_PREFETCH_COUNT"])
+                  if isinstance(t, PartialTrack) and not t.id]
+
+        if not tracks:
             return
 
-        return
+        nodes = self.search_nodes()
+        semaphore = asyncio.Semaphore(max(self.bot.config["TRACK_PREFETCH_CONCURRENCY"], 1))
+
+        async def resolve(track: PartialTrack, node: wavelink.Node):
+            async with semaphore:
+                await self.resolve_track(track, node=node)
+
+        await asyncio.gather(*(resolve(t, nodes[n % len(nodes)]) for n, t in enumerate(tracks)))
 
     async def _send_rpc_data(self, users: List[int], stats: dict):
 
@@ -1556,7 +1824,7 @@ class LavalinkPlayer(wavelink.Player):
                 track: Union[LavalinkTrack, PartialTrack] = self.current
 
                 stats["track"] = {
-                    "source": track.info["sourceName"],
+                    "source": track.source_name,
                     "thumb": track.thumb if len(track.thumb) < 257 else "",
                     "title": track.single_title,
                     "url": track.uri,
@@ -1617,7 +1885,10 @@ class LavalinkPlayer(wavelink.Player):
         await cog.save_info(self)
 
         if create_task:
-            self.queue_updater_task = self.bot.loop.create_task(cog.queue_updater_task(self))
+            interval = self.bot.config["PLAYER_INFO_BACKUP_INTERVAL"]
+            self.queue_updater_task = self.bot.scheduler.schedule(
+                "queue_updater", self.guild.id, interval, cog.save_info, self, interval=interval
+            )
 
     async def track_end(self):
 
@@ -1635,7 +1906,7 @@ class LavalinkPlayer(wavelink.Player):
                 self.queue.insert(1, self.last_track)
                 self.is_previows_music = False
             elif self.last_track.track_loops:
-                self.last_track.info["extra"]["track_loops"] -= 1
+                self.last_track.track_loops -= 1
                 self.queue.insert(0, self.last_track)
             elif self.loop == "queue" or self.keep_connected:
                 if self.is_previows_music:
@@ -1807,4 +2078,4 @@ class LavalinkPlayer(wavelink.Player):
 
 
 def music_mode(bot: BotCore):
-    return wavelink.Client(bot=bot)
+    return wavelink.Client(bot=bot, track_cache=bot.pool.track_cache, inflight=bot.pool.inflight)
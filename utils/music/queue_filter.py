@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from itertools import compress, repeat
+from operator import add, attrgetter, not_
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from utils.music.track_queue import QueueTrack
+
+
+class QueueFilter:
+
+    # Filtro em massa das músicas da fila (usado no /clear): os atributos usados pelos filtros são extraídos uma única
+    # vez em colunas (listas) e cada filtro gera uma máscara (lista de bool) com uma única passada sobre a sua coluna.
+    # As músicas removidas são as que batem com todos os filtros adicionados.
+
+    columns_map: Dict[str, Callable] = {
+        "title": lambda f: list(map(str.lower, f.column("raw_title"))),
+        "author": lambda f: list(map(str.lower, f.column("raw_author"))),
+        "duplicate_key": lambda f: list(map(add, map(add, f.column("author"), repeat(" - ")), f.column("title"))),
+        "raw_title": lambda f: list(map(attrgetter("title"), f.tracks)),
+        "raw_author": lambda f: list(map(attrgetter("author"), f.tracks)),
+        "duration": lambda f: list(map(attrgetter("duration"), f.tracks)),
+        "requester": lambda f: list(map(attrgetter("requester"), f.tracks)),
+        "playlist": lambda f: [v or "" for v in map(attrgetter("playlist_name"), f.tracks)],
+    }
+
+    def __init__(self, tracks: Iterable[QueueTrack]):
+        self.tracks = list(tracks)
+        self.columns: Dict[str, list] = {}
+        self.masks: Dict[str, List[bool]] = {}
+
+    def column(self, name: str) -> list:
+        try:
+            return self.columns[name]
+        except KeyError:
+            column = self.columns[name] = self.columns_map[name](self)
+            return column
+
+    def add(self, name: str, mask: List[bool]):
+        self.masks[name] = mask
+
+    def song_name(self, query: str):
+        query = query.lower()
+        self.add("song_name", [query in v for v in self.column("title")])
+
+    def song_author(self, query: str):
+        query = query.lower()
+        self.add("song_author", [query in v for v in self.column("author")])
+
+    def user(self, user_id: int):
+        self.add("user", [v == user_id for v in self.column("requester")])
+
+    def absent_members(self, member_ids):
+        self.add("absent_members", [v not in member_ids for v in self.column("requester")])
+
+    def min_duration(self, duration: int):
+        self.add("time_below", [v >= duration for v in self.column("duration")])
+
+    def max_duration(self, duration: int):
+        self.add("time_above", [v <= duration for v in self.column("duration")])
+
+    def duplicates(self):
+        # a primeira ocorrência de cada música (autor - título) é mantida
+        seen = set()
+        self.add("duplicates", [k in seen or seen.add(k) is not None for k in self.column("duplicate_key")])
+
+    def playlist(self, name: str, partial: bool = False) -> Optional[str]:
+
+        column = self.column("playlist")
+
+        if partial:
+            # comandos de texto: usa a primeira playlist da fila que tiver o nome informado
+            query = name.lower()
+            name = next((v for v in column if v and (v == name or query in v.lower())), name)
+
+        self.add("playlist", [v == name for v in column])
+
+        return name
+
+    def apply(self) -> Tuple[List[QueueTrack], List[QueueTrack], Dict[str, int]]:
+
+        # quantidade de músicas que cada filtro encontrou sozinho (as removidas são as encontradas por todos os filtros)
+        counts = {name: sum(mask) for name, mask in self.masks.items()}
+
+        if not self.masks:
+            # sem filtros: todas as músicas selecionadas são removidas
+            return [], self.tracks, counts
+
+        selected = list(map(all, zip(*self.masks.values())))
+
+        return list(compress(self.tracks, map(not_, selected))), list(compress(self.tracks, selected)), counts
@@ -4,6 +4,8 @@ from __future__ import annotations
 import itertools
 import json
 import random
+import re
+from functools import lru_cache
 from typing import Optional, TYPE_CHECKING, Union
 
 import disnake
@@ -14,6 +16,221 @@ if TYPE_CHECKING:
     from utils.others import CustomContext
     from utils.music.models import LavalinkPlayer
 
+
+class PreviewTrack:
+
+    title = 'Sekai - Burn Me Down [NCS Release]'
+    author = "NoCopyrightSounds"
+    uri = "https://www.youtube.com/watch?v=2vFA0HL9kTk"
+    duration = 215000
+
+
+# placeholders por música (usados tanto na música atual quanto em cada item do queue_format)
+track_placeholders = {
+    'track.title_25': lambda t, n: fix_characters(t.title, 25),
+    'track.title_42': lambda t, n: fix_characters(t.title, 42),
+    'track.title_58': lambda t, n: fix_characters(t.title, 58),
+    'track.title': lambda t, n: t.title,
+    'track.url': lambda t, n: t.uri,
+    'track.author': lambda t, n: t.author,
+    'track.duration': lambda t, n: time_format(t.duration),
+    'track.number': lambda t, n: str(n),
+}
+
+
+def requester_tag(player: LavalinkPlayer):
+    requester = player.guild.get_member(player.current.requester)
+    return f"{requester.display_name}#{requester.discriminator}"
+
+
+player_placeholders = {
+    **{k: (lambda p, f=f: f(p.current, 0)) for k, f in track_placeholders.items()},
+    'track.thumb': lambda p: p.current.thumb,
+    'playlist.name': lambda p: p.current.playlist_name or "Nenhuma",
+    'playlist.url': lambda p: p.current.playlist_url,
+    'player.loop.mode': lambda p: 'Desativado' if not p.loop else 'Música atual' if p.loop == "current" else "Fila",
+    'player.queue.size': lambda p: str(len(p.queue)),
+    'player.volume': lambda p: str(p.volume),
+    'player.log.text': lambda p: p.command_log or "Sem registro.",
+    'player.log.emoji': lambda p: p.command_log_emoji or "",
+    'requester.mention': lambda p: f'<@{p.current.requester}>',
+    'requester.avatar': lambda p: p.guild.get_member(p.current.requester).display_avatar.with_static_format("png").url,
+    'requester.tag': requester_tag,
+    'guild.color': lambda p: hex(p.bot.get_color(p.guild.me).value)[2:],
+    'guild.icon': lambda p: p.guild.icon.with_static_format("png").url if p.guild.icon else "",
+    'guild.name': lambda p: p.guild.name,
+    'guild.id': lambda p: str(p.guild.id),
+}
+
+placeholder_regex = re.compile(
+    r"\{(" + "|".join(re.escape(k) for k in sorted([*player_placeholders, "queue_format"], key=len, reverse=True)) + r")\}"
+)
+
+
+class PlaceholderValues(dict):
+
+    # os valores só são calculados quando a skin realmente usa o placeholder
+    def __init__(self, placeholders: dict, *args):
+        super().__init__()
+        self.placeholders = placeholders
+        self.args = args
+
+    def __missing__(self, key):
+        try:
+            value = self.placeholders[key](*self.args)
+        except KeyError:
+            value = "{" + key + "}"
+        self[key] = value
+        return value
+
+
+class TextTemplate:
+
+    __slots__ = ('parts', 'slots')
+
+    def __init__(self, parts: list):
+        # re.split com grupo: índices pares são texto literal e ímpares são nomes de placeholders
+        self.parts = parts
+        self.slots = [(i, parts[i]) for i in range(1, len(parts), 2)]
+
+    def render(self, values: dict) -> str:
+        parts = self.parts.copy()
+        for i, name in self.slots:
+            parts[i] = values[name]
+        return "".join(parts)
+
+
+def compile_text(text: str) -> Union[str, TextTemplate]:
+    parts = placeholder_regex.split(text)
+    return text if len(parts) == 1 else TextTemplate(parts)
+
+
+def compile_value(value):
+
+    if isinstance(value, str):
+        return compile_text(value)
+
+    if isinstance(value, dict):
+        return {k: compile_value(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [compile_value(v) for v in value]
+
+    return value
+
+
+def render_value(value, values: dict):
+
+    if isinstance(value, TextTemplate):
+        return value.render(values)
+
+    if isinstance(value, dict):
+        return {k: render_value(v, values) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [render_value(v, values) for v in value]
+
+    return value
+
+
+class SkinTemplate:
+
+    # skin customizada compilada uma única vez: o json é lido apenas aqui e cada string vira uma lista de trechos
+    # literais e placeholders, permitindo renderizar a skin em uma única passada sem json.loads a cada atualização.
+    def __init__(self, data: str):
+
+        self.source = data
+
+        info = json.loads(data, strict=False)
+
+        self.template = {k: compile_value(v) for k, v in info.items()
+                         if k not in ("queue_format", "queue_max_entries", "player_features")}
+
+        self.queue_max_entries = info.get("queue_max_entries", 3) or 3
+        self.queue_format = compile_text(info.get("queue_format", "") or "")
+
+    def queue_text(self, tracks) -> str:
+
+        if isinstance(self.queue_format, str):
+            return "\n".join(itertools.repeat(self.queue_format, len(tracks)))
+
+        template = self.queue_format
+        slots = [(i, track_placeholders.get(name), "{" + name + "}") for i, name in template.slots]
+        lines = []
+
+        for n, t in enumerate(tracks, start=1):
+            parts = template.parts.copy()
+            for i, func, literal in slots:
+                parts[i] = func(t, n) if func else literal
+            lines.append("".join(parts))
+
+        return "\n".join(lines)
+
+    def render(self, values: dict) -> dict:
+
+        data = render_value(self.template, values)
+
+        if embeds := data.get("embeds"):
+            for d in embeds:
+                try:
+                    d["color"] = int(d["color"], 16)
+                except KeyError:
+                    continue
+
+            data["embeds"] = [disnake.Embed.from_dict(e) for e in embeds]
+
+        return data
+
+    def render_player(self, player: LavalinkPlayer) -> dict:
+
+        values = PlaceholderValues(player_placeholders, player)
+
+        if self.queue_format:
+            values["queue_format"] = self.queue_text(list(itertools.islice(player.queue, self.queue_max_entries))) \
+                                     or "Sem músicas."
+        else:
+            values["queue_format"] = "Sem músicas."
+
+        return self.render(values)
+
+    def render_preview(self, ctx: CustomContext) -> dict:
+
+        color = ctx.bot.get_color(ctx.guild.me)
+
+        try:
+            color = hex(ctx.bot.get_color(ctx.guild.me).value)[2:]
+        except AttributeError:
+            color = hex(color)
+
+        values = PlaceholderValues(track_placeholders, PreviewTrack, 0)
+
+        values.update({
+            'track.thumb': "https://img.youtube.com/vi/2vFA0HL9kTk/mqdefault.jpg",
+            'playlist.name': "🎵 DV 🎶",
+            'playlist.url': "https://www.youtube.com/playlist?list=PLKlXSJdWVVAD3iztmL2vFVrwA81sRkV7n",
+            'player.loop.mode': "Música Atual",
+            'player.queue.size': f"{self.queue_max_entries}",
+            'player.volume': "100",
+            'player.log.emoji': "⏭️",
+            'player.log.text': f"{random.choice(ctx.guild.members)} pulou a música.",
+            'requester.mention': ctx.author.mention,
+            'requester.avatar': ctx.author.display_avatar.with_static_format("png").url,
+            'requester.tag': f"{ctx.author.display_name}#{ctx.author.discriminator}",
+            'guild.color': color,
+            'guild.icon': ctx.guild.icon.with_static_format("png").url if ctx.guild.icon else "",
+            'guild.name': ctx.guild.name,
+            'guild.id': str(ctx.guild.id),
+            'queue_format': self.queue_text([PreviewTrack] * self.queue_max_entries) or "Sem músicas.",
+        })
+
+        return self.render(values)
+
+
+@lru_cache(maxsize=256)
+def compile_track_format(data: str) -> Union[str, TextTemplate]:
+    return compile_text(data)
+
+
 def track_title_format(
         track_title: str,
         track_author: str,
@@ -23,132 +240,32 @@ def track_title_format(
         track_number: int = 0
 ):
 
-    return data. \
-        replace('{track.title_25}', fix_characters(track_title, 25)). \
-        replace('{track.title_42}', fix_characters(track_title, 42)). \
-        replace('{track.title_58}', fix_characters(track_title, 58)). \
-        replace('{track.title}', track_title). \
-        replace('{track.url}', track_url). \
-        replace('{track.author}', track_author). \
-        replace('{track.duration}', time_format(track_duration)). \
-        replace('{track.number}', str(track_number))
-
-
-def skin_converter(data: str, ctx: CustomContext = None, player: Optional[LavalinkPlayer] = None) -> dict:
+    template = compile_track_format(data)
 
-    info = json.loads(data)
+    if isinstance(template, str):
+        return template
 
-    if player:
+    values = PlaceholderValues({})
 
-        requester = player.guild.get_member(player.current.requester)
-
-        queue_max_entries = info.pop("queue_max_entries", 3) or 3
-
-        queue_text = ""
-
-        if (queue_format:=info.pop("queue_format", "")):
-            queue_text = "\n".join(track_title_format(
-                track_title=t.title,
-                track_author=t.author,
-                track_url=t.uri,
-                track_duration=t.duration,
-                data=queue_format,
-                track_number=n+1
-            ) for n, t in enumerate(itertools.islice(player.queue, queue_max_entries)))
-
-        data = track_title_format(
-            track_title=player.current.title,
-            track_author=player.current.author,
-            track_url=player.current.uri,
-            track_duration=player.current.duration,
-            data=data
-        ). \
-            replace('{track.thumb}', player.current.thumb). \
-            replace('{playlist.name}', player.current.playlist_name or "Nenhuma"). \
-            replace('{playlist.url}', player.current.playlist_url). \
-            replace('{player.loop.mode}', 'Desativado' if not player.loop else 'Música atual' if player.loop == "current" else "Fila"). \
-            replace('{player.queue.size}', str(len(player.queue))). \
-            replace('{player.volume}', str(player.volume)). \
-            replace('{player.log.text}', player.command_log or "Sem registro."). \
-            replace('{player.log.emoji}', player.command_log_emoji or ""). \
-            replace('{requester.mention}', f'<@{player.current.requester}>'). \
-            replace('{requester.avatar}', requester.display_avatar.with_static_format("png").url). \
-            replace('{requester.tag}', f"{requester.display_name}#{requester.discriminator}"). \
-            replace('{guild.color}', hex(player.bot.get_color(player.guild.me).value)[2:]). \
-            replace('{guild.icon}', player.guild.icon.with_static_format("png").url if player.guild.icon else ""). \
-            replace('{guild.name}', player.guild.name). \
-            replace('{guild.id}', str(player.guild.id)). \
-            replace('{queue_format}', queue_text or "Sem músicas.")
-
-    else:
-
-        queue_max_entries = info.pop("queue_max_entries", 3) or 3
-
-        queue_text = ""
+    values.update({
+        'track.title_25': fix_characters(track_title, 25),
+        'track.title_42': fix_characters(track_title, 42),
+        'track.title_58': fix_characters(track_title, 58),
+        'track.title': track_title,
+        'track.url': track_url,
+        'track.author': track_author,
+        'track.duration': time_format(track_duration),
+        'track.number': str(track_number),
+    })
 
-        color = ctx.bot.get_color(ctx.guild.me)
+    return template.render(values)
 
-        try:
-            color = hex(ctx.bot.get_color(ctx.guild.me).value)[2:]
-        except AttributeError:
-            color = hex(color)
 
-        track = {
-            'title': 'Sekai - Burn Me Down [NCS Release]',
-            'author': "NoCopyrightSounds",
-            'url': "https://www.youtube.com/watch?v=2vFA0HL9kTk",
-            'duration': 215000
-        }
-
-        if (queue_format:=info.pop("queue_format", "")):
-            queue_text = "\n".join(track_title_format(
-                track_title=t['title'],
-                track_author=t['author'],
-                track_url=t['url'],
-                track_duration=t['duration'],
-                data=queue_format,
-                track_number=n+1
-            ) for n, t in enumerate([track] * queue_max_entries))
-
-        data = track_title_format(
-            track_title=track['title'],
-            track_author=track['author'],
-            track_url=track['url'],
-            track_duration=track['duration'],
-            data=data
-        ). \
-            replace('{track.thumb}', "https://img.youtube.com/vi/2vFA0HL9kTk/mqdefault.jpg"). \
-            replace('{playlist.name}', "🎵 DV 🎶"). \
-            replace('{playlist.url}', "https://www.youtube.com/playlist?list=PLKlXSJdWVVAD3iztmL2vFVrwA81sRkV7n"). \
-            replace('{player.loop.mode}', "Música Atual"). \
-            replace('{player.queue.size}', f"{queue_max_entries}"). \
-            replace('{player.volume}', "100"). \
-            replace('{player.log.emoji}', "⏭️"). \
-            replace('{player.log.text}', f"{random.choice(ctx.guild.members)} pulou a música."). \
-            replace('{requester.mention}', ctx.author.mention). \
-            replace('{requester.avatar}', ctx.author.display_avatar.with_static_format("png").url). \
-            replace('{requester.tag}', f"{ctx.author.display_name}#{ctx.author.discriminator}"). \
-            replace('{guild.color}', color). \
-            replace('{guild.icon}', ctx.guild.icon.with_static_format("png").url if ctx.guild.icon else ""). \
-            replace('{guild.name}', ctx.guild.name). \
-            replace('{guild.id}', str(ctx.guild.id)). \
-            replace('{queue_format}', queue_text or "Sem músicas.")
-
-    data = json.loads(data, strict=False)
-
-    for d in ("queue_format", "queue_max_entries", "player_features"):
-        try:
-            del data[d]
-        except KeyError:
-            continue
+def skin_converter(data: str, ctx: CustomContext = None, player: Optional[LavalinkPlayer] = None) -> dict:
 
-    if embeds := data.get("embeds"):
-        for d in embeds:
-            try:
-                d["color"] = int(d["color"], 16)
-            except KeyError:
-                continue
+    template = SkinTemplate(data)
 
-        data["embeds"] = [disnake.Embed.from_dict(e) for e in embeds]
+    if player:
+        return template.render_player(player)
 
-    return data
+    return template.render_preview(ctx)
@@ -51,7 +51,7 @@ class ClassicSkin:
         if not player.paused:
             (embed_top or embed).set_author(
                 name="Tocando Agora:",
-                icon_url=music_source_image(player.current.info["sourceName"])
+                icon_url=music_source_image(player.current.source_name)
             )
         else:
             (embed_top or embed).set_author(
@@ -92,7 +92,7 @@ class ClassicSkin:
 
         if player.current.autoplay:
             try:
-                mode = f" [`reprodução automática`]({player.current.info['extra']['related']['uri']})"
+                mode = f" [`reprodução automática`]({player.current.extra['related']['uri']})"
             except:
                 mode = "`reprodução automática`"
             txt += f"\n`No momento estou usando a` {mode} `enquanto aguardo algum membro do canal` {player.guild.me.voice.channel.mention} `adicionar novas músicas.`\n\n"
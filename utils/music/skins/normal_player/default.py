@@ -37,7 +37,7 @@ class DefaultSkin:
         if not player.paused:
             embed.set_author(
                 name="Đang phát:",
-                icon_url=music_source_image(player.current.info["sourceName"])
+                icon_url=music_source_image(player.current.source_name)
             )
         else:
             embed.set_author(
@@ -86,7 +86,7 @@ class DefaultSkin:
             txt += f"> 🎵 **⠂Âm nhạc tự động:** `Bật`"
 
             try:
-                txt += f" [`(link nhạc.)`]({player.current.info['extra']['related']['uri']})\n"
+                txt += f" [`(link nhạc.)`]({player.current.extra['related']['uri']})\n"
             except:
                 txt += "\n"
 
@@ -40,7 +40,7 @@ class Kokomi:
         if not player.paused:
             embed.set_author(
                 name="Tocando Agora:",
-                icon_url=music_source_image(player.current.info["sourceName"])
+                icon_url=music_source_image(player.current.source_name)
             )
 
         else:
@@ -72,7 +72,7 @@ class Kokomi:
             txt += f"> 🎵 **⠂Música automática:** `sim`"
 
             try:
-                txt += f" [`(Ref.)`]({player.current.info['extra']['related']['uri']})"
+                txt += f" [`(Ref.)`]({player.current.extra['related']['uri']})"
             except:
                 pass
         else:
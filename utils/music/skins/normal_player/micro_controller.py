@@ -41,7 +41,7 @@ class MicroController:
 
         embed.set_author(
             name="Tocando Agora:",
-            icon_url=music_source_image(player.current.info["sourceName"])
+            icon_url=music_source_image(player.current.source_name)
         )
 
         if player.command_log:
@@ -38,7 +38,7 @@ class Nahida:
         if not player.paused:
             embed.set_author(
                 name="Đang phát:",
-                icon_url=music_source_image(player.current.info["sourceName"])
+                icon_url=music_source_image(player.current.source_name)
             )
 
         else:
@@ -38,7 +38,7 @@ class DefaultStaticSkin:
             emoji = "▶️"
             embed.set_author(
                 name="Tocando Agora:",
-                icon_url=music_source_image(player.current.info["sourceName"])
+                icon_url=music_source_image(player.current.source_name)
             )
 
         else:
@@ -101,7 +101,7 @@ class DefaultStaticSkin:
 
         if player.current.autoplay:
             try:
-                mode = f" [`reprodução automática`]({player.current.info['extra']['related']['uri']})"
+                mode = f" [`reprodução automática`]({player.current.extra['related']['uri']})"
             except:
                 mode = "`reprodução automática`"
             txt += f"\n`No momento estou usando a` {mode} `enquanto aguardo algum membro do canal` {player.guild.me.voice.channel.mention} `adicionar novas músicas.`\n"
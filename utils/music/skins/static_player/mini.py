@@ -44,7 +44,7 @@ class MiniStaticSkin:
             emoji = "▶️"
             embed.set_author(
                 name="Tocando Agora:",
-                icon_url=music_source_image(player.current.info["sourceName"]),
+                icon_url=music_source_image(player.current.source_name),
             )
 
         else:
@@ -79,7 +79,7 @@ class MiniStaticSkin:
 
         if player.current.autoplay:
             try:
-                mode = f" [`reprodução automática`]({player.current.info['extra']['related']['uri']})"
+                mode = f" [`reprodução automática`]({player.current.extra['related']['uri']})"
             except:
                 mode = "`reprodução automática`"
             embed.add_field(name="🔄 **⠂Música automática:**", value=f"\n`No momento estou usando a` {mode} `enquanto aguardo algum membro do canal #{player.guild.me.voice.channel.name} adicionar novas músicas.`\n")
@@ -9,7 +9,7 @@ from asyncspotify import Client, ClientCredentialsFlow
 
 from utils.music.converters import fix_characters
 from utils.music.errors import MissingSpotifyClient, GenericError
-from utils.music.models import PartialPlaylist, PartialTrack
+from utils.music.models import PartialPlaylist, PartialTrack, get_album
 
 if TYPE_CHECKING:
     from utils.client import BotCore
@@ -33,7 +33,7 @@ async def process_spotify(bot: BotCore, requester: int, query: str):
     url_type, url_id = matches.groups()
 
     if url_type == "track":
-        result = await bot.spotify.get_track(url_id)
+        result = await bot.pool.inflight.run(("spotify", url_type, url_id), bot.spotify.get_track, url_id)
 
         t = PartialTrack(
             uri=result.link,
@@ -45,17 +45,14 @@ async def process_spotify(bot: BotCore, requester: int, query: str):
             requester=requester
         )
 
-        t.info["extra"]["authors"] = [fix_characters(i.name) for i in result.artists if f"feat. {i.name.lower()}"
+        t.authors = [fix_characters(i.name) for i in result.artists if f"feat. {i.name.lower()}"
                                       not in result.name.lower()]
 
-        t.info["extra"]["authors_md"] = ", ".join(f"[`{a.name}`]({a.link})" for a in result.artists)
+        t.authors_md = ", ".join(f"[`{a.name}`]({a.link})" for a in result.artists)
 
         try:
             if result.album.name != result.name:
-                t.info["extra"]["album"] = {
-                    "name": result.album.name,
-                    "url": result.album.external_urls["spotify"]
-                }
+                t.album = get_album(result.album.name, result.album.external_urls["spotify"])
         except (AttributeError, KeyError):
             pass
 
@@ -70,7 +67,7 @@ async def process_spotify(bot: BotCore, requester: int, query: str):
 
     if url_type == "album":
 
-        result = await bot.spotify.get_album(url_id)
+        result = await bot.pool.inflight.run(("spotify", url_type, url_id), bot.spotify.get_album, url_id)
 
         if len(result.tracks) < 2:
 
@@ -99,7 +96,9 @@ async def process_spotify(bot: BotCore, requester: int, query: str):
 
     elif url_type == "artist":
 
-        result = await bot.spotify.get_artist_top_tracks(url_id)
+        result = await bot.pool.inflight.run(
+            ("spotify", url_type, url_id), bot.spotify.get_artist_top_tracks, url_id
+        )
 
         data["playlistInfo"]["name"] = "As mais tocadas de: " + \
                                        [a.name for a in result[0].artists if a.id == url_id][0]
@@ -107,7 +106,7 @@ async def process_spotify(bot: BotCore, requester: int, query: str):
 
     elif url_type == "playlist":
         try:
-            result = await bot.spotify.get_playlist(url_id)
+            result = await bot.pool.inflight.run(("spotify", url_type, url_id), bot.spotify.get_playlist, url_id)
         except asyncspotify.NotFound:
             raise GenericError("**Playlist não encontrada (ou está disponível apenas em contas logadas na plataforma).**")
         data["playlistInfo"]["name"] = result.name
@@ -142,19 +141,16 @@ async def process_spotify(bot: BotCore, requester: int, query: str):
         )
 
         try:
-            track.info["extra"]["album"] = {
-                "name": t.album.name,
-                "url": t.album.external_urls["spotify"]
-            }
+            track.album = get_album(t.album.name, t.album.external_urls["spotify"])
         except (AttributeError, KeyError):
             pass
 
         if t.artists[0].name:
-            track.info["extra"]["authors"] = [fix_characters(i.name) for i in t.artists if f"feat. {i.name.lower()}" not in t.name.lower()]
-            track.info["extra"]["authors_md"] = ", ".join(f"[`{a.name}`]({a.link})" for a in t.artists)
+            track.authors = [fix_characters(i.name) for i in t.artists if f"feat. {i.name.lower()}" not in t.name.lower()]
+            track.authors_md = ", ".join(f"[`{a.name}`]({a.link})" for a in t.artists)
         else:
-            track.info["extra"]["authors"] = ["Unknown Artist"]
-            track.info["extra"]["authors_md"] = "`Unknown Artist`"
+            track.authors = ["Unknown Artist"]
+            track.authors_md = "`Unknown Artist`"
 
         playlist.tracks.append(track)
 
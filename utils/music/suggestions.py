@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import time
+import traceback
+from collections import OrderedDict
+from itertools import chain
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from utils.music.converters import google_search
+
+if TYPE_CHECKING:
+    from utils.client import BotCore
+
+
+class SearchSuggestions:
+
+    # Sugestões do autocomplete do /play: cache (LRU + TTL) compartilhado entre todos os bots da pool, debounce por
+    # usuário (apenas a última tecla digitada gera uma requisição) e cancelamento das requisições que ficaram obsoletas.
+    # Caso a requisição demore ou seja substituída, as sugestões são montadas a partir das buscas anteriores (prefixos
+    # já em cache), das músicas tocadas recentemente e do cache de playlists.
+    def __init__(self, *, max_size: int = 5000, ttl: float = 600, debounce: float = 0.3, timeout: float = 1.5,
+                 max_entries: int = 20):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.debounce = debounce
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+        self.debounced = 0
+        self.cancelled = 0
+        self.fallbacks = 0
+        self._data: OrderedDict = OrderedDict()
+        self.waiters: Dict[int, asyncio.Future] = {}
+        self.fetches: Dict[str, list] = {}
+
+    def __len__(self):
+        return len(self._data)
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def get_cached(self, key: str) -> Optional[List[str]]:
+
+        try:
+            expires, results = self._data[key]
+        except KeyError:
+            return
+
+        if expires < time.monotonic():
+            del self._data[key]
+            return
+
+        self._data.move_to_end(key)
+        return results
+
+    def set_cached(self, key: str, results: List[str]):
+
+        self._data[key] = (time.monotonic() + self.ttl, results)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    async def get(self, bot: BotCore, user_id: int, query: str) -> List[str]:
+
+        key = self.normalize(query)
+
+        if not key:
+            return []
+
+        if (results := self.get_cached(key)) is not None:
+            self.hits += 1
+            return results
+
+        self.misses += 1
+
+        # nova tecla digitada pelo usuário: a requisição anterior dele fica obsoleta
+        try:
+            previous = self.waiters[user_id]
+        except KeyError:
+            pass
+        else:
+            if not previous.done():
+                previous.set_result(None)
+
+        waiter = self.waiters[user_id] = asyncio.get_event_loop().create_future()
+        fetch = None
+
+        try:
+
+            done, _ = await asyncio.wait([waiter], timeout=self.debounce)
+
+            if done:
+                self.debounced += 1
+                return self.fallback(bot, key, query)
+
+            # a mesma busca pode ter sido concluída por outro usuário durante o debounce
+            if (results := self.get_cached(key)) is not None:
+                self.hits += 1
+                return results
+
+            fetch = self.start_fetch(bot, key)
+
+            done, _ = await asyncio.wait([fetch[0], waiter], timeout=self.timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+
+            if fetch[0] in done and (results := fetch[0].result()) is not None:
+                return results
+
+            return self.fallback(bot, key, query)
+
+        finally:
+
+            if self.waiters.get(user_id) is waiter:
+                del self.waiters[user_id]
+
+            if fetch:
+                self.release(fetch, cancel=waiter.done())
+
+    def start_fetch(self, bot: BotCore, key: str) -> list:
+
+        try:
+            fetch = self.fetches[key]
+        except KeyError:
+            fetch = self.fetches[key] = [asyncio.create_task(self.fetch(bot, key)), 0]
+            self.requests += 1
+
+        fetch[1] += 1
+        return fetch
+
+    def release(self, fetch: list, cancel: bool = False):
+
+        fetch[1] -= 1
+
+        # requisição que ninguém mais aguarda e cujo texto já foi alterado pelo usuário: cancela. Se apenas demorou,
+        # continua para que o resultado fique em cache para as próximas teclas.
+        if cancel and fetch[1] <= 0 and not fetch[0].done():
+            fetch[0].cancel()
+            self.cancelled += 1
+
+    async def fetch(self, bot: BotCore, key: str) -> Optional[List[str]]:
+
+        try:
+            results = await google_search(bot, key, max_entries=self.max_entries)
+        except asyncio.CancelledError:
+            return
+        except Exception:
+            traceback.print_exc()
+            return
+        else:
+            self.set_cached(key, results)
+            return results
+        finally:
+            try:
+                if self.fetches[key][0] is asyncio.current_task():
+                    del self.fetches[key]
+            except KeyError:
+                pass
+
+    def fallback(self, bot: BotCore, key: str, query: str) -> List[str]:
+
+        self.fallbacks += 1
+
+        results = {query.strip()[:99]: None}
+
+        # buscas anteriores com o início do texto digitado
+        for n in range(len(key) - 1, 0, -1):
+            if (cached := self.get_cached(key[:n])) is not None:
+                results.update((r, None) for r in cached if key in r.lower())
+                break
+
+        titles = chain(
+            (t.title for b in bot.pool.bots for p in b.music.players.values()
+             for t in chain((p.current,) if p.current else (), p.played)),
+            (t["info"]["title"] for tracks in bot.pool.playlist_cache.values() for t in tracks),
+        )
+
+        for title in titles:
+            if len(results) >= self.max_entries:
+                break
+            if key in title.lower():
+                results[title[:99]] = None
+
+        return list(results)[:self.max_entries]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "requests": self.requests,
+            "debounced": self.debounced,
+            "cancelled": self.cancelled,
+            "fallbacks": self.fallbacks,
+            "hit_rate": round(self.hits / total * 100, 2) if total else 0,
+        }
@@ -0,0 +1,600 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import random
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from utils.music.models import LavalinkTrack, PartialTrack
+
+    QueueTrack = Union[LavalinkTrack, PartialTrack]
+
+
+def track_tokens(track: QueueTrack) -> frozenset:
+    return frozenset(f"{track.title} {track.author} {track.playlist_name or ''}".lower().split())
+
+
+class QueueSearchIndex:
+
+    # Índice invertido dos termos (título, autor e nome da playlist) das músicas da fila: termo -> unique_ids e
+    # trigrama -> termos, permitindo achar as músicas que contém uma palavra (prefixo ou substring) sem percorrer a
+    # fila inteira.
+
+    __slots__ = ('postings', 'grams', 'entries')
+
+    def __init__(self, tracks: Iterable = ()):
+        self.postings: Dict[str, Set[str]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+        self.entries: Dict[str, list] = {}
+        for t in tracks:
+            self.add(t)
+
+    @staticmethod
+    def trigrams(word: str) -> set:
+        return {word[i:i + 3] for i in range(len(word) - 2)}
+
+    def add(self, track: QueueTrack):
+
+        try:
+            self.entries[track.unique_id][1] += 1
+            return
+        except KeyError:
+            pass
+
+        tokens = track_tokens(track)
+        self.entries[track.unique_id] = [tokens, 1, track]
+
+        for token in tokens:
+            try:
+                self.postings[token].add(track.unique_id)
+            except KeyError:
+                self.postings[token] = {track.unique_id}
+                for g in self.trigrams(token):
+                    try:
+                        self.grams[g].add(token)
+                    except KeyError:
+                        self.grams[g] = {token}
+
+    def remove(self, track: QueueTrack):
+
+        try:
+            entry = self.entries[track.unique_id]
+        except KeyError:
+            return
+
+        entry[1] -= 1
+
+        if entry[1] > 0:
+            return
+
+        del self.entries[track.unique_id]
+
+        for token in entry[0]:
+            uids = self.postings[token]
+            uids.discard(track.unique_id)
+            if uids:
+                continue
+            del self.postings[token]
+            for g in self.trigrams(token):
+                tokens = self.grams[g]
+                tokens.discard(token)
+                if not tokens:
+                    del self.grams[g]
+
+    def match(self, word: str) -> List[str]:
+
+        token_sets = []
+
+        for g in self.trigrams(word):
+            try:
+                token_sets.append(self.grams[g])
+            except KeyError:
+                return []
+
+        token_sets.sort(key=len)
+
+        return [t for t in token_sets[0].intersection(*token_sets[1:]) if word in t]
+
+    def candidates(self, query: str, max_size: int) -> Optional[Set[str]]:
+
+        # palavras com menos de 3 letras ou que aparecem em mais de max_size músicas praticamente não filtram a fila
+        # (é mais rápido percorrer a fila e parar nos primeiros resultados), retorna None caso nenhuma palavra da
+        # busca possa ser usada para filtrar a fila.
+        result = None
+
+        for word in sorted(set(query.lower().split()), key=len, reverse=True):
+
+            if len(word) < 3:
+                continue
+
+            postings = [self.postings[t] for t in self.match(word)]
+
+            if sum(len(p) for p in postings) > max_size:
+                continue
+
+            uids = set().union(*postings)
+            result = uids if result is None else result & uids
+
+            if not result:
+                return set()
+
+        return result
+
+
+class TrackQueue:
+
+    # Fila de músicas do player: lista dividida em blocos (de load até 2*load itens) com uma árvore de Fenwick sobre o
+    # tamanho dos blocos (posição -> bloco em O(log n)) e um índice unique_id -> bloco (música -> posição sem varrer
+    # a fila). Inserir/remover/mover por posição custa O(log n + load), shuffle/reverse O(n) e a iteração continua
+    # igual à de um deque (as skins usam islice(player.queue, x)).
+    # Obs: assim como no deque, não modifique a fila enquanto estiver iterando sobre ela.
+    # O índice de busca (QueueSearchIndex) só é criado na primeira busca e depois é atualizado a cada alteração.
+    # version é incrementado a cada alteração na fila (usado para invalidar páginas/textos já renderizados).
+    # journal: quando é uma lista, cada alteração na fila é registrada nela (com as músicas afetadas) para que a fila
+    # salva da sessão do player seja atualizada apenas com as alterações ao invés de percorrer a fila inteira.
+
+    __slots__ = ('load', 'version', 'journal', '_blocks', '_owner', '_len', '_fen', '_pos', '_dirty', '_index')
+
+    # alterações registradas sem serem salvas: acima disso o journal é descartado (a fila será salva por completo)
+    max_journal = 4096
+
+    def __init__(self, iterable: Iterable = (), load: int = 256):
+        self.load = max(load, 4)
+        self.version = 0
+        self.journal: Optional[list] = None
+        self.clear()
+        self.extend(iterable)
+
+    def __repr__(self):
+        return f"<TrackQueue size={self._len} blocks={len(self._blocks)}>"
+
+    def __len__(self):
+        return self._len
+
+    def __bool__(self):
+        return self._len > 0
+
+    def __iter__(self):
+        return chain.from_iterable(self._blocks)
+
+    def __reversed__(self):
+        return chain.from_iterable(reversed(b) for b in reversed(self._blocks))
+
+    def __contains__(self, track):
+        try:
+            self.index(track)
+        except ValueError:
+            return False
+        return True
+
+    def __getitem__(self, index: Union[int, slice]):
+
+        if isinstance(index, slice):
+            if index.step is None and (index.start or 0) >= 0 and (index.stop is None or index.stop >= 0):
+                return list(islice(self, index.start, index.stop))
+            return list(self)[index]
+
+        b, o = self._locate(self._normalize(index))
+        return self._blocks[b][o]
+
+    def __setitem__(self, index: int, track: QueueTrack):
+
+        index = self._normalize(index)
+        b, o = self._locate(index)
+        block = self._blocks[b]
+        self._record("remove", index, 1)
+        self._record("insert", index, [track])
+        self._unlink(block[o], block)
+        if self._index is not None:
+            self._index.remove(block[o])
+            self._index.add(track)
+        block[o] = track
+        self._owner[track.unique_id] = block
+        self.version += 1
+
+    def __delitem__(self, index: int):
+        self.pop(index)
+
+    def clear(self):
+        if self.journal is not None:
+            # as alterações anteriores deixam de importar
+            self.journal = [["clear"]]
+        self.version += 1
+        self._blocks: List[list] = []
+        self._owner: Dict[str, list] = {}
+        self._len = 0
+        self._fen: List[int] = [0]
+        self._pos: Dict[int, int] = {}
+        self._dirty = False
+        self._index: Optional[QueueSearchIndex] = None
+
+    def get(self, unique_id: str, default=None) -> Optional[QueueTrack]:
+
+        try:
+            block = self._owner[unique_id]
+        except KeyError:
+            return default
+
+        for t in block:
+            if t.unique_id == unique_id:
+                return t
+
+        return default
+
+    def index(self, track: QueueTrack) -> int:
+
+        block = self._owner.get(track.unique_id)
+
+        if block is not None:
+            try:
+                return self._start(self._block_index(block)) + block.index(track)
+            except (ValueError, KeyError):
+                pass
+
+        # índice desatualizado (ex: a mesma música adicionada mais de uma vez na fila): busca linear
+        for n, t in enumerate(self):
+            if t is track or t == track:
+                self._owner[track.unique_id] = self._blocks[self._locate(n)[0]]
+                return n
+
+        raise ValueError(f"{track!r} is not in queue")
+
+    def index_by_id(self, unique_id: str) -> int:
+
+        if (track := self.get(unique_id)) is None:
+            raise ValueError(f"unique_id {unique_id} is not in queue")
+
+        return self.index(track)
+
+    def append(self, track: QueueTrack):
+
+        if self.journal is not None and self.journal and self.journal[-1][0] == "append":
+            self.journal[-1][1].append(track)
+        else:
+            self._record("append", [track])
+
+        if not self._blocks:
+            self._new_block([track], 0)
+            return
+
+        b = len(self._blocks) - 1
+        self._insert_at(b, len(self._blocks[b]), track)
+
+    def appendleft(self, track: QueueTrack):
+
+        self._record("insert", 0, [track])
+
+        if not self._blocks:
+            self._new_block([track], 0)
+            return
+
+        self._insert_at(0, 0, track)
+
+    def insert(self, index: int, track: QueueTrack):
+
+        # mesmo comportamento do list/deque.insert para índices negativos ou fora do tamanho da fila
+        if index < 0:
+            index = max(index + self._len, 0)
+
+        if index >= self._len:
+            self.append(track)
+        else:
+            self._record("insert", index, [track])
+            self._insert_at(*self._locate(index), track)
+
+    def extend(self, iterable: Iterable):
+
+        items = list(iterable)
+
+        if not items:
+            return
+
+        self._record("append", items)
+
+        if self._blocks and (free := self.load - len(self._blocks[-1])) > 0:
+            block = self._blocks[-1]
+            head, items = items[:free], items[free:]
+            block.extend(head)
+            for t in head:
+                self._owner[t.unique_id] = block
+                if self._index is not None:
+                    self._index.add(t)
+            self._len += len(head)
+            self.version += 1
+            self._grow(len(self._blocks) - 1, len(head))
+
+        for i in range(0, len(items), self.load):
+            self._new_block(items[i:i + self.load], len(self._blocks))
+
+    def extendleft(self, iterable: Iterable):
+        # igual ao deque.extendleft: os itens ficam em ordem reversa no início da fila
+        items = list(iterable)
+        items.reverse()
+        if items:
+            self._record("insert", 0, items)
+        for i in range(len(items) - self.load, -self.load, -self.load):
+            self._new_block(items[max(i, 0):i + self.load], 0)
+
+    def pop(self, index: int = -1) -> QueueTrack:
+        if not self._len:
+            raise IndexError("pop from an empty queue")
+        index = self._normalize(index)
+        self._record("remove", index, 1)
+        return self._remove_at(*self._locate(index))
+
+    def popleft(self) -> QueueTrack:
+        if not self._len:
+            raise IndexError("pop from an empty queue")
+        if self.journal is not None and self.journal and self.journal[-1][0] == "popleft":
+            self.journal[-1][1] += 1
+        else:
+            self._record("popleft", 1)
+        return self._remove_at(0, 0)
+
+    def remove(self, track: QueueTrack):
+        index = self.index(track)
+        self._record("remove", index, 1)
+        self._remove_at(*self._locate(index))
+
+    def remove_many(self, tracks: Iterable) -> int:
+
+        tracks = list(tracks)
+
+        if len(tracks) * 16 < self._len:
+            # poucas músicas: mais barato remover uma por uma do que reconstruir a fila
+            for t in tracks:
+                self.remove(t)
+            return len(tracks)
+
+        # remove várias músicas reconstruindo a fila uma única vez
+        ids = set(map(id, tracks))
+        kept = [t for t in self if id(t) not in ids]
+        removed = self._len - len(kept)
+
+        index = self._index
+        self.clear()
+        self.extend(kept)
+
+        if index is not None:
+            for t in tracks:
+                index.remove(t)
+            self._index = index
+
+        return removed
+
+    def move(self, index: int, new_index: int) -> QueueTrack:
+        track = self.pop(index)
+        self.insert(new_index, track)
+        return track
+
+    def rotate(self, n: int = 1):
+
+        if self._len < 2 or not (n := n % self._len):
+            return
+
+        self._record("rotate", n)
+
+        # igual ao deque.rotate: as últimas n músicas vão para o início
+        b = self._split_at(self._len - n)
+        self._blocks = self._blocks[b:] + self._blocks[:b]
+        self._dirty = True
+        self.version += 1
+
+    def reverse(self):
+        self._record("reverse")
+        self._blocks.reverse()
+        for block in self._blocks:
+            block.reverse()
+        self._dirty = True
+        self.version += 1
+
+    def shuffle(self):
+        items = list(self)
+        random.shuffle(items)
+        index = self._index
+        self.clear()
+        self.extend(items)
+        self._index = index
+
+    def mark_changed(self, track: QueueTrack):
+        # informações de uma música da fila alteradas (ex: PartialTrack resolvida): será salva e exibida novamente
+        if track.unique_id in self._owner:
+            self._record("tracks", [track])
+            self.version += 1
+
+    def search(self, query: str) -> Iterator[Tuple[int, QueueTrack]]:
+
+        # retorna (posição, música) em ordem da fila apenas das músicas que contém todas as palavras da busca
+        # (com 3 ou mais letras) no título, autor ou nome da playlist. A verificação final fica por conta de quem usa.
+        if self._index is None:
+            self._index = QueueSearchIndex(self)
+
+        uids = self._index.candidates(query, max(self._len // 8, 200))
+
+        if uids is None or len(uids) > 512 or len(uids) * 8 > self._len:
+            # muitos resultados: é mais rápido percorrer a fila (quem usa geralmente para nos primeiros resultados)
+            return ((n, t) for n, t in enumerate(self) if uids is None or t.unique_id in uids)
+
+        results = []
+
+        for uid in uids:
+            track = self._index.entries[uid][2]
+            results.append((self.index(track), track))
+
+        results.sort(key=lambda r: r[0])
+        return iter(results)
+
+    def _record(self, *record):
+
+        if self.journal is None:
+            return
+
+        if len(self.journal) >= self.max_journal:
+            self.journal = None
+            return
+
+        self.journal.append(list(record))
+
+    def _normalize(self, index: int) -> int:
+
+        if index < 0:
+            index += self._len
+
+        if not 0 <= index < self._len:
+            raise IndexError("queue index out of range")
+
+        return index
+
+    def _new_block(self, block: list, b: int):
+        self._blocks.insert(b, block)
+        for t in block:
+            self._owner[t.unique_id] = block
+            if self._index is not None:
+                self._index.add(t)
+        self._len += len(block)
+        self._dirty = True
+        self.version += 1
+
+    def _unlink(self, track: QueueTrack, block: list):
+        if self._owner.get(track.unique_id) is block:
+            del self._owner[track.unique_id]
+
+    def _insert_at(self, b: int, o: int, track: QueueTrack):
+
+        block = self._blocks[b]
+        block.insert(o, track)
+        self._owner[track.unique_id] = block
+        self._len += 1
+        self.version += 1
+
+        if self._index is not None:
+            self._index.add(track)
+
+        if len(block) > self.load * 2:
+            self._split(b, self.load)
+        else:
+            self._grow(b, 1)
+
+    def _remove_at(self, b: int, o: int) -> QueueTrack:
+
+        block = self._blocks[b]
+        track = block.pop(o)
+        self._unlink(track, block)
+        self._len -= 1
+        self.version += 1
+
+        if self._index is not None:
+            self._index.remove(track)
+
+        if not block:
+            del self._blocks[b]
+            self._dirty = True
+
+        elif len(block) < self.load // 4 and len(self._blocks) > 1:
+            # bloco muito pequeno: os itens são movidos para o bloco vizinho
+            if b:
+                neighbor = self._blocks[b - 1]
+                neighbor.extend(block)
+            else:
+                neighbor = self._blocks[1]
+                neighbor[:0] = block
+            for t in block:
+                self._owner[t.unique_id] = neighbor
+            del self._blocks[b]
+            self._dirty = True
+            if len(neighbor) > self.load * 2:
+                self._split(b - 1 if b else 0, self.load)
+
+        else:
+            self._grow(b, -1)
+
+        return track
+
+    def _split(self, b: int, o: int):
+        block = self._blocks[b]
+        tail = block[o:]
+        del block[o:]
+        self._blocks.insert(b + 1, tail)
+        for t in tail:
+            self._owner[t.unique_id] = tail
+        self._dirty = True
+
+    def _split_at(self, index: int) -> int:
+        # garante que index seja o início de um bloco e retorna a posição desse bloco
+        if index >= self._len:
+            return len(self._blocks)
+
+        b, o = self._locate(index)
+
+        if not o:
+            return b
+
+        self._split(b, o)
+        return b + 1
+
+    def _rebuild(self):
+
+        fen = [0] * (len(self._blocks) + 1)
+        size = len(fen)
+
+        for i, block in enumerate(self._blocks, start=1):
+            fen[i] += len(block)
+            if (j := i + (i & -i)) < size:
+                fen[j] += fen[i]
+
+        self._fen = fen
+        self._pos = {id(block): i for i, block in enumerate(self._blocks)}
+        self._dirty = False
+
+    def _grow(self, b: int, delta: int):
+
+        if self._dirty:
+            return
+
+        fen = self._fen
+        i = b + 1
+        size = len(fen)
+
+        while i < size:
+            fen[i] += delta
+            i += i & -i
+
+    def _locate(self, index: int) -> tuple:
+
+        if self._dirty:
+            self._rebuild()
+
+        fen = self._fen
+        size = len(fen)
+        b = 0
+        step = 1 << (size - 1).bit_length()
+
+        while step:
+            if (n := b + step) < size and fen[n] <= index:
+                b = n
+                index -= fen[n]
+            step >>= 1
+
+        return b, index
+
+    def _start(self, b: int) -> int:
+
+        if self._dirty:
+            self._rebuild()
+
+        fen = self._fen
+        total = 0
+
+        while b:
+            total += fen[b]
+            b -= b & -b
+
+        return total
+
+    def _block_index(self, block: list) -> int:
+
+        if self._dirty:
+            self._rebuild()
+
+        return self._pos[id(block)]
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+# instância do YoutubeDL mantida em cada processo worker (criada uma única vez ao iniciar o processo)
+_ytdl = None
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def _init_worker(opts: dict):
+    global _ytdl
+    from yt_dlp import YoutubeDL
+    _ytdl = YoutubeDL(opts)
+
+
+def _extract(url: str):
+    try:
+        return _ytdl.sanitize_info(_ytdl.extract_info(url, download=False))
+    except Exception as e:
+        # as exceptions do yt-dlp carregam tracebacks que não podem ser enviados entre processos
+        raise ExtractionError(str(e)) from None
+
+
+class YTDLEngine:
+
+    # Cada worker é um ProcessPoolExecutor com um único processo: as extrações só são enviadas para workers livres
+    # (as demais aguardam na fila do asyncio), assim uma extração travada pode ter o seu processo encerrado e
+    # substituído sem afetar as extrações dos outros workers.
+
+    def __init__(self, opts: dict, *, workers: int = 2, max_jobs: int = 4, timeout: float = 60):
+        self.opts = opts
+        self.workers = workers
+        self.max_jobs = max(max_jobs, 1)
+        self.timeout = timeout
+        self.executors: List[ProcessPoolExecutor] = []
+        self.idle: Optional[asyncio.Queue] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.local_ytdl = None
+        self.queued = 0
+        self.running = 0
+        self.jobs = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    def new_worker(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.opts,)
+        )
+        self.executors.append(executor)
+        return executor
+
+    def start(self):
+        self.idle = asyncio.Queue()
+        for _ in range(self.workers):
+            self.idle.put_nowait(self.new_worker())
+
+    def restart_worker(self, executor: ProcessPoolExecutor, kill: bool = False) -> ProcessPoolExecutor:
+
+        if kill:
+            # o shutdown não finaliza um processo travado em uma extração: o processo precisa ser encerrado
+            for process in list((executor._processes or {}).values()):
+                try:
+                    process.terminate()
+                except Exception:
+                    pass
+
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        try:
+            self.executors.remove(executor)
+        except ValueError:
+            pass
+
+        self.restarts += 1
+        return self.new_worker()
+
+    def close(self):
+        for executor in self.executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.executors.clear()
+        self.idle = None
+
+    def extract_local(self, url: str):
+        if not self.local_ytdl:
+            from yt_dlp import YoutubeDL
+            self.local_ytdl = YoutubeDL(self.opts)
+        return self.local_ytdl.sanitize_info(self.local_ytdl.extract_info(url, download=False))
+
+    async def extract_info(self, url: str) -> dict:
+
+        if not self.semaphore:
+            self.semaphore = asyncio.Semaphore(self.max_jobs)
+
+        loop = asyncio.get_running_loop()
+
+        self.queued += 1
+
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        try:
+
+            if self.workers < 1:
+                self.running += 1
+                self.jobs += 1
+                try:
+                    return await asyncio.wait_for(loop.run_in_executor(None, self.extract_local, url), self.timeout)
+                finally:
+                    self.running -= 1
+
+            if not self.idle:
+                self.start()
+
+            idle = self.idle
+            executor = await idle.get()
+
+            self.running += 1
+            self.jobs += 1
+
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(executor, _extract, url), self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                # apenas o processo que ficou travado nesta extração é encerrado e substituído
+                executor = self.restart_worker(executor, kill=True)
+                raise ExtractionError(f"Hết thời gian chờ khi trích xuất: {url}")
+            except BrokenProcessPool:
+                executor = self.restart_worker(executor)
+                raise ExtractionError(f"Tiến trình trích xuất đã bị dừng đột ngột: {url}")
+            finally:
+                self.running -= 1
+                # o worker volta a ficar livre (caso o engine não tenha sido fechado enquanto isso)
+                if idle is self.idle and executor in self.executors:
+                    idle.put_nowait(executor)
+
+        finally:
+            self.semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self.queued,
+            "running": self.running,
+            "jobs": self.jobs,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+        }
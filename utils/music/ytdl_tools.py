@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
-import asyncio
 import re
+from typing import Optional
 
 import disnake
-import yt_dlp
+from wavelink import SingleFlight
 
 from utils.music.errors import GenericError
 from utils.music.models import PartialTrack
+from utils.music.ytdl_engine import YTDLEngine
 
 exclude_extractors = ["youtube", "soundcloud", "deezer", "applemusic", "twitch"]
 
@@ -42,39 +43,237 @@ YTDL_OPTS = {
     }
 }
 
-class YTDLTools:
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:
+    import sre_parse, sre_constants
+
+
+def may_match_slash(items) -> bool:
+
+    for op, av in items:
+
+        if op is sre_constants.LITERAL:
+            if av == 47:
+                return True
+
+        elif op is sre_constants.NOT_LITERAL:
+            if av != 47:
+                return True
+
+        elif op is sre_constants.IN:
+            negate = False
+            found = False
+            for iop, iav in av:
+                if iop is sre_constants.NEGATE:
+                    negate = True
+                elif iop is sre_constants.LITERAL:
+                    found = found or iav == 47
+                elif iop is sre_constants.RANGE:
+                    found = found or iav[0] <= 47 <= iav[1]
+                elif iop is sre_constants.CATEGORY:
+                    found = found or iav not in (sre_constants.CATEGORY_DIGIT, sre_constants.CATEGORY_WORD,
+                                                 sre_constants.CATEGORY_SPACE)
+                else:
+                    found = True
+            if found != negate:
+                return True
+
+        elif op is sre_constants.SUBPATTERN:
+            if may_match_slash(av[-1]):
+                return True
+
+        elif op is sre_constants.BRANCH:
+            if any(may_match_slash(b) for b in av[1]):
+                return True
+
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            if may_match_slash(av[2]):
+                return True
+
+        elif op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            continue
+
+        else:
+            return True
+
+    return False
+
+
+class RequiredLiterals:
+
+    # extrai trechos literais que obrigatoriamente aparecem em qualquer url aceita pelo regex,
+    # separando os que com certeza ficam no host (entre o "//" e a primeira "/")
+    def __init__(self, pattern: str):
+        parsed = sre_parse.parse(pattern)
+        self.ignorecase = bool(parsed.state.flags & re.IGNORECASE)
+        self.host = []
+        self.other = []
+        self.run = ""
+        self.stage = 0
+        self.host_ok = True
+        self.feed(parsed)
+        self.flush()
+
+    def flush(self):
+        if self.run:
+            (self.host if self.stage == 1 else self.other).append(self.run.lower() if self.ignorecase else self.run)
+        self.run = ""
+
+    def feed(self, items):
+
+        for op, av in items:
+
+            if op is sre_constants.LITERAL:
+
+                c = chr(av)
+
+                if c == "/" and self.stage == 1:
+                    self.flush()
+                    self.stage = 2
+
+                self.run += c
+
+                if self.stage == 0 and self.run.endswith("//"):
+                    self.flush()
+                    self.stage = 1 if self.host_ok else 2
+
+                continue
+
+            if op is sre_constants.SUBPATTERN and not av[1] and not av[2]:
+                self.feed(av[-1])
+                continue
+
+            if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                continue
+
+            self.flush()
+
+            if may_match_slash([(op, av)]):
+                if self.stage == 0:
+                    self.host_ok = False
+                elif self.stage == 1:
+                    self.stage = 2
+
+    def longest(self, literals: list) -> str:
+        return max(literals, key=len) if literals else ""
 
-    extractors = [
-        {
-            "name": type(e).__name__.lower(),
-            "ie_key": e.ie_key(),
-            "regex": e._VALID_URL,
-            "age_limit": e.age_limit
-        } for e in yt_dlp.list_extractors() if e._VALID_URL
-    ]
 
-    def extract_info(self, url: str):
+def url_host(url: str) -> str:
 
-        with yt_dlp.YoutubeDL(YTDL_OPTS) as ytdl:
-            return ytdl.extract_info(url=url, download=False)
+    try:
+        start = url.index("//") + 2
+    except ValueError:
+        return ""
 
-    async def get_track_info(self, url: str, user: disnake.Member = None, loop = None):
+    try:
+        return url[start:url.index("/", start)]
+    except ValueError:
+        return url[start:]
 
-        for e in self.extractors:
 
-            if not (matches := re.compile(e['regex']).match(url)) or not matches.groups():
+class ExtractorIndex:
+
+    def __init__(self, host_cache_size: int = 2000):
+        self.patterns = []
+        self.host_cache = {}
+        self.host_cache_size = host_cache_size
+        self.ready = False
+
+    def build(self):
+
+        # os extractors só são carregados/compilados no primeiro uso (e não ao importar o módulo)
+        from yt_dlp.extractor import list_extractor_classes
+
+        for order, e in enumerate(list_extractor_classes()):
+
+            if not e._VALID_URL:
+                continue
+
+            data = {
+                "name": e.__name__.lower(),
+                "ie_key": e.ie_key(),
+                "age_limit": e.age_limit,
+                "order": order,
+            }
+
+            for pattern in ([e._VALID_URL] if isinstance(e._VALID_URL, str) else e._VALID_URL):
+
+                literals = RequiredLiterals(pattern)
+
+                self.patterns.append((
+                    data,
+                    re.compile(pattern),
+                    literals.longest(literals.host),
+                    literals.longest(literals.other),
+                    literals.ignorecase
+                ))
+
+        self.ready = True
+
+    def candidates(self, url: str) -> list:
+
+        if not self.ready:
+            self.build()
+
+        host = url_host(url)
+
+        try:
+            return self.host_cache[host]
+        except KeyError:
+            pass
+
+        lower_host = host.lower()
+
+        candidates = [p for p in self.patterns if not p[2] or p[2] in (lower_host if p[4] else host)]
+
+        if len(self.host_cache) >= self.host_cache_size:
+            self.host_cache.clear()
+
+        self.host_cache[host] = candidates
+        return candidates
+
+    def match(self, url: str):
+
+        lower_url = url.lower()
+        last = None
+
+        for data, regex, host_literal, literal, ignorecase in self.candidates(url):
+
+            if data is last:
+                continue
+
+            if literal and literal not in (lower_url if ignorecase else url):
                 continue
 
+            if (matches := regex.match(url)) and matches.groups():
+                last = data
+                yield data
+
+
+class YTDLTools:
+
+    extractor_index = ExtractorIndex()
+    inflight = SingleFlight()
+    engine: Optional[YTDLEngine] = None
+
+    async def extract_info(self, url: str):
+        # o engine (e seus processos) só é criado no primeiro uso e não durante o import
+        if not YTDLTools.engine:
+            YTDLTools.engine = YTDLEngine(YTDL_OPTS, workers=1, max_jobs=2)
+        return await self.engine.extract_info(url)
+
+    async def get_track_info(self, url: str, user: disnake.Member = None):
+
+        for e in self.extractor_index.match(url):
+
             if any(ee in e["name"] for ee in exclude_extractors):
                 continue
 
             if e["age_limit"] > 17 and e["ie_key"] != "Twitter":
                 raise GenericError("**Este link contém conteúdo para maiores de 18 anos!**")
 
-            if not loop:
-                loop = asyncio.get_event_loop()
-
-            data = await loop.run_in_executor(None, self.extract_info, url)
+            data = await self.inflight.run(("ytdl", url), self.extract_info, url)
 
             try:
                 if data["_type"] == "playlist":
@@ -103,10 +302,10 @@ class YTDLTools:
                 source_name=entrie["extractor"],
             )
 
-            t.info.update({
+            t.extra = {
                 "search_uri": entrie["url"],
                 "authors": entrie["uploader"]
-            })
+            }
 
             return [t]
 
@@ -114,11 +313,9 @@ if __name__ == "__main__":
 
     ydl = YTDLTools()
     url = "https://www.youtube.com/channel/UC9AiU8Srqw7iPu3UcR9IJ8g"
-    for e in ydl.extractors:
+    for e in ydl.extractor_index.match(url):
 
         if e['ie_key'] == "Generic":
             continue
 
-        a = re.compile(e['regex']).match(url)
-        if a:
-            print(e['ie_key'], e['name'])
+        print(e['ie_key'], e['name'])
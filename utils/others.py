@@ -552,15 +552,17 @@ def queue_track_index(inter: disnake.AppCmdInter, bot: BotCore, query: str, matc
 
     count = int(match_count)
 
-    for counter, track in enumerate(player.queue):
-
-        if unique_id is not None:
-
-            if unique_id == track.unique_id:
-                return [(counter, track,)]
+    if unique_id is not None:
 
+        try:
+            index = player.queue.index_by_id(unique_id)
+        except ValueError:
             if match_count < 2:
-                continue
+                return tracklist
+        else:
+            return [(index, player.queue[index],)]
+
+    for counter, track in player.queue.search(query):
 
         if case_sensitive:
 
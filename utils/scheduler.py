@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import heapq
+import itertools
+import time
+import traceback
+from collections import Counter
+from typing import Callable, Dict, Hashable, Optional
+
+
+class Timer:
+
+    __slots__ = ('scheduler', 'kind', 'key', 'deadline', 'callback', 'args', 'kwargs', 'interval', 'task', 'cancelled')
+
+    def __init__(self, scheduler: "Scheduler", kind: str, key: Hashable, callback: Callable, args: tuple,
+                 kwargs: dict, interval: Optional[float] = None):
+        self.scheduler = scheduler
+        self.kind = kind
+        self.key = key
+        self.deadline = 0.0
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"<Timer kind={self.kind} key={self.key} in={self.deadline - time.monotonic():.2f}s>"
+
+    def cancel(self):
+        # mesmo comportamento do Task.cancel(): cancela também o callback caso esteja em execução
+        self.scheduler._cancel(self)
+
+    def reschedule(self, delay: float, callback: Callable = None, *args, **kwargs):
+        if self.cancelled:
+            return
+        if callback:
+            self.callback = callback
+            self.args = args
+            self.kwargs = kwargs
+        self.scheduler._push(self, delay)
+
+    def done(self) -> bool:
+        return self.cancelled or (self.task is not None and self.task.done() and self.deadline <= time.monotonic())
+
+
+class Scheduler:
+
+    # todos os timers (deadlines) ficam numa única heap e são despachados em lotes por um único callback do loop,
+    # ao invés de cada player manter várias tasks dormindo com asyncio.sleep.
+    def __init__(self, batch_size: int = 200):
+        self.batch_size = batch_size
+        self.timers: Dict[tuple, Timer] = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._handle_deadline = None
+        self.dispatched = 0
+
+    def schedule(self, kind: str, key: Hashable, delay: float, callback: Callable, *args,
+                 interval: Optional[float] = None, **kwargs) -> Timer:
+
+        # um timer por (kind, key): agendar novamente substitui o anterior
+        try:
+            self.timers[(kind, key)].cancel()
+        except KeyError:
+            pass
+
+        timer = Timer(self, kind, key, callback, args, kwargs, interval)
+        self.timers[(kind, key)] = timer
+        self._push(timer, delay)
+        return timer
+
+    def get(self, kind: str, key: Hashable) -> Optional[Timer]:
+        return self.timers.get((kind, key))
+
+    def cancel(self, kind: str, key: Hashable):
+        try:
+            self.timers[(kind, key)].cancel()
+        except KeyError:
+            pass
+
+    def _push(self, timer: Timer, delay: float):
+
+        timer.deadline = time.monotonic() + max(delay, 0)
+        heapq.heappush(self._heap, (timer.deadline, next(self._counter), timer))
+
+        if self._handle_deadline is None or timer.deadline < self._handle_deadline:
+            self._wakeup(timer.deadline)
+
+    def _cancel(self, timer: Timer):
+
+        timer.cancelled = True
+
+        if self.timers.get((timer.kind, timer.key)) is timer:
+            del self.timers[(timer.kind, timer.key)]
+
+        if timer.task and not timer.task.done():
+            timer.task.cancel()
+
+    def _wakeup(self, deadline: float):
+
+        loop = asyncio.get_event_loop()
+
+        if self._handle:
+            self._handle.cancel()
+
+        self._handle_deadline = deadline
+        self._handle = loop.call_at(loop.time() + max(deadline - time.monotonic(), 0), self._dispatch)
+
+    def _dispatch(self):
+
+        self._handle = None
+        self._handle_deadline = None
+
+        now = time.monotonic()
+        loop = asyncio.get_event_loop()
+        dispatched = 0
+
+        while self._heap and dispatched < self.batch_size:
+
+            deadline, _, timer = self._heap[0]
+
+            if deadline > now:
+                break
+
+            heapq.heappop(self._heap)
+
+            # entradas antigas (timer cancelado ou reagendado) são descartadas aqui
+            if timer.cancelled or timer.deadline != deadline:
+                continue
+
+            timer.task = loop.create_task(self._run(timer))
+            dispatched += 1
+
+        self.dispatched += dispatched
+
+        if not self._heap:
+            return
+
+        if dispatched >= self.batch_size:
+            self._wakeup(now)
+        else:
+            self._wakeup(self._heap[0][0])
+
+    async def _run(self, timer: Timer):
+
+        deadline = timer.deadline
+
+        try:
+            result = timer.callback(*timer.args, **timer.kwargs)
+            if asyncio.iscoroutine(result):
+                await result
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            traceback.print_exc()
+
+        if timer.cancelled or timer.deadline != deadline:
+            # cancelado ou reagendado pelo próprio callback
+            return
+
+        if timer.interval:
+            timer.reschedule(timer.interval)
+        elif self.timers.get((timer.kind, timer.key)) is timer:
+            del self.timers[(timer.kind, timer.key)]
+
+    def stats(self) -> dict:
+        return dict(Counter(kind for kind, key in self.timers))
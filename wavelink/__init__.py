@@ -10,4 +10,7 @@ from .eqs import *
 from .events import *
 from .player import *
 from .node import Node
+from .selector import NodeSelector
+from .cache import SingleFlight, TrackCache
+from .codec import decode_track, encode_track
 from .websocket import WebSocket
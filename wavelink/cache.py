@@ -0,0 +1,133 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class TrackCache:
+    """LRU + TTL cache for raw Lavalink REST payloads.
+
+    Payloads are stored as the raw response bytes so every hit builds fresh track objects
+    and the memory held by the cache can be measured exactly.
+
+    Parameters
+    ------------
+    max_size: int
+        Maximum amount of cached payloads.
+    max_bytes: int
+        Maximum amount of bytes held by the cached payloads.
+    ttl: float
+        Seconds a successful result is kept.
+    negative_ttl: float
+        Seconds a result without matches is kept.
+    """
+
+    def __init__(self, *, max_size: int = 1000, max_bytes: int = 32 * 1024 * 1024, ttl: float = 600,
+                 negative_ttl: float = 30):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached payload for the key or None if it is missing or expired."""
+        try:
+            expires, payload = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return
+
+        if expires < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def set(self, key: Hashable, payload: bytes, *, negative: bool = False) -> None:
+        """Store a payload. Negative results (no matches) expire after :attr:`negative_ttl`."""
+        if len(payload) > self.max_bytes:
+            return
+
+        self._remove(key)
+
+        self._data[key] = (time.monotonic() + (self.negative_ttl if negative else self.ttl), payload)
+        self.bytes += len(payload)
+
+        while len(self._data) > self.max_size or self.bytes > self.max_bytes:
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        try:
+            expires, payload = self._data.pop(key)
+        except KeyError:
+            return
+        self.bytes -= len(payload)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total * 100, 2) if total else 0,
+        }
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share the same key into a single upstream call.
+
+    The first caller starts the call and every caller arriving while it is still running awaits
+    the same task. The result (or exception) is shared between them, so results should be treated
+    as read-only. Cancelling one waiter does not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._tasks: dict = {}
+
+    def __len__(self):
+        return len(self._tasks)
+
+    async def run(self, key: Hashable, func: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        """|coro|
+
+        Await ``func(*args, **kwargs)`` or join the call already running for the key.
+        """
+        try:
+            task = self._tasks[key]
+        except KeyError:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._tasks.pop(key, None) if self._tasks.get(key) is t else None)
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "running": len(self._tasks),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
@@ -26,11 +26,14 @@ import logging
 from disnake.ext import commands
 from functools import partial
 from json import dumps
+from types import MappingProxyType
 from typing import Optional, Union
 
 from .errors import *
 from .player import Player
 from .node import Node
+from .selector import NodeSelector
+from .cache import SingleFlight, TrackCache
 
 
 __log__ = logging.getLogger(__name__)
@@ -54,12 +57,17 @@ class Client:
 
         return super().__new__(cls)
 
-    def __init__(self, bot: Union[commands.Bot, commands.AutoShardedBot], *, session: aiohttp.ClientSession = None):
+    def __init__(self, bot: Union[commands.Bot, commands.AutoShardedBot], *, session: aiohttp.ClientSession = None,
+                 track_cache: Optional[TrackCache] = None, inflight: Optional[SingleFlight] = None):
         self.bot = bot
         self.loop = bot.loop or asyncio.get_event_loop()
         self.session = session or aiohttp.ClientSession()
 
         self.nodes = {}
+        self._players = {}
+        self.node_selector = NodeSelector()
+        self.track_cache = track_cache
+        self.inflight = inflight or SingleFlight()
 
         self._dumps = dumps
 
@@ -91,15 +99,18 @@ class Client:
         return self.bot.user.id
 
     @property
-    def players(self) -> dict:
+    def players(self) -> MappingProxyType:
         """Return the WaveLink clients current players across all nodes.
 
+        The mapping is a read-only view of the guild_id -> player index kept up to date
+        when players are created, destroyed or moved between nodes.
+
         Returns
         ---------
-        dict:
-            A dict of the current WaveLink players.
+        MappingProxyType:
+            A read-only mapping of the current WaveLink players.
         """
-        return self._get_players()
+        return MappingProxyType(self._players)
 
     def _future_callback(self, cog, listener, fut):
         if fut.exception():
@@ -168,12 +179,18 @@ class Client:
         return await node.build_track(identifier)
 
     def _get_players(self) -> dict:
-        players = []
+        return dict(self._players)
 
-        for node in self.nodes.values():
-            players.extend(node.players.values())
+    def _add_player(self, node: Node, player: Player) -> None:
+        node.players[player.guild_id] = player
+        self._players[player.guild_id] = player
 
-        return {player.guild_id: player for player in players}
+    def _remove_player(self, node: Node, player: Player) -> None:
+        if node.players.get(player.guild_id) is player:
+            del node.players[player.guild_id]
+
+        if self._players.get(player.guild_id) is player:
+            del self._players[player.guild_id]
 
     def get_node(self, identifier: str) -> Optional[Node]:
         """Retrieve a Node with the given identifier.
@@ -190,19 +207,24 @@ class Client:
         """
         return self.nodes.get(identifier, None)
 
-    def get_best_node(self) -> Optional[Node]:
+    def get_best_node(self, *, region: Optional[str] = None, search: bool = False) -> Optional[Node]:
         """Return the best available :class:`wavelink.node.Node` across the :class:`.Client`.
 
+        Parameters
+        ------------
+        region: Optional[str]
+            An optional region to prefer when scoring the nodes.
+        search: bool
+            Whether nodes with searching enabled should be preferred.
+
         Returns
         ---------
         Optional[:class:`wavelink.node.Node`]
             The best available :class:`wavelink.node.Node` available to the :class:`.Client`.
         """
-        nodes = [n for n in self.nodes.values() if n.available and n.is_available]
-        if not nodes:
-            return None
-
-        return sorted(nodes, key=lambda n: len(n.players))[0]
+        return self.node_selector.select(
+            (n for n in self.nodes.values() if n.available and n.is_available), region=region, search=search
+        )
 
     def get_node_by_region(self, region: str) -> Optional[Node]:
         """Retrieve the best available Node with the given region.
@@ -218,11 +240,9 @@ class Client:
             The best available Node matching the given region.
             This could be None if no :class:`wavelink.node.Node` could be found.
         """
-        nodes = [n for n in self.nodes.values() if n.region.lower() == region.lower() and n.is_available]
-        if not nodes:
-            return None
-
-        return sorted(nodes, key=lambda n: len(n.players))[0]
+        return self.node_selector.select(
+            n for n in self.nodes.values() if n.region.lower() == region.lower() and n.is_available
+        )
 
     def get_node_by_shard(self, shard_id: int) -> Optional[Node]:
         """Retrieve the best available Node with the given shard ID.
@@ -238,11 +258,17 @@ class Client:
             The best available Node matching the given Shard ID.
             This could be None if no :class:`wavelink.node.Node` could be found.
         """
-        nodes = [n for n in self.nodes.values() if n.shard_id == shard_id and n.is_available]
-        if not nodes:
-            return None
+        return self.node_selector.select(n for n in self.nodes.values() if n.shard_id == shard_id and n.is_available)
 
-        return sorted(nodes, key=lambda n: len(n.players))[0]
+    def set_node_selector(self, selector: NodeSelector) -> None:
+        """Replace the strategy used to pick nodes for new players and searches.
+
+        Parameters
+        ------------
+        selector: :class:`NodeSelector`
+            The selector instance to use.
+        """
+        self.node_selector = selector
 
     def get_player(self, guild_id: int, *, cls=None, node_id=None, **kwargs) -> Player:
         """Retrieve a player for the given guild ID. If None, a player will be created and returned.
@@ -276,10 +302,8 @@ class Client:
         ZeroConnectedNodes
             There are no :class:`wavelink.node.Node`'s currently connected.
         """
-        players = self.players
-
         try:
-            player = players[guild_id]
+            player = self._players[guild_id]
         except KeyError:
             pass
         else:
@@ -302,7 +326,7 @@ class Client:
                 raise InvalidIDProvided(f'A Node with the identifier <{node_id}> does not exist.')
 
             player = cls(self.bot, guild_id, node, **kwargs)
-            node.players[guild_id] = player
+            self._add_player(node, player)
 
             return player
 
@@ -319,23 +343,17 @@ class Client:
                 region_options.append(node)
 
         if not shard_options and not region_options:
-            # Sort by len of node players
-            node = sorted(nodes, key=lambda n: len(n.players))[0]
+            node = self.node_selector.select(nodes)
             player = cls(self.bot, guild_id, node, **kwargs)
-            node.players[guild_id] = player
+            self._add_player(node, player)
 
             return player
 
         best = [n for n in shard_options if n in region_options]
-        if best:
-            node = sorted(best, key=lambda n: len(n.players))[0]
-        elif shard_options:
-            node = sorted(shard_options, key=lambda n: len(n.players))[0]
-        else:
-            node = sorted(region_options, key=lambda n: len(n.players))[0]
+        node = self.node_selector.select(best or shard_options or region_options)
 
         player = cls(self.bot, guild_id, node, **kwargs)
-        node.players[guild_id] = player
+        self._add_player(node, player)
 
         return player
 
@@ -433,7 +451,7 @@ class Client:
             guild_id = int(data['d']['guild_id'])
 
             try:
-                player = self.players[guild_id]
+                player = self._players[guild_id]
             except KeyError:
                 pass
             else:
@@ -445,7 +463,7 @@ class Client:
 
             guild_id = int(data['d']['guild_id'])
             try:
-                player = self.players[guild_id]
+                player = self._players[guild_id]
             except KeyError:
                 pass
             else:
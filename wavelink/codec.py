@@ -0,0 +1,195 @@
+import struct
+from base64 import b64decode, b64encode
+from typing import Optional
+
+from .errors import BuildTrackError
+
+
+TRACK_INFO_VERSIONED = 1
+
+_int = struct.Struct('>i')
+_long = struct.Struct('>q')
+_ushort = struct.Struct('>H')
+
+
+def _read_utf(data: bytes, pos: int):
+    size, = _ushort.unpack_from(data, pos)
+    pos += 2
+    raw = data[pos:pos + size]
+
+    if len(raw) != size:
+        raise BuildTrackError('Truncated track string.')
+
+    try:
+        text = raw.decode()
+    except UnicodeDecodeError:
+        # Java modified UTF-8: NUL as 0xC0 0x80 and supplementary characters as surrogate pairs (CESU-8).
+        text = raw.replace(b'\xc0\x80', b'\x00').decode('utf-8', 'surrogatepass')
+        text = text.encode('utf-16', 'surrogatepass').decode('utf-16')
+
+    return text, pos + size
+
+
+def _surrogates(char: str) -> str:
+    code = ord(char) - 0x10000
+    return chr(0xD800 + (code >> 10)) + chr(0xDC00 + (code & 0x3FF))
+
+
+def _write_utf(text: str) -> bytes:
+    if not text.isascii():
+        # Java modified UTF-8: characters outside the BMP are written as surrogate pairs.
+        text = ''.join(_surrogates(c) if ord(c) > 0xFFFF else c for c in text)
+
+    raw = text.encode('utf-8', 'surrogatepass').replace(b'\x00', b'\xc0\x80')
+
+    if len(raw) > 65535:
+        raise ValueError('Track string is too long to be encoded.')
+
+    return _ushort.pack(len(raw)) + raw
+
+
+def _write_nullable_utf(text: Optional[str]) -> bytes:
+    if text is None:
+        return b'\x00'
+    return b'\x01' + _write_utf(text)
+
+
+def decode_track(identifier: str) -> dict:
+    """Decode a Lavalink (lavaplayer) Base64 track identifier without a REST request.
+
+    Supports the track message versions 1 to 3. Source specific fields stored after the source name
+    (e.g. the probe info of http/local tracks) are skipped.
+
+    Parameters
+    ------------
+    identifier: str
+        The tracks unique Base64 encoded identifier.
+
+    Returns
+    ---------
+    dict
+        The track info in the same format returned by the Lavalink v3 ``decodetrack`` route.
+
+    Raises
+    --------
+    BuildTrackError
+        The identifier is not a valid track message.
+    """
+    try:
+        data = b64decode(identifier)
+        header, = _int.unpack_from(data, 0)
+        flags = (header >> 30) & 3
+        size = header & 0x3FFFFFFF
+
+        if size + 4 != len(data):
+            raise BuildTrackError('Invalid track message size.')
+
+        if flags & TRACK_INFO_VERSIONED:
+            version = data[4]
+            pos = 5
+        else:
+            version = 1
+            pos = 4
+
+        if not 1 <= version <= 3:
+            raise BuildTrackError(f'Unsupported track message version: {version}.')
+
+        title, pos = _read_utf(data, pos)
+        author, pos = _read_utf(data, pos)
+        length, = _long.unpack_from(data, pos)
+        identifier_, pos = _read_utf(data, pos + 8)
+        is_stream = data[pos] != 0
+        pos += 1
+
+        uri = None
+        info = {}
+
+        if version >= 2 and data[pos]:
+            uri, pos = _read_utf(data, pos + 1)
+        elif version >= 2:
+            pos += 1
+
+        if version >= 3:
+            for key in ('artworkUrl', 'isrc'):
+                if data[pos]:
+                    info[key], pos = _read_utf(data, pos + 1)
+                else:
+                    info[key] = None
+                    pos += 1
+
+        source_name, pos = _read_utf(data, pos)
+
+        # The position is always the last field, after the source specific fields.
+        position, = _long.unpack_from(data, len(data) - 8)
+
+        if pos > len(data) - 8:
+            raise BuildTrackError('Truncated track message.')
+
+    except BuildTrackError:
+        raise
+    except Exception as e:
+        raise BuildTrackError(f'Failed to decode track: {e!r}')
+
+    return {
+        'identifier': identifier_,
+        'isSeekable': not is_stream,
+        'author': author,
+        'length': length,
+        'isStream': is_stream,
+        'position': position,
+        'title': title,
+        'uri': uri,
+        'sourceName': source_name,
+        **info
+    }
+
+
+def encode_track(info: dict, *, version: int = 2, source_fields: bytes = b'') -> str:
+    """Encode a track info dict into a Lavalink (lavaplayer) Base64 track identifier.
+
+    Parameters
+    ------------
+    info: dict
+        The track info (``title``, ``author``, ``length``, ``identifier``, ``isStream``, ``uri``, ``sourceName``
+        and optionally ``position``, ``artworkUrl`` and ``isrc``).
+    version: int
+        The track message version to be written (2 for Lavalink v3, 3 for lavaplayer 2.x/Lavalink v4).
+    source_fields: bytes
+        Source specific fields written after the source name (e.g. the probe info of http/local tracks).
+
+    Returns
+    ---------
+    str
+        The Base64 track identifier.
+    """
+    if not 1 <= version <= 3:
+        raise ValueError(f'Unsupported track message version: {version}.')
+
+    body = [
+        _write_utf(info['title']),
+        _write_utf(info['author']),
+        _long.pack(int(info['length'])),
+        _write_utf(info['identifier']),
+        b'\x01' if info['isStream'] else b'\x00',
+    ]
+
+    if version >= 2:
+        body.append(_write_nullable_utf(info.get('uri')))
+
+    if version >= 3:
+        body.append(_write_nullable_utf(info.get('artworkUrl')))
+        body.append(_write_nullable_utf(info.get('isrc')))
+
+    body.append(_write_utf(info['sourceName']))
+    body.append(source_fields)
+    body.append(_long.pack(int(info.get('position', 0))))
+
+    message = b''.join(body)
+
+    if version > 1:
+        message = bytes((version,)) + message
+        flags = TRACK_INFO_VERSIONED
+    else:
+        flags = 0
+
+    return b64encode(_int.pack(len(message) | (flags << 30)) + message).decode()
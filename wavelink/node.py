@@ -25,11 +25,13 @@ import inspect
 import json
 import os
 import logging
+import time
 from disnake.ext import commands
 from typing import Any, Callable, Dict, Optional, Union
 from urllib.parse import quote
 
 from .backoff import ExponentialBackoff
+from .codec import decode_track
 from .errors import *
 from .player import Player, Track, TrackPlaylist
 from .websocket import WebSocket
@@ -105,8 +107,10 @@ class Node:
         self.hook = None
         self.available = True
         self.restarting = False
+        self.search = True
 
         self.stats = None
+        self.rest_latency: Optional[float] = None
 
     def __repr__(self):
         return f'{self.identifier} | {self.region} | (Shard: {self.shard_id})'
@@ -126,12 +130,26 @@ class Node:
 
     @property
     def penalty(self) -> float:
-        """Returns the load-balancing penalty for this node."""
-        if not self.available or not self.stats:
+        """Returns the load-balancing penalty for this node.
+
+        Nodes that did not send their stats yet are penalized by the amount of players held by this client,
+        so they can still be weighted by :class:`wavelink.selector.NodeSelector`.
+        Unavailable nodes always return 9e30.
+        """
+        if not self.available:
             return 9e30
 
+        if not self.stats:
+            return float(len(self.players))
+
         return self.stats.penalty.total
 
+    def _update_rest_latency(self, latency: float) -> None:
+        if self.rest_latency is None:
+            self.rest_latency = latency
+        else:
+            self.rest_latency = self.rest_latency * 0.8 + latency * 0.2
+
     async def connect(self, bot: Union[commands.Bot, commands.AutoShardedBot]) -> None:
         self._websocket = WebSocket(node=self,
                                     host=self.host,
@@ -151,6 +169,8 @@ class Node:
         """|coro|
 
         Search for and return a list of Tracks for the given query.
+        When the client has a :class:`wavelink.cache.TrackCache` the raw results are served from it.
+        Concurrent calls with the same query share a single REST request through :attr:`Client.inflight`.
 
         Parameters
         ------------
@@ -168,15 +188,86 @@ class Node:
             A list of or TrackPlaylist instance of :class:`wavelink.player.Track` objects.
             This could be None if no tracks were found.
         """
-        backoff = ExponentialBackoff(base=1)
-
         mode = "loadtracks?identifier" if not kwargs.get('channels') else "searchchannels?query"
 
+        cache = self._client.track_cache
+        cache_key = (query, mode)
+
+        raw_data = cache.get(cache_key) if cache is not None else None
+
+        from_cache = raw_data is not None
+
+        if not from_cache:
+
+            raw_data = await self._client.inflight.run(
+                cache_key, self._fetch_tracks, query, mode, retry_on_failure=retry_on_failure
+            )
+
+            if raw_data is None:
+                return
+
+        try:
+            data = json.loads(raw_data)
+        except Exception as e:
+            raise WavelinkException(f"Failed to parse json result. | Error: {repr(e)}")
+
+        if isinstance(data, list):
+            if not from_cache and cache is not None:
+                cache.set(cache_key, raw_data)
+            return data
+
+        loadtype = data.get('loadType')
+
+        if not loadtype:
+            raise WavelinkException('There was an error while trying to load this track.')
+
+        if loadtype == 'NO_MATCHES':
+            if not from_cache and cache is not None:
+                cache.set(cache_key, raw_data, negative=True)
+            __log__.info(f'REST | {self.identifier} | No tracks with query:: <{query}> found.')
+            raise TrackNotFound("Track not found...")
+
+        if loadtype == 'LOAD_FAILED':
+
+            try:
+                error = f"There was an error of severity '{data['exception']['severity']}' while loading tracks.\n\n{data['exception']['message']}"
+            except KeyError:
+                error = f"There was an error of severity '{data['exception']['severity']}:\n{data['exception']['error']}"
+            e = TrackLoadError(error=error, node=self, data=data)
+            if not e.message:
+                e.message = data['exception']['error']
+            raise e
+
+        if not data.get('tracks'):
+            __log__.info(f'REST | {self.identifier} | No tracks with query:: <{query}> found.')
+            raise WavelinkException("Track not found...")
+
+        if not from_cache and cache is not None:
+            cache.set(cache_key, raw_data)
+
+        if loadtype == 'PLAYLIST_LOADED':
+            playlist_cls = kwargs.pop('playlist_cls', TrackPlaylist)
+            return playlist_cls(data=data, url=query, **kwargs)
+
+        track_cls = kwargs.pop('track_cls', Track)
+
+        tracks = [track_cls(id_=track['track'], info=track['info'], **kwargs) for track in data['tracks']]
+
+        return tracks
+
+    async def _fetch_tracks(self, query: str, mode: str, *, retry_on_failure: bool = True) -> Optional[bytes]:
+
+        backoff = ExponentialBackoff(base=1)
+
         for attempt in range(2):
 
+            start_time = time.perf_counter()
+
             async with self.session.get(f'{self.rest_uri}/{mode}={quote(query)}',
                                         headers={'Authorization': self.password}) as resp:
 
+                self._update_rest_latency((time.perf_counter() - start_time) * 1000)
+
                 if not resp.status == 200 and retry_on_failure:
                     retry = backoff.delay()
 
@@ -190,47 +281,7 @@ class Node:
                     __log__.info(f'REST | {self.identifier} | Status code ({resp.status}) while retrieving tracks. Not retrying.')
                     return
 
-                try:
-                    data = await resp.json()
-                except Exception as e:
-                    raise WavelinkException(f"Failed to parse json result. | Error: {repr(e)}")
-
-                if isinstance(data, list):
-                    return data
-
-                loadtype = data.get('loadType')
-
-                if not loadtype:
-                    raise WavelinkException('There was an error while trying to load this track.')
-
-                if loadtype == 'NO_MATCHES':
-                    __log__.info(f'REST | {self.identifier} | No tracks with query:: <{query}> found.')
-                    raise TrackNotFound("Track not found...")
-
-                if loadtype == 'LOAD_FAILED':
-
-                    try:
-                        error = f"There was an error of severity '{data['exception']['severity']}' while loading tracks.\n\n{data['exception']['message']}"
-                    except KeyError:
-                        error = f"There was an error of severity '{data['exception']['severity']}:\n{data['exception']['error']}"
-                    e = TrackLoadError(error=error, node=self, data=data)
-                    if not e.message:
-                        e.message = data['exception']['error']
-                    raise e
-
-                if not data.get('tracks'):
-                    __log__.info(f'REST | {self.identifier} | No tracks with query:: <{query}> found.')
-                    raise WavelinkException("Track not found...")
-
-                if loadtype == 'PLAYLIST_LOADED':
-                    playlist_cls = kwargs.pop('playlist_cls', TrackPlaylist)
-                    return playlist_cls(data=data, url=query, **kwargs)
-
-                track_cls = kwargs.pop('track_cls', Track)
-
-                tracks = [track_cls(id_=track['track'], info=track['info'], **kwargs) for track in data['tracks']]
-
-                return tracks
+                return await resp.read()
 
         __log__.warning(f'REST | {self.identifier} | Failure to load tracks after 5 attempts.')
 
@@ -239,6 +290,9 @@ class Node:
 
         Build a track object with a valid track identifier.
 
+        The identifier is decoded locally, the ``decodetrack`` route is only requested for track messages
+        that can't be decoded here.
+
         Parameters
         ------------
         identifier: str
@@ -254,6 +308,11 @@ class Node:
         BuildTrackError
             Decoding and building the track failed.
         """
+        try:
+            return Track(id_=identifier, info=decode_track(identifier))
+        except BuildTrackError:
+            pass
+
         async with self.session.get(f'{self.rest_uri}/decodetrack?',
                                     headers={'Authorization': self.password},
                                     params={'track': identifier}) as resp:
@@ -430,10 +430,7 @@ class Player:
 
         await self.node._send(op='destroy', guildId=str(self.guild_id))
 
-        try:
-            del self.node.players[self.guild_id]
-        except KeyError:
-            pass
+        self.node._client._remove_player(self.node, self)
 
     async def set_eq(self, equalizer: Equalizer) -> None:
         """|coro|
@@ -537,11 +534,11 @@ class Player:
         self.node.open()
 
         old = self.node
-        del old.players[self.guild_id]
+        client._remove_player(old, self)
         await old._send(op='destroy', guildId=str(self.guild_id))
 
         self.node = node
-        self.node.players[int(self.guild_id)] = self
+        client._add_player(self.node, self)
 
         if self._voice_state:
             await self._dispatch_voice_update()
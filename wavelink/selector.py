@@ -0,0 +1,55 @@
+from typing import Iterable, Optional
+
+
+class NodeSelector:
+    """Load-balancing strategy used to pick a :class:`wavelink.node.Node`.
+
+    Nodes are scored by their Lavalink stats penalty (CPU, nulled and deficit frames, playing players).
+    Optional weights add a cost for nodes outside the requested region, for slow REST responses
+    and for nodes that can not be used for searches. The node with the lowest score wins and ties
+    are broken by the amount of players held by this client.
+
+    Subclass and override :meth:`score` to plug a different strategy into :attr:`Client.node_selector`.
+
+    Parameters
+    ------------
+    region_weight: float
+        Cost added when a region is requested and the node belongs to another region.
+    latency_weight: float
+        Cost added per millisecond of the node's average REST latency.
+    search_weight: float
+        Cost added when a search is requested and the node has searching disabled.
+    """
+
+    def __init__(self, *, region_weight: float = 50.0, latency_weight: float = 0.1, search_weight: float = 1e6):
+        self.region_weight = region_weight
+        self.latency_weight = latency_weight
+        self.search_weight = search_weight
+
+    def score(self, node, *, region: Optional[str] = None, search: bool = False) -> float:
+        """Return the selection cost of a node. Lower is better."""
+        score = node.penalty
+
+        if region and str(node.region).lower() != str(region).lower():
+            score += self.region_weight
+
+        if node.rest_latency:
+            score += node.rest_latency * self.latency_weight
+
+        if search and not node.search:
+            score += self.search_weight
+
+        return score
+
+    def select(self, nodes: Iterable, *, region: Optional[str] = None, search: bool = False):
+        """Return the node with the lowest score in a single pass, or None if no nodes were given."""
+        best = None
+        best_key = None
+
+        for node in nodes:
+            key = (self.score(node, region=region, search=search), len(node.players))
+            if best_key is None or key < best_key:
+                best = node
+                best_key = key
+
+        return best